@@ -0,0 +1,40 @@
+"""add_reply_tree_index
+
+Revision ID: 0b9e3f7c5d21
+Revises: f28d4b6e1a53
+Create Date: 2026-10-19 18:04:47.318560
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0b9e3f7c5d21"
+down_revision: Union[str, Sequence[str], None] = "f28d4b6e1a53"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = "ix_post_replies_visible_post_id_parent_id_created_at_id"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            INDEX_NAME,
+            "post_replies",
+            ["post_id", "parent_id", "created_at", "id"],
+            postgresql_where=sa.text("visible IS TRUE"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            INDEX_NAME, table_name="post_replies", postgresql_concurrently=True
+        )
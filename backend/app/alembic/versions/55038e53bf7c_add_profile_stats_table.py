@@ -0,0 +1,73 @@
+"""add_profile_stats_table
+
+Revision ID: 55038e53bf7c
+Revises: 13161609b814
+Create Date: 2026-10-19 09:12:31.104223
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "55038e53bf7c"
+down_revision: Union[str, Sequence[str], None] = "13161609b814"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "profile_stats",
+        sa.Column("profile_id", sa.UUID(), nullable=False),
+        sa.Column("reviews_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("posts_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("photos_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("trips_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("replies_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "updated_at",
+            postgresql.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["profile_id"],
+            ["profiles.id"],
+            name=op.f("fk_profile_stats_profile_id_profiles"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("profile_id", name=op.f("pk_profile_stats")),
+    )
+
+    # Backfill counters for existing profiles
+    op.execute(
+        """
+        INSERT INTO profile_stats (
+            profile_id, reviews_count, posts_count, photos_count,
+            trips_count, replies_count
+        )
+        SELECT
+            p.id,
+            (SELECT count(*) FROM reviews r WHERE r.user_id = p.id),
+            (SELECT count(*) FROM forum_posts fp WHERE fp.author_id = p.id),
+            (
+                SELECT count(*)
+                FROM review_images ri
+                JOIN reviews r ON r.id = ri.review_id
+                WHERE r.user_id = p.id
+            ),
+            (SELECT count(*) FROM trips t WHERE t.user_id = p.id),
+            (SELECT count(*) FROM post_replies pr WHERE pr.user_id = p.id)
+        FROM profiles p
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("profile_stats")
@@ -0,0 +1,55 @@
+"""add_place_rating_sum
+
+Revision ID: 5f1923a2e8a5
+Revises: 55038e53bf7c
+Create Date: 2026-10-19 11:40:02.518907
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5f1923a2e8a5"
+down_revision: Union[str, Sequence[str], None] = "55038e53bf7c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "places",
+        sa.Column("rating_sum", sa.Integer(), server_default="0", nullable=False),
+    )
+
+    # Backfill running aggregates from existing reviews
+    op.execute(
+        """
+        UPDATE places p
+        SET rating_sum = s.rating_sum,
+            review_count = s.review_count,
+            average_rating = round(s.rating_sum::numeric / s.review_count, 1)
+        FROM (
+            SELECT place_id, sum(rating) AS rating_sum, count(*) AS review_count
+            FROM reviews
+            GROUP BY place_id
+        ) s
+        WHERE s.place_id = p.id
+        """
+    )
+    # Places without reviews start from zero too, whatever they held before
+    op.execute(
+        """
+        UPDATE places p
+        SET rating_sum = 0, review_count = 0, average_rating = 0
+        WHERE NOT EXISTS (SELECT 1 FROM reviews r WHERE r.place_id = p.id)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("places", "rating_sum")
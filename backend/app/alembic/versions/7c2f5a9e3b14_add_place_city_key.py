@@ -0,0 +1,47 @@
+"""add_place_city_key
+
+Revision ID: 7c2f5a9e3b14
+Revises: 0b9e3f7c5d21
+Create Date: 2026-10-19 19:12:36.804152
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c2f5a9e3b14"
+down_revision: Union[str, Sequence[str], None] = "0b9e3f7c5d21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = "ix_places_city_key_place_type_average_rating"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "places",
+        sa.Column(
+            "city_key",
+            sa.String(length=100),
+            sa.Computed("lower(replace(city, ' ', ''))", persisted=True),
+            nullable=True,
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            INDEX_NAME,
+            "places",
+            ["city_key", "place_type", sa.text("average_rating DESC")],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(INDEX_NAME, table_name="places", postgresql_concurrently=True)
+    op.drop_column("places", "city_key")
@@ -0,0 +1,129 @@
+"""add_queue_partial_indexes
+
+Revision ID: 8c4e2f7a9b31
+Revises: 5f1923a2e8a5
+Create Date: 2026-10-19 13:05:47.226014
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c4e2f7a9b31"
+down_revision: Union[str, Sequence[str], None] = "5f1923a2e8a5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+DUPLICATE_PENDING_CASES = """
+    SELECT id, first_value(id) OVER (
+        PARTITION BY target_type, target_id ORDER BY created_at, id
+    ) AS keep_id
+    FROM moderation_targets
+    WHERE status = 'pending'
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Merge duplicate pending cases into the oldest one before enforcing
+    # one pending case per target
+    op.execute(
+        f"""
+        UPDATE content_reports cr
+        SET moderation_target_id = d.keep_id
+        FROM ({DUPLICATE_PENDING_CASES}) d
+        WHERE cr.moderation_target_id = d.id AND d.id <> d.keep_id
+        """
+    )
+    op.execute(
+        f"""
+        DELETE FROM moderation_targets mt
+        USING ({DUPLICATE_PENDING_CASES}) d
+        WHERE mt.id = d.id AND d.id <> d.keep_id
+        """
+    )
+
+    # Build indexes without locking writes on large tables
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_moderation_targets_status_created_at",
+            "moderation_targets",
+            ["status", "created_at"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_moderation_targets_target",
+            "moderation_targets",
+            ["target_type", "target_id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "uq_moderation_targets_pending_target",
+            "moderation_targets",
+            ["target_type", "target_id"],
+            unique=True,
+            postgresql_where=sa.text("status = 'pending'"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_content_reports_moderation_target_id",
+            "content_reports",
+            ["moderation_target_id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_business_verification_requests_pending_created_at",
+            "business_verification_requests",
+            ["created_at"],
+            postgresql_where=sa.text("status = 'pending'"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_business_verification_requests_pending_profile_id",
+            "business_verification_requests",
+            ["profile_id"],
+            postgresql_where=sa.text("status = 'pending'"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_forum_posts_visible_created_at",
+            "forum_posts",
+            ["created_at"],
+            postgresql_where=sa.text("visible IS TRUE"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_forum_posts_visible_reply_count",
+            "forum_posts",
+            ["reply_count"],
+            postgresql_where=sa.text("visible IS TRUE"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_forum_posts_visible_reply_count", table_name="forum_posts")
+    op.drop_index("ix_forum_posts_visible_created_at", table_name="forum_posts")
+    op.drop_index(
+        "ix_business_verification_requests_pending_profile_id",
+        table_name="business_verification_requests",
+    )
+    op.drop_index(
+        "ix_business_verification_requests_pending_created_at",
+        table_name="business_verification_requests",
+    )
+    op.drop_index(
+        "ix_content_reports_moderation_target_id", table_name="content_reports"
+    )
+    op.drop_index(
+        "uq_moderation_targets_pending_target", table_name="moderation_targets"
+    )
+    op.drop_index("ix_moderation_targets_target", table_name="moderation_targets")
+    op.drop_index(
+        "ix_moderation_targets_status_created_at", table_name="moderation_targets"
+    )
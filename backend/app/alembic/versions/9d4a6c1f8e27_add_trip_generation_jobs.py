@@ -0,0 +1,84 @@
+"""add_trip_generation_jobs
+
+Revision ID: 9d4a6c1f8e27
+Revises: 7c2f5a9e3b14
+Create Date: 2026-10-19 20:03:51.277409
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4a6c1f8e27"
+down_revision: Union[str, Sequence[str], None] = "7c2f5a9e3b14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "trip_generation_jobs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("request", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("days_total", sa.Integer(), nullable=False),
+        sa.Column("days_done", sa.Integer(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("trip_id", sa.UUID(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            postgresql.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            postgresql.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("finished_at", postgresql.TIMESTAMP(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["trip_id"],
+            ["trips.id"],
+            name=op.f("fk_trip_generation_jobs_trip_id_trips"),
+            ondelete="SET NULL",
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["profiles.id"],
+            name=op.f("fk_trip_generation_jobs_user_id_profiles"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_trip_generation_jobs")),
+    )
+    op.create_index(
+        op.f("ix_trip_generation_jobs_user_id"),
+        "trip_generation_jobs",
+        ["user_id"],
+    )
+    op.create_index(
+        "ix_trip_generation_jobs_unfinished_created_at",
+        "trip_generation_jobs",
+        ["created_at"],
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_trip_generation_jobs_unfinished_created_at",
+        table_name="trip_generation_jobs",
+    )
+    op.drop_index(
+        op.f("ix_trip_generation_jobs_user_id"), table_name="trip_generation_jobs"
+    )
+    op.drop_table("trip_generation_jobs")
@@ -0,0 +1,116 @@
+"""partition_likes_and_reports
+
+Revision ID: a7d3c91e5f02
+Revises: 8c4e2f7a9b31
+Create Date: 2026-10-19 14:22:10.581344
+
+"""
+
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7d3c91e5f02"
+down_revision: Union[str, Sequence[str], None] = "8c4e2f7a9b31"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Monthly partitions created ahead of the current month
+MONTHS_AHEAD = 3
+
+# table -> (foreign keys as (column, referred table, ondelete), index columns)
+TABLES = {
+    "post_likes": (
+        [
+            ("post_id", "forum_posts", "CASCADE"),
+            ("user_id", "profiles", "CASCADE"),
+        ],
+        ["post_id", "user_id"],
+    ),
+    "reply_likes": (
+        [
+            ("reply_id", "post_replies", "CASCADE"),
+            ("user_id", "profiles", "CASCADE"),
+        ],
+        ["reply_id", "user_id"],
+    ),
+    "content_reports": (
+        [
+            ("reporter_id", "profiles", None),
+            ("moderation_target_id", "moderation_targets", "CASCADE"),
+        ],
+        ["moderation_target_id"],
+    ),
+}
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    """Recreate `table` with or without partitioning, keeping its rows."""
+    foreign_keys, index_columns = TABLES[table]
+    old = f"{table}_old"
+
+    op.rename_table(table, old)
+    op.execute(f"ALTER TABLE {old} RENAME CONSTRAINT pk_{table} TO pk_{old}")
+    op.execute(
+        f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS)"
+        + (" PARTITION BY RANGE (created_at)" if partitioned else "")
+    )
+    # The partition key must be part of the primary key
+    op.create_primary_key(
+        f"pk_{table}", table, ["id", "created_at"] if partitioned else ["id"]
+    )
+
+    if partitioned:
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+        oldest = (
+            op.get_bind()
+            .execute(sa.text(f"SELECT min(created_at) FROM {old}"))
+            .scalar()
+        )
+        current = datetime.now(timezone.utc).date().replace(day=1)
+        month = current
+        if oldest is not None:
+            month = oldest.astimezone(timezone.utc).date().replace(day=1)
+        while month <= _add_months(current, MONTHS_AHEAD):
+            op.execute(
+                f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+                f"TO ('{_add_months(month, 1).isoformat()} 00:00:00+00')"
+            )
+            month = _add_months(month, 1)
+
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    op.drop_table(old)
+
+    for column, referred, ondelete in foreign_keys:
+        op.create_foreign_key(
+            op.f(f"fk_{table}_{column}_{referred}"),
+            table,
+            referred,
+            [column],
+            ["id"],
+            ondelete=ondelete,
+        )
+    op.create_index(f"ix_{table}_{'_'.join(index_columns)}", table, index_columns)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The partition key becomes part of the primary key, so it can't be NULL
+    op.execute("UPDATE content_reports SET created_at = now() WHERE created_at IS NULL")
+    for table in TABLES:
+        _rebuild(table, partitioned=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        _rebuild(table, partitioned=False)
@@ -0,0 +1,43 @@
+"""add_profile_public_trips_count
+
+Revision ID: b6e1d4a8c352
+Revises: 9d4a6c1f8e27
+Create Date: 2026-10-19 23:41:07.518302
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b6e1d4a8c352"
+down_revision: Union[str, Sequence[str], None] = "9d4a6c1f8e27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "profile_stats",
+        sa.Column(
+            "public_trips_count", sa.Integer(), server_default="0", nullable=False
+        ),
+    )
+
+    # Backfill from the trips that are public now
+    op.execute(
+        """
+        UPDATE profile_stats ps
+        SET public_trips_count = (
+            SELECT count(*) FROM trips t WHERE t.user_id = ps.profile_id AND t.public
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("profile_stats", "public_trips_count")
@@ -0,0 +1,132 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: c41b8e6d2a97
+Revises: a7d3c91e5f02
+Create Date: 2026-10-19 15:48:36.907712
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c41b8e6d2a97"
+down_revision: Union[str, Sequence[str], None] = "a7d3c91e5f02"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIP_START_SORT_KEY = "coalesce(start_date, DATE '9999-12-31')"
+
+# name -> (table, columns, WHERE clause)
+INDEXES = {
+    "ix_places_average_rating_id": ("places", ["average_rating", "id"], None),
+    "ix_places_created_at_id": ("places", ["created_at", "id"], None),
+    "ix_reviews_place_id_created_at_id": (
+        "reviews",
+        ["place_id", "created_at", "id"],
+        None,
+    ),
+    "ix_reviews_user_id_created_at_id": (
+        "reviews",
+        ["user_id", "created_at", "id"],
+        None,
+    ),
+    "ix_review_images_review_id": ("review_images", ["review_id"], None),
+    "ix_saved_lists_user_id_created_at_id": (
+        "saved_lists",
+        ["user_id", "created_at", "id"],
+        None,
+    ),
+    "ix_trips_user_id_start_date_id": (
+        "trips",
+        ["user_id", sa.text(TRIP_START_SORT_KEY), "id"],
+        None,
+    ),
+    "ix_trips_public_start_date_id": (
+        "trips",
+        [sa.text(TRIP_START_SORT_KEY), "id"],
+        "public",
+    ),
+    "ix_forum_posts_visible_created_at_id": (
+        "forum_posts",
+        ["created_at", "id"],
+        "visible IS TRUE",
+    ),
+    "ix_forum_posts_visible_reply_count_id": (
+        "forum_posts",
+        ["reply_count", "id"],
+        "visible IS TRUE",
+    ),
+    "ix_forum_posts_author_id_created_at_id": (
+        "forum_posts",
+        ["author_id", "created_at", "id"],
+        None,
+    ),
+    "ix_post_replies_user_id_created_at_id": (
+        "post_replies",
+        ["user_id", "created_at", "id"],
+        None,
+    ),
+    "ix_moderation_targets_status_created_at_id": (
+        "moderation_targets",
+        ["status", "created_at", "id"],
+        None,
+    ),
+    "ix_moderation_targets_created_at_id": (
+        "moderation_targets",
+        ["created_at", "id"],
+        None,
+    ),
+}
+
+# Superseded by the (..., id) variants above
+REPLACED_INDEXES = {
+    "ix_forum_posts_visible_created_at": (
+        "forum_posts",
+        ["created_at"],
+        "visible IS TRUE",
+    ),
+    "ix_forum_posts_visible_reply_count": (
+        "forum_posts",
+        ["reply_count"],
+        "visible IS TRUE",
+    ),
+    "ix_moderation_targets_status_created_at": (
+        "moderation_targets",
+        ["status", "created_at"],
+        None,
+    ),
+}
+
+
+def _create(indexes: dict) -> None:
+    for name, (table, columns, where) in indexes.items():
+        op.create_index(
+            name,
+            table,
+            columns,
+            postgresql_where=sa.text(where) if where else None,
+            postgresql_concurrently=True,
+        )
+
+
+def _drop(indexes: dict) -> None:
+    for name, (table, _, _) in indexes.items():
+        op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build indexes without locking writes on large tables
+    with op.get_context().autocommit_block():
+        _create(INDEXES)
+        _drop(REPLACED_INDEXES)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        _create(REPLACED_INDEXES)
+        _drop(INDEXES)
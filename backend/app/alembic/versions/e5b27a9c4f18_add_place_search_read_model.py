@@ -0,0 +1,147 @@
+"""add_place_search_read_model
+
+Revision ID: e5b27a9c4f18
+Revises: c41b8e6d2a97
+Create Date: 2026-10-19 16:37:52.214806
+
+"""
+
+from typing import Sequence, Union
+
+import geoalchemy2
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "e5b27a9c4f18"
+down_revision: Union[str, Sequence[str], None] = "c41b8e6d2a97"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same rows as app.service.place_search_service.refresh_place_search
+BACKFILL = """
+INSERT INTO place_search (
+    place_id, name, place_type, address, city, country, location,
+    main_image_url, average_rating, review_count, opening_hours,
+    price_range, amenities, hotel_class, price_per_night, tags,
+    search_vector, created_at
+)
+SELECT
+    p.id, p.name, p.place_type, p.address, p.city, p.country, p.location,
+    p.main_image_url, p.average_rating, p.review_count, p.opening_hours,
+    coalesce(r.price_range, c.price_range),
+    coalesce(h.amenities, c.amenities),
+    h.hotel_class,
+    h.price_per_night,
+    (
+        SELECT coalesce(array_agg(t.name), '{}'::varchar[])
+        FROM place_tags pt JOIN tags t ON t.id = pt.tag_id
+        WHERE pt.place_id = p.id
+    ),
+    setweight(to_tsvector('simple'::regconfig, coalesce(p.name, '')), 'A')
+    || setweight(
+        to_tsvector(
+            'simple'::regconfig,
+            concat_ws(' ', coalesce(p.city, ''), coalesce(p.country, ''))
+        ),
+        'B'
+    ),
+    p.created_at
+FROM places p
+LEFT JOIN hotels h ON h.id = p.id
+LEFT JOIN restaurants r ON r.id = p.id
+LEFT JOIN cafes c ON c.id = p.id
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "place_search",
+        sa.Column("place_id", sa.UUID(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("place_type", sa.String(length=50), nullable=False),
+        sa.Column("address", sa.Text(), nullable=True),
+        sa.Column("city", sa.String(length=100), nullable=True),
+        sa.Column("country", sa.String(length=100), nullable=True),
+        sa.Column(
+            "location",
+            geoalchemy2.types.Geography(
+                geometry_type="POINT",
+                srid=4326,
+                dimension=2,
+                spatial_index=False,
+                from_text="ST_GeogFromText",
+                name="geography",
+            ),
+            nullable=True,
+        ),
+        sa.Column("main_image_url", sa.String(length=255), nullable=True),
+        sa.Column("average_rating", sa.Numeric(precision=2, scale=1), nullable=False),
+        sa.Column("review_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "opening_hours", postgresql.JSONB(astext_type=sa.Text()), nullable=True
+        ),
+        sa.Column("price_range", sa.String(length=10), nullable=True),
+        sa.Column("amenities", postgresql.ARRAY(sa.String()), nullable=True),
+        sa.Column("hotel_class", sa.Integer(), nullable=True),
+        sa.Column("price_per_night", sa.Numeric(), nullable=True),
+        sa.Column("tags", postgresql.ARRAY(sa.String()), nullable=False),
+        sa.Column("search_vector", postgresql.TSVECTOR(), nullable=False),
+        sa.Column("created_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["place_id"],
+            ["places.id"],
+            name=op.f("fk_place_search_place_id_places"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("place_id", name=op.f("pk_place_search")),
+    )
+    op.execute(BACKFILL)
+
+    # Indexes are built after the backfill, which is faster than maintaining
+    # them row by row
+    op.create_index(
+        "idx_place_search_location",
+        "place_search",
+        ["location"],
+        postgresql_using="gist",
+    )
+    op.create_index(
+        op.f("ix_place_search_place_type"), "place_search", ["place_type"]
+    )
+    op.create_index(
+        "ix_place_search_tags", "place_search", ["tags"], postgresql_using="gin"
+    )
+    op.create_index(
+        "ix_place_search_amenities",
+        "place_search",
+        ["amenities"],
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_place_search_search_vector",
+        "place_search",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_place_search_average_rating_id",
+        "place_search",
+        ["average_rating", "place_id"],
+    )
+    op.create_index(
+        "ix_place_search_created_at_id", "place_search", ["created_at", "place_id"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("place_search")
@@ -0,0 +1,59 @@
+"""sparse_trip_stop_order
+
+Revision ID: f28d4b6e1a53
+Revises: e5b27a9c4f18
+Create Date: 2026-10-19 17:21:05.639217
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f28d4b6e1a53"
+down_revision: Union[str, Sequence[str], None] = "e5b27a9c4f18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match app.service.trip_service.STOP_ORDER_GAP
+STOP_ORDER_GAP = 1024
+
+
+def _renumber(step: int) -> None:
+    """Rewrite every trip's stop_order as step, 2 * step, ... in stop order."""
+    op.execute(
+        f"""
+        UPDATE trip_stops SET stop_order = ranked.position * {step}
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY trip_id ORDER BY stop_order, id
+            ) AS position
+            FROM trip_stops
+        ) AS ranked
+        WHERE trip_stops.id = ranked.id
+        """
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _renumber(STOP_ORDER_GAP)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_trip_stops_trip_id_stop_order_id",
+            "trip_stops",
+            ["trip_id", "stop_order", "id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_trip_stops_trip_id_stop_order_id",
+            table_name="trip_stops",
+            postgresql_concurrently=True,
+        )
+    _renumber(1)
@@ -1,7 +1,7 @@
 import uuid
 from typing import Annotated, AsyncGenerator
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -12,6 +12,7 @@ from app.core.security import (
     get_token_payload,
 )
 from app.models import Profile
+from app.service.pagination import CountMode
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -103,3 +104,19 @@ async def get_optional_current_user(
 
 # Optional Current User Dependency
 OptionalCurrentUserDep = Annotated[Profile | None, Depends(get_optional_current_user)]
+
+
+def get_count_mode(
+    count_mode: Annotated[
+        CountMode, Query(description="How meta.total_items is computed")
+    ] = "exact",
+    include_total: Annotated[
+        bool, Query(description="Set to false to skip computing meta.total_items")
+    ] = True,
+) -> CountMode:
+    """Resolve the total-count strategy of a list request."""
+    return count_mode if include_total else "none"
+
+
+# List Total-Count Strategy Dependency
+CountModeDep = Annotated[CountMode, Depends(get_count_mode)]
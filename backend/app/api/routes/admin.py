@@ -5,7 +5,7 @@ from typing import List
 
 from fastapi import APIRouter, HTTPException, status
 
-from app.api.deps import CurrentUserDep, SessionDep
+from app.api.deps import CountModeDep, CurrentUserDep, SessionDep
 from app.schemas import (
     APIResponse,
     BusinessVerificationDetail,
@@ -31,9 +31,11 @@ router = APIRouter(tags=["admin"], prefix="/admin")
 async def get_moderation_cases(
     session: SessionDep,
     current_user: CurrentUserDep,
+    count_mode: CountModeDep,
     page: int = 1,
     limit: int = 20,
     status_filter: str | None = None,
+    cursor: str | None = None,
 ):
     """
     Get all moderation cases for admin review.
@@ -50,16 +52,23 @@ async def get_moderation_cases(
             detail="Admin access required",
         )
 
-    cases, total_count = await admin_service.get_moderation_cases(
+    cases, total_count, next_cursor = await admin_service.get_moderation_cases(
         session=session,
         page=page,
         limit=limit,
         status_filter=status_filter,
+        cursor=cursor,
+        count_mode=count_mode,
     )
 
     return APIResponse(
         data=cases,
-        meta={"page": page, "limit": limit, "total_items": total_count},
+        meta={
+            "page": page,
+            "limit": limit,
+            "total_items": total_count,
+            "next_cursor": next_cursor,
+        },
     )
 
 
@@ -275,3 +284,37 @@ async def verify_business(
             message=f"Business verification request {'approved' if data.action == 'approve' else 'rejected'} successfully"
         )
     )
+
+
+@router.post(
+    "/stats/reconcile",
+    response_model=APIResponse[Message],
+    responses={
+        403: {"model": HTTPError},
+    },
+)
+async def reconcile_stats(
+    session: SessionDep,
+    current_user: CurrentUserDep,
+    user_id: uuid.UUID | None = None,
+):
+    """
+    Recompute profile activity counters from source tables.
+
+    Query Parameters:
+    - user_id: Optional profile to reconcile. All profiles when omitted.
+
+    **Admin only**
+    """
+    # Check admin permission
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+
+    reconciled = await admin_service.reconcile_stats(session=session, user_id=user_id)
+
+    return APIResponse(
+        data=Message(message=f"Reconciled stats for {reconciled} profile(s)")
+    )
@@ -1,9 +1,14 @@
 import uuid
 from typing import Annotated, Any
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, HTTPException, Query, Request, status
 
-from app.api.deps import CurrentUserDep, OptionalCurrentUserDep, SessionDep
+from app.api.deps import (
+    CountModeDep,
+    CurrentUserDep,
+    OptionalCurrentUserDep,
+    SessionDep,
+)
 from app.schemas import (
     APIResponse,
     ContentReportCreate,
@@ -21,6 +26,8 @@ from app.schemas import (
     MetaData,
 )
 from app.service.forum_service import (
+    REPLY_MAX_DEPTH,
+    REPLY_PAGE_SIZE,
     check_user_liked_post,
     check_user_liked_reply,
     create_forum_post,
@@ -30,6 +37,7 @@ from app.service.forum_service import (
     get_all_tags,
     get_forum_post,
     list_forum_posts,
+    list_forum_replies,
     report_forum_post,
     report_forum_reply,
     toggle_forum_post_like,
@@ -37,6 +45,7 @@ from app.service.forum_service import (
     update_forum_post,
     update_forum_reply,
 )
+from app.service.pagination import InvalidCursorError
 
 router = APIRouter(tags=["forum"], prefix="/forum")
 
@@ -53,18 +62,24 @@ async def search_forum_posts(
     session: SessionDep,
     filter_params: Annotated[ForumSearchFilter, Query()],
     current_user: OptionalCurrentUserDep,
+    count_mode: CountModeDep,
 ) -> Any:
     """
     Search and list forum threads.
-    Query Parameters: q, tag, sort, page, limit
+    Query Parameters: q, tag, sort, page, limit, cursor
     """
     user_id = current_user.id if current_user else None
-    results, total = await list_forum_posts(session, filter_params, user_id)
+    results, total, next_cursor = await list_forum_posts(
+        session, filter_params, user_id, count_mode
+    )
 
     return APIResponse(
         data=results,
         meta=MetaData(
-            page=filter_params.page, limit=filter_params.limit, total_items=total
+            page=filter_params.page,
+            limit=filter_params.limit,
+            total_items=total,
+            next_cursor=next_cursor,
         ),
     )
 
@@ -77,19 +92,62 @@ async def search_forum_posts(
 async def get_forum_post_detail(
     session: SessionDep,
     id: uuid.UUID,
+    request: Request,
     current_user: OptionalCurrentUserDep,
 ) -> Any:
     """
     Get thread details and replies.
     """
     user_id = current_user.id if current_user else None
-    post = await get_forum_post(session, id, user_id)
+    if user_id:
+        viewer_key = str(user_id)
+    else:
+        viewer_key = request.client.host if request.client else None
+    post = await get_forum_post(session, id, user_id, viewer_key)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
     return APIResponse(data=post)
 
 
+@router.get(
+    "/posts/{id}/replies",
+    status_code=status.HTTP_200_OK,
+    response_model=APIResponse[list[ForumCommentSchema]],
+)
+async def get_forum_post_replies(
+    session: SessionDep,
+    id: uuid.UUID,
+    current_user: OptionalCurrentUserDep,
+    parent_id: uuid.UUID | None = None,
+    cursor: str | None = None,
+    page: Annotated[int, Query(ge=1)] = 1,
+    limit: Annotated[int, Query(ge=1, le=100)] = REPLY_PAGE_SIZE,
+    depth: Annotated[int, Query(ge=1, le=REPLY_MAX_DEPTH)] = REPLY_MAX_DEPTH,
+) -> Any:
+    """
+    Get a page of a thread's replies: top-level replies, or the direct
+    replies of `parent_id`, each followed by its descendants down to `depth`
+    levels. Query Parameters: parent_id, cursor, page, limit, depth
+    """
+    user_id = current_user.id if current_user else None
+    try:
+        replies, next_cursor = await list_forum_replies(
+            session, id, parent_id, user_id, limit, cursor, depth, page
+        )
+    except InvalidCursorError:
+        raise  # 400, see the handler in app.main
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return APIResponse(
+        data=replies,
+        meta=MetaData(
+            page=page, limit=limit, total_items=None, next_cursor=next_cursor
+        ),
+    )
+
+
 @router.get(
     "/tags",
     status_code=status.HTTP_200_OK,
@@ -3,7 +3,7 @@ import uuid
 from fastapi import APIRouter, HTTPException, status
 
 from app import crud
-from app.api.deps import CurrentUserDep, SessionDep
+from app.api.deps import CountModeDep, CurrentUserDep, SessionDep
 from app.schemas import (
     AddPlaceToListRequest,
     APIResponse,
@@ -28,13 +28,19 @@ router = APIRouter(tags=["lists"], prefix="/lists")
 async def list_lists(
     session: SessionDep,
     current_user: CurrentUserDep,
+    count_mode: CountModeDep,
     page: int = 1,
     limit: int = 20,
+    cursor: str | None = None,
 ):
-    lists, total = await crud.list_saved_lists(session, current_user.id, page, limit)
+    lists, total, next_cursor = await crud.list_saved_lists(
+        session, current_user.id, page, limit, cursor, count_mode
+    )
     return APIResponse(
         data=lists,
-        meta=MetaData(page=page, limit=limit, total_items=total),
+        meta=MetaData(
+            page=page, limit=limit, total_items=total, next_cursor=next_cursor
+        ),
     )
 
 
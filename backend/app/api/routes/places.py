@@ -6,7 +6,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
 from app import crud
-from app.api.deps import CurrentUserDep, SessionDep
+from app.api.deps import CountModeDep, CurrentUserDep, SessionDep
 from app.models import Place
 from app.schemas import (
     APIResponse,
@@ -37,17 +37,20 @@ router = APIRouter(tags=["places"], prefix="/places")
     response_model=APIResponse[PlaceSearchResponse],
     responses={
         400: {"model": HTTPError},
+        504: {"model": HTTPError},
     },
 )
 async def search_places(
     session: SessionDep,
     filter_params: Annotated[PlaceSearchFilter, Query()],
+    count_mode: CountModeDep,
 ) -> Any:
     """
     Search places by keyword, tags, price, or location (radius).
 
-    Pagination (page/limit parameters) applies to places only.
+    Pagination (page/limit, or cursor from meta.next_cursor) applies to places only.
     Additionally returns up to 5 related forum posts and 5 public trips as supplementary results.
+    Use include=posts, include=trips or an empty include to limit them.
 
     Metadata total_items reflects the count of places only.
     """
@@ -58,12 +61,23 @@ async def search_places(
             detail="Location (lat,lng) is required for distance sorting.",
         )
 
-    response, total = await crud.search_places(session, filter_params)
+    try:
+        response, total, next_cursor = await crud.search_places(
+            session, filter_params, count_mode
+        )
+    except TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Search took too long, please narrow it down.",
+        )
 
     return APIResponse(
         data=response,
         meta=MetaData(
-            page=filter_params.page, limit=filter_params.limit, total_items=total
+            page=filter_params.page,
+            limit=filter_params.limit,
+            total_items=total,
+            next_cursor=next_cursor,
         ),
     )
 
@@ -145,17 +159,26 @@ async def get_place(session: SessionDep, id: uuid.UUID) -> Any:
     },
 )
 async def list_reviews_for_place(
-    session: SessionDep, id: uuid.UUID, page: int = 1, limit: int = 20
+    session: SessionDep,
+    id: uuid.UUID,
+    count_mode: CountModeDep,
+    page: int = 1,
+    limit: int = 20,
+    cursor: str | None = None,
 ) -> Any:
     # Ensure place exists
     exists = await session.get(Place, id)
     if not exists:
         raise HTTPException(status_code=404, detail="Place not found")
 
-    reviews, total = await crud.list_reviews_for_place(session, id, page, limit)
+    reviews, total, next_cursor = await crud.list_reviews_for_place(
+        session, id, page, limit, cursor, count_mode
+    )
     return APIResponse(
         data=reviews,
-        meta=MetaData(page=page, limit=limit, total_items=total),
+        meta=MetaData(
+            page=page, limit=limit, total_items=total, next_cursor=next_cursor
+        ),
     )
 
 
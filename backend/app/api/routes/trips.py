@@ -1,16 +1,32 @@
+import json
 import uuid
+from collections.abc import AsyncIterator
 
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
 
 from app import crud
-from app.api.deps import CurrentUserDep, OptionalCurrentUserDep, SessionDep
-from app.service.ai_service import generate_trip_plan
+from app.api.deps import (
+    CountModeDep,
+    CurrentUserDep,
+    OptionalCurrentUserDep,
+    SessionDep,
+)
+from app.core.db import sessionmanager
+from app.service import trip_job_service
+from app.service.ai_service import (
+    build_trip_prompt,
+    generate_trip_plan,
+    stream_trip_plan,
+)
 from app.schemas import (
     APIResponse,
     HTTPError,
     Message,
     MetaData,
     TripCreate,
+    TripDayPlan,
+    TripGenerationJobSchema,
     TripListSchema,
     TripSchema,
     TripUpdate,
@@ -28,16 +44,20 @@ router = APIRouter(tags=["trips"], prefix="/trips")
 async def list_trips(
     session: SessionDep,
     current_user: CurrentUserDep,
+    count_mode: CountModeDep,
     page: int = 1,
     limit: int = 20,
     public_only: bool = False,
+    cursor: str | None = None,
 ):
-    trips, total = await crud.list_trips(
-        session, current_user.id, page, limit, public_only
+    trips, total, next_cursor = await crud.list_trips(
+        session, current_user.id, page, limit, public_only, cursor, count_mode
     )
     return APIResponse(
         data=trips,
-        meta=MetaData(page=page, limit=limit, total_items=total),
+        meta=MetaData(
+            page=page, limit=limit, total_items=total, next_cursor=next_cursor
+        ),
     )
 
 
@@ -106,6 +126,33 @@ async def update_trip(
     return APIResponse(data=trip)
 
 
+@router.post(
+    "/{trip_id}/optimize",
+    status_code=status.HTTP_200_OK,
+    response_model=APIResponse[TripSchema],
+    responses={
+        403: {"model": HTTPError},
+        404: {"model": HTTPError},
+    },
+)
+async def optimize_trip_route(
+    session: SessionDep,
+    current_user: CurrentUserDep,
+    trip_id: uuid.UUID,
+):
+    """
+    Reorder each day's stops for the shortest route.
+    Hotels and meals keep their place, and the day's arrival times are kept.
+    """
+    try:
+        trip = await crud.optimize_trip_route(session, current_user.id, trip_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except PermissionError:
+        raise HTTPException(status_code=403, detail="Not allowed")
+    return APIResponse(data=trip)
+
+
 @router.delete(
     "/{trip_id}",
     status_code=status.HTTP_200_OK,
@@ -161,3 +208,101 @@ async def generate_trip(
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI generation failed: {str(e)}")
+
+
+def _sse(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+@router.post(
+    "/generate/stream",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"text/event-stream": {}}},
+        400: {"model": HTTPError},
+    },
+)
+async def generate_trip_stream(
+    session: SessionDep,
+    current_user: CurrentUserDep,
+    body: TripGenerateRequest,
+):
+    """
+    Generate a trip itinerary using AI, streamed as Server-Sent Events.
+
+    - `day`: a TripDayPlan with that day's stops, as soon as it is planned
+    - `trip`: `{"id": ...}` of the saved trip, sent last
+    - `error`: `{"detail": ...}` if generation fails midway
+    """
+    try:
+        prompt, place_ids, draft = await build_trip_prompt(session, body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    user_id = current_user.id
+    # End the read transaction so its connection goes back to the pool while
+    # the model runs; the session itself stays open until the response ends
+    await session.commit()
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for item in stream_trip_plan(body, prompt, place_ids, draft):
+                if isinstance(item, TripDayPlan):
+                    yield _sse("day", item.model_dump_json())
+                    continue
+                # The request session is held, idle, until the response ends;
+                # save through a short session of its own
+                async with sessionmanager.session() as stream_session:
+                    saved_trip = await crud.create_trip(stream_session, user_id, item)
+                yield _sse("trip", json.dumps({"id": str(saved_trip.id)}))
+        except ValueError as e:
+            yield _sse("error", json.dumps({"detail": str(e)}))
+        except Exception as e:
+            detail = f"AI generation failed: {str(e)}"
+            yield _sse("error", json.dumps({"detail": detail}))
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@router.post(
+    "/generate/jobs",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=APIResponse[TripGenerationJobSchema],
+)
+async def enqueue_trip_generation(
+    session: SessionDep,
+    current_user: CurrentUserDep,
+    body: TripGenerateRequest,
+):
+    """
+    Queue an AI trip generation and return the job right away.
+    Poll `GET /trips/generate/jobs/{job_id}` for progress and the saved trip id.
+    """
+    job = await trip_job_service.enqueue_trip_generation(
+        session, current_user.id, body
+    )
+    return APIResponse(data=TripGenerationJobSchema.model_validate(job))
+
+
+@router.get(
+    "/generate/jobs/{job_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=APIResponse[TripGenerationJobSchema],
+    responses={
+        404: {"model": HTTPError},
+    },
+)
+async def get_trip_generation_job(
+    session: SessionDep,
+    current_user: CurrentUserDep,
+    job_id: uuid.UUID,
+):
+    """
+    Get the status of one of your trip generation jobs.
+    """
+    job = await trip_job_service.get_trip_generation_job(
+        session, current_user.id, job_id
+    )
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return APIResponse(data=TripGenerationJobSchema.model_validate(job))
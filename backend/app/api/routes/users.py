@@ -1,9 +1,9 @@
 import uuid
-from typing import List
+from typing import Annotated, List
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
 
-from app.api.deps import CurrentUserIdDep, SessionDep
+from app.api.deps import CountModeDep, CurrentUserIdDep, SessionDep
 from app.schemas import (
     APIResponse,
     BusinessVerificationSubmission,
@@ -15,12 +15,14 @@ from app.schemas import (
     UserDetail,
     UserPhotoResponse,
     UserPostResponse,
+    UserProfilePage,
     UserPublic,
     UserReplyResponse,
     UserReviewResponse,
     UserUpdate,
 )
 from app.service import trip_service, user_service
+from app.service.user_service import PROFILE_TAB_SIZE
 
 router = APIRouter(tags=["users"], prefix="/users")
 
@@ -144,6 +146,33 @@ async def get_user(
     return APIResponse(data=user_public, meta=None)
 
 
+@router.get(
+    "/{user_id}/profile",
+    status_code=status.HTTP_200_OK,
+    response_model=APIResponse[UserProfilePage],
+    responses={
+        404: {"model": HTTPError},
+    },
+)
+async def get_user_profile_page(
+    user_id: uuid.UUID,
+    limit: Annotated[int, Query(ge=1, le=50)] = PROFILE_TAB_SIZE,
+):
+    """
+    Get everything a profile page renders in one request: the public profile
+    with statistics and the first page of reviews, posts, replies, photos and
+    public trips. Each tab carries the cursor of its next page.
+    """
+    profile_page = await user_service.get_user_profile_page(user_id, limit)
+    if not profile_page:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User profile not found",
+        )
+
+    return APIResponse(data=profile_page, meta=None)
+
+
 @router.get(
     "/{user_id}/reviews",
     status_code=status.HTTP_200_OK,
@@ -152,16 +181,22 @@ async def get_user(
 async def get_user_reviews(
     session: SessionDep,
     user_id: uuid.UUID,
+    count_mode: CountModeDep,
     page: int = 1,
     limit: int = 20,
+    cursor: str | None = None,
 ):
     """
     Get list of reviews written by a specific user.
     """
-    reviews, total = await user_service.get_user_reviews(session, user_id, page, limit)
+    reviews, total, next_cursor = await user_service.get_user_reviews(
+        session, user_id, page, limit, cursor, count_mode
+    )
     return APIResponse(
         data=reviews,
-        meta=MetaData(page=page, limit=limit, total_items=total),
+        meta=MetaData(
+            page=page, limit=limit, total_items=total, next_cursor=next_cursor
+        ),
     )
 
 
@@ -173,16 +208,22 @@ async def get_user_reviews(
 async def get_user_posts(
     session: SessionDep,
     user_id: uuid.UUID,
+    count_mode: CountModeDep,
     page: int = 1,
     limit: int = 20,
+    cursor: str | None = None,
 ):
     """
     Get list of forum threads created by a specific user.
     """
-    posts, total = await user_service.get_user_posts(session, user_id, page, limit)
+    posts, total, next_cursor = await user_service.get_user_posts(
+        session, user_id, page, limit, cursor, count_mode
+    )
     return APIResponse(
         data=posts,
-        meta=MetaData(page=page, limit=limit, total_items=total),
+        meta=MetaData(
+            page=page, limit=limit, total_items=total, next_cursor=next_cursor
+        ),
     )
 
 
@@ -194,18 +235,28 @@ async def get_user_posts(
 async def get_user_trips(
     session: SessionDep,
     user_id: uuid.UUID,
+    count_mode: CountModeDep,
     page: int = 1,
     limit: int = 20,
+    cursor: str | None = None,
 ):
     """
     Get list of public trips created by a specific user.
     """
-    trips, total = await trip_service.list_trips(
-        session, user_id, page, limit, public_only=True
+    trips, total, next_cursor = await trip_service.list_trips(
+        session,
+        user_id,
+        page,
+        limit,
+        public_only=True,
+        cursor=cursor,
+        count_mode=count_mode,
     )
     return APIResponse(
         data=trips,
-        meta=MetaData(page=page, limit=limit, total_items=total),
+        meta=MetaData(
+            page=page, limit=limit, total_items=total, next_cursor=next_cursor
+        ),
     )
 
 
@@ -217,16 +268,22 @@ async def get_user_trips(
 async def get_user_photos(
     session: SessionDep,
     user_id: uuid.UUID,
+    count_mode: CountModeDep,
     page: int = 1,
     limit: int = 20,
+    cursor: str | None = None,
 ):
     """
     Get gallery of photos uploaded by the user (aggregated from reviews and posts).
     """
-    photos, total = await user_service.get_user_photos(session, user_id, page, limit)
+    photos, total, next_cursor = await user_service.get_user_photos(
+        session, user_id, page, limit, cursor, count_mode
+    )
     return APIResponse(
         data=photos,
-        meta=MetaData(page=page, limit=limit, total_items=total),
+        meta=MetaData(
+            page=page, limit=limit, total_items=total, next_cursor=next_cursor
+        ),
     )
 
 
@@ -238,16 +295,22 @@ async def get_user_photos(
 async def get_user_replies(
     session: SessionDep,
     user_id: uuid.UUID,
+    count_mode: CountModeDep,
     page: int = 1,
     limit: int = 20,
+    cursor: str | None = None,
 ):
     """
     Get list of forum replies created by a specific user.
     """
-    replies, total = await user_service.get_user_replies(session, user_id, page, limit)
+    replies, total, next_cursor = await user_service.get_user_replies(
+        session, user_id, page, limit, cursor, count_mode
+    )
     return APIResponse(
         data=replies,
-        meta=MetaData(page=page, limit=limit, total_items=total),
+        meta=MetaData(
+            page=page, limit=limit, total_items=total, next_cursor=next_cursor
+        ),
     )
 
 
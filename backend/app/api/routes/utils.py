@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
-from app.api.deps import SessionDep
+from app.api.deps import CountModeDep, SessionDep
 from app import crud
 from app.schemas import APIResponse, MetaData, TripListSchema
 
@@ -25,15 +25,21 @@ async def health():
 )
 async def get_public_trips(
     session: SessionDep,
+    count_mode: CountModeDep,
     page: int = 1,
     limit: int = 20,
+    cursor: str | None = None,
 ):
     """
     Get public trips without authentication required.
     This endpoint returns trips that have been marked as public by their creators.
     """
-    trips, total = await crud.list_public_trips(session, page, limit)
+    trips, total, next_cursor = await crud.list_public_trips(
+        session, page, limit, cursor, count_mode
+    )
     return APIResponse(
         data=trips,
-        meta=MetaData(page=page, limit=limit, total_items=total),
+        meta=MetaData(
+            page=page, limit=limit, total_items=total, next_cursor=next_cursor
+        ),
     )
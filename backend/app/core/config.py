@@ -60,6 +60,56 @@ class Settings(BaseSettings):
         )
     
     GEMINI_API_KEY: str | None = None
+    # One Gemini client per worker (see app.core.gemini), reusing connections
+    GEMINI_TIMEOUT_SECONDS: float = 60.0
+    GEMINI_MAX_CONNECTIONS: int = 20
+    GEMINI_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    GEMINI_KEEPALIVE_SECONDS: float = 60.0
+    # AI trips start from a local plan (see app.service.itinerary_service),
+    # which is handed to Gemini as a draft and used as is when there is no
+    # GEMINI_API_KEY or Gemini takes longer than TRIP_AI_TIMEOUT_SECONDS
+    TRIP_PLAN_DRAFT_IN_PROMPT: bool = True
+    TRIP_AI_TIMEOUT_SECONDS: float = 30.0
+
+    # AI trip generation job workers per app worker (see
+    # app.service.trip_job_service); running jobs without a heartbeat for
+    # TRIP_JOB_STALE_SECONDS are picked up again, up to TRIP_JOB_MAX_ATTEMPTS.
+    # Workers send a heartbeat every TRIP_JOB_HEARTBEAT_SECONDS while they run
+    TRIP_JOB_WORKERS: int = 2
+    TRIP_JOB_POLL_INTERVAL_SECONDS: float = 2.0
+    TRIP_JOB_STALE_SECONDS: float = 300.0
+    TRIP_JOB_HEARTBEAT_SECONDS: float = 30.0
+    TRIP_JOB_MAX_ATTEMPTS: int = 3
+
+    # Forum view counts are buffered per worker and flushed on this interval
+    VIEW_COUNT_FLUSH_INTERVAL_SECONDS: float = 10.0
+    # Repeat views of a post by the same viewer within this window count once
+    VIEW_COUNT_DEDUP_WINDOW_SECONDS: float = 1800.0
+
+    # Monthly partitions of likes/reports are created this many months ahead
+    PARTITION_MONTHS_AHEAD: int = 3
+    PARTITION_MAINTENANCE_INTERVAL_SECONDS: float = 24 * 60 * 60
+    # Per-table retention, e.g. {"content_reports": 24}; unlisted tables keep
+    # every partition
+    PARTITION_RETENTION_MONTHS: dict[str, int] = {}
+
+    # List total_items strategies (see app.service.pagination.CountMode)
+    COUNT_CACHE_TTL_SECONDS: float = 60.0
+    COUNT_CACHE_MAX_ENTRIES: int = 1024
+    COUNT_ESTIMATE_EXACT_BELOW: int = 1000
+
+    # Process-wide tag name -> id cache (see app.service.tag_service)
+    TAG_CACHE_MAX_ENTRIES: int = 10_000
+
+    # Deadline for a place search, supplementary posts and trips included
+    SEARCH_TIMEOUT_SECONDS: float = 5.0
+
+    # Gemini output cache (see app.service.ai_cache_service); "sqlite" keeps
+    # entries in AI_CACHE_PATH, shared by every worker on the host
+    AI_CACHE_BACKEND: Literal["memory", "sqlite", "none"] = "memory"
+    AI_CACHE_PATH: str = "ai_cache.sqlite3"
+    AI_CACHE_TTL_SECONDS: float = 24 * 60 * 60
+    AI_CACHE_MAX_ENTRIES: int = 1000
 
 
 settings = Settings()  # type: ignore
@@ -0,0 +1,55 @@
+import httpx
+from google import genai
+from google.genai import types
+
+
+class GeminiClientManager:
+    """
+    Holds the worker's Gemini client so every request shares its HTTP
+    connection pool and TLS sessions instead of building a client per call.
+    """
+
+    def __init__(self):
+        self._client: genai.Client | None = None
+
+    def init(
+        self,
+        api_key: str,
+        timeout: float,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+    ):
+        self._client = genai.Client(
+            api_key=api_key,
+            http_options=types.HttpOptions(
+                # Milliseconds
+                timeout=int(timeout * 1000),
+                async_client_args={
+                    "limits": httpx.Limits(
+                        max_connections=max_connections,
+                        max_keepalive_connections=max_keepalive_connections,
+                        keepalive_expiry=keepalive_expiry,
+                    )
+                },
+            ),
+        )
+
+    async def close(self):
+        if self._client is None:
+            raise RuntimeError("GeminiClientManager is not initialized")
+        await self._client.aio.aclose()
+        self._client.close()
+        self._client = None
+
+    @property
+    def client(self) -> genai.Client:
+        if self._client is None:
+            raise RuntimeError("GeminiClientManager is not initialized")
+        return self._client
+
+    def is_initialized(self) -> bool:
+        return self._client is not None
+
+
+gemini = GeminiClientManager()
@@ -45,6 +45,7 @@ from app.service.trip_service import (
     get_trip,
     list_trips,
     list_public_trips,
+    optimize_trip_route,
     remove_trip_stop,
     update_trip,
     update_trip_stop,
@@ -82,6 +83,7 @@ __all__ = [
     "get_trip",
     "list_trips",
     "list_public_trips",
+    "optimize_trip_route",
     "remove_trip_stop",
     "update_trip",
     "update_trip_stop",
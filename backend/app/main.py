@@ -1,12 +1,20 @@
+import asyncio
+import contextlib
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
 from app.core.config import settings
 from app.core.db import sessionmanager
+from app.core.gemini import gemini
+from app.service.pagination import InvalidCursorError
+from app.service.partition_service import run_partition_maintenance
+from app.service.trip_job_service import run_trip_generation_workers
+from app.service.view_count_service import view_counter
 
 
 def init_app(init_db: bool) -> FastAPI:
@@ -15,8 +23,38 @@ def init_app(init_db: bool) -> FastAPI:
 
     @asynccontextmanager
     async def lifespan(app: FastAPI):
+        # Startup: One Gemini client per worker, shared by all AI requests
+        if settings.GEMINI_API_KEY:
+            gemini.init(
+                settings.GEMINI_API_KEY,
+                timeout=settings.GEMINI_TIMEOUT_SECONDS,
+                max_connections=settings.GEMINI_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.GEMINI_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.GEMINI_KEEPALIVE_SECONDS,
+            )
+        # Startup: Periodically flush buffered forum view counts
+        view_flusher = asyncio.create_task(
+            view_counter.run(settings.VIEW_COUNT_FLUSH_INTERVAL_SECONDS)
+        )
+        # Startup: Keep monthly partitions created ahead of time
+        partition_maintenance = asyncio.create_task(
+            run_partition_maintenance(settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS)
+        )
+        # Startup: Run queued AI trip generation jobs
+        trip_job_workers = asyncio.create_task(
+            run_trip_generation_workers(
+                settings.TRIP_JOB_WORKERS, settings.TRIP_JOB_POLL_INTERVAL_SECONDS
+            )
+        )
         yield
-        # Shutdown: Close all connection pools
+        # Shutdown: Requeue running jobs, write remaining view counts, then close
+        # all connection pools
+        for task in (trip_job_workers, partition_maintenance, view_flusher):
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        if gemini.is_initialized():
+            await gemini.close()
         if sessionmanager.is_initialized():
             await sessionmanager.close()
 
@@ -40,6 +78,10 @@ def init_app(init_db: bool) -> FastAPI:
             allow_headers=["*"],
         )
 
+    @app.exception_handler(InvalidCursorError)
+    async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+        return JSONResponse(status_code=400, content={"detail": str(exc)})
+
     app.include_router(api_router, prefix=settings.API_V1_STR)
 
     return app
@@ -4,17 +4,22 @@ from typing import Any, Literal
 
 from geoalchemy2 import Geography
 from sqlalchemy import (
+    DDL,
     Boolean,
     Column,
+    Computed,
     Date,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Table,
     Text,
+    event,
+    text,
 )
-from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TIMESTAMP, UUID
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TIMESTAMP, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -124,6 +129,30 @@ class Profile(Base):
     )
 
 
+class ProfileStats(Base):
+    """
+    Denormalized activity counters for a profile.
+    Maintained by the create/delete paths of reviews, forum and trips.
+    """
+
+    __tablename__ = "profile_stats"
+
+    profile_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("profiles.id", ondelete="CASCADE"), primary_key=True
+    )
+    reviews_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    posts_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    photos_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    trips_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    public_trips_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0"
+    )
+    replies_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
 class Tag(Base):
     __tablename__ = "tags"
     id: Mapped[uuid.UUID] = mapped_column(
@@ -144,6 +173,18 @@ class Tag(Base):
 
 class Place(Base):
     __tablename__ = "places"
+    __table_args__ = (
+        # Keyset pagination of place search by rating / newest
+        Index("ix_places_average_rating_id", "average_rating", "id"),
+        Index("ix_places_created_at_id", "created_at", "id"),
+        # Best rated candidates per type in a city (AI trip planning)
+        Index(
+            "ix_places_city_key_place_type_average_rating",
+            "city_key",
+            "place_type",
+            text("average_rating DESC"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -155,6 +196,10 @@ class Place(Base):
     )
     address: Mapped[str | None] = mapped_column(Text)
     city: Mapped[str | None] = mapped_column(String(100))
+    # Lowercased city without spaces, see app.service.ai_service.city_key
+    city_key: Mapped[str | None] = mapped_column(
+        String(100), Computed("lower(replace(city, ' ', ''))", persisted=True)
+    )
     country: Mapped[str | None] = mapped_column(String(100))
     location: Mapped[object | None] = mapped_column(
         Geography(geometry_type="POINT", srid=4326)
@@ -162,6 +207,8 @@ class Place(Base):
     main_image_url: Mapped[str | None] = mapped_column(String(255))
     average_rating: Mapped[float] = mapped_column(Numeric(2, 1), default=0)
     review_count: Mapped[int] = mapped_column(Integer, default=0)
+    # Running sum of review ratings; average_rating is derived from it
+    rating_sum: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     description: Mapped[str | None] = mapped_column(Text)
     opening_hours: Mapped[dict[str, Any] | None] = mapped_column(JSONB)
     created_at: Mapped[datetime] = mapped_column(
@@ -230,6 +277,51 @@ class Cafe(Place):
     __mapper_args__ = {"polymorphic_identity": "cafe"}
 
 
+class PlaceSearch(Base):
+    """
+    Denormalized search read model: one row per place with the subtype
+    columns, tag names and a text vector, so place search needs no joins.
+    Maintained by app.service.place_search_service.
+    """
+
+    __tablename__ = "place_search"
+    __table_args__ = (
+        Index("ix_place_search_tags", "tags", postgresql_using="gin"),
+        Index("ix_place_search_amenities", "amenities", postgresql_using="gin"),
+        Index(
+            "ix_place_search_search_vector", "search_vector", postgresql_using="gin"
+        ),
+        Index("ix_place_search_average_rating_id", "average_rating", "place_id"),
+        Index("ix_place_search_created_at_id", "created_at", "place_id"),
+    )
+    place_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("places.id", ondelete="CASCADE"), primary_key=True
+    )
+    name: Mapped[str] = mapped_column(String(100))
+    place_type: Mapped[str] = mapped_column(String(50), index=True)
+    address: Mapped[str | None] = mapped_column(Text)
+    city: Mapped[str | None] = mapped_column(String(100))
+    country: Mapped[str | None] = mapped_column(String(100))
+    location: Mapped[object | None] = mapped_column(
+        Geography(geometry_type="POINT", srid=4326)
+    )
+    main_image_url: Mapped[str | None] = mapped_column(String(255))
+    average_rating: Mapped[float] = mapped_column(Numeric(2, 1), default=0)
+    review_count: Mapped[int] = mapped_column(Integer, default=0)
+    opening_hours: Mapped[dict[str, Any] | None] = mapped_column(JSONB)
+    # Subtype columns (NULL for types that don't have them)
+    price_range: Mapped[str | None] = mapped_column(String(10))
+    amenities: Mapped[list[str] | None] = mapped_column(ARRAY(String))
+    hotel_class: Mapped[int | None] = mapped_column(Integer)
+    price_per_night: Mapped[float | None] = mapped_column(Numeric)
+    tags: Mapped[list[str]] = mapped_column(ARRAY(String), default=list)
+    search_vector: Mapped[Any] = mapped_column(TSVECTOR)
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True))
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
 class PlaceImage(Base):
     __tablename__ = "place_images"
     id: Mapped[uuid.UUID] = mapped_column(
@@ -248,6 +340,10 @@ class PlaceImage(Base):
 
 class Review(Base):
     __tablename__ = "reviews"
+    __table_args__ = (
+        Index("ix_reviews_place_id_created_at_id", "place_id", "created_at", "id"),
+        Index("ix_reviews_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
@@ -272,6 +368,7 @@ class Review(Base):
 
 class ReviewImage(Base):
     __tablename__ = "review_images"
+    __table_args__ = (Index("ix_review_images_review_id", "review_id"),)
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
@@ -287,6 +384,9 @@ class ReviewImage(Base):
 
 class SavedList(Base):
     __tablename__ = "saved_lists"
+    __table_args__ = (
+        Index("ix_saved_lists_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
@@ -323,6 +423,22 @@ class SavedListItem(Base):
 
 class Trip(Base):
     __tablename__ = "trips"
+    __table_args__ = (
+        # Trips are listed by start date with undated trips last
+        # (see trip_service.TRIP_START_SORT_KEY)
+        Index(
+            "ix_trips_user_id_start_date_id",
+            "user_id",
+            text("coalesce(start_date, DATE '9999-12-31')"),
+            "id",
+        ),
+        Index(
+            "ix_trips_public_start_date_id",
+            text("coalesce(start_date, DATE '9999-12-31')"),
+            "id",
+            postgresql_where=text("public"),
+        ),
+    )
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
@@ -349,6 +465,9 @@ class Trip(Base):
 
 class TripStop(Base):
     __tablename__ = "trip_stops"
+    __table_args__ = (
+        Index("ix_trip_stops_trip_id_stop_order_id", "trip_id", "stop_order", "id"),
+    )
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
@@ -356,6 +475,7 @@ class TripStop(Base):
         ForeignKey("trips.id", ondelete="CASCADE")
     )
     place_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("places.id"))
+    # Sparse sort key, see app.service.trip_service.STOP_ORDER_GAP
     stop_order: Mapped[int] = mapped_column(Integer)
     arrival_time: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True))
     notes: Mapped[str | None] = mapped_column(Text)
@@ -364,8 +484,66 @@ class TripStop(Base):
     place: Mapped["Place"] = relationship("Place", back_populates="trip_stops")
 
 
+class TripGenerationJob(Base):
+    """AI trip generation request, run by the worker pool in trip_job_service."""
+
+    __tablename__ = "trip_generation_jobs"
+    __table_args__ = (
+        # Workers claim the oldest unfinished job
+        Index(
+            "ix_trip_generation_jobs_unfinished_created_at",
+            "created_at",
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("profiles.id", ondelete="CASCADE"), index=True
+    )
+    # TripGenerateRequest as JSON
+    request: Mapped[dict[str, Any]] = mapped_column(JSONB)
+    status: Mapped[Literal["queued", "running", "succeeded", "failed"]] = (
+        mapped_column(String(20), default="queued")
+    )
+    days_total: Mapped[int] = mapped_column(Integer, default=0)
+    days_done: Mapped[int] = mapped_column(Integer, default=0)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    trip_id: Mapped[uuid.UUID | None] = mapped_column(
+        ForeignKey("trips.id", ondelete="SET NULL")
+    )
+    error: Mapped[str | None] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now()
+    )
+    # Heartbeat of the worker running the job
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now()
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True))
+
+
 class ForumPost(Base):
     __tablename__ = "forum_posts"
+    __table_args__ = (
+        # Forum reads only ever list visible posts
+        Index(
+            "ix_forum_posts_visible_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("visible IS TRUE"),
+        ),
+        Index(
+            "ix_forum_posts_visible_reply_count_id",
+            "reply_count",
+            "id",
+            postgresql_where=text("visible IS TRUE"),
+        ),
+        Index(
+            "ix_forum_posts_author_id_created_at_id", "author_id", "created_at", "id"
+        ),
+    )
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
@@ -381,20 +559,22 @@ class ForumPost(Base):
     visible: Mapped[bool] = mapped_column(Boolean, default=True)
 
     author: Mapped["Profile"] = relationship("Profile", back_populates="posts")
+    # Collections are loaded only when a query asks for them (see the loader
+    # profiles in app.service.forum_service); deletes cascade in the database
     images: Mapped[list["PostImage"]] = relationship(
         "PostImage",
         back_populates="post",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
     )
     replies: Mapped[list["PostReply"]] = relationship(
         "PostReply",
         back_populates="post",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
     )
     tags: Mapped[list["Tag"]] = relationship(
-        "Tag", secondary=post_tags, back_populates="posts", lazy="selectin"
+        "Tag", secondary=post_tags, back_populates="posts", passive_deletes=True
     )
 
 
@@ -415,6 +595,18 @@ class PostImage(Base):
 
 class PostReply(Base):
     __tablename__ = "post_replies"
+    __table_args__ = (
+        Index("ix_post_replies_user_id_created_at_id", "user_id", "created_at", "id"),
+        # Reply pages and reply trees of a thread
+        Index(
+            "ix_post_replies_visible_post_id_parent_id_created_at_id",
+            "post_id",
+            "parent_id",
+            "created_at",
+            "id",
+            postgresql_where=text("visible IS TRUE"),
+        ),
+    )
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
@@ -442,6 +634,10 @@ class PostReply(Base):
 
 class PostLike(Base):
     __tablename__ = "post_likes"
+    __table_args__ = (
+        Index("ix_post_likes_post_id_user_id", "post_id", "user_id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
@@ -452,7 +648,7 @@ class PostLike(Base):
         ForeignKey("profiles.id", ondelete="CASCADE")
     )
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=True), server_default=func.now()
+        TIMESTAMP(timezone=True), primary_key=True, server_default=func.now()
     )
 
     post: Mapped["ForumPost"] = relationship("ForumPost")
@@ -461,6 +657,10 @@ class PostLike(Base):
 
 class ReplyLike(Base):
     __tablename__ = "reply_likes"
+    __table_args__ = (
+        Index("ix_reply_likes_reply_id_user_id", "reply_id", "user_id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
@@ -471,7 +671,7 @@ class ReplyLike(Base):
         ForeignKey("profiles.id", ondelete="CASCADE")
     )
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=True), server_default=func.now()
+        TIMESTAMP(timezone=True), primary_key=True, server_default=func.now()
     )
 
     reply: Mapped["PostReply"] = relationship("PostReply")
@@ -480,6 +680,10 @@ class ReplyLike(Base):
 
 class ContentReport(Base):
     __tablename__ = "content_reports"
+    __table_args__ = (
+        Index("ix_content_reports_moderation_target_id", "moderation_target_id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
@@ -489,7 +693,7 @@ class ContentReport(Base):
     )
     reason: Mapped[str] = mapped_column(Text)
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=True), server_default=func.now()
+        TIMESTAMP(timezone=True), primary_key=True, server_default=func.now()
     )
     reporter: Mapped["Profile"] = relationship("Profile", back_populates="reports")
     moderation_target: Mapped["ModerationTarget"] = relationship(
@@ -497,8 +701,35 @@ class ContentReport(Base):
     )
 
 
+# Likes and reports are append-mostly logs, range-partitioned by month on
+# created_at (see app.service.partition_service). The DEFAULT partition
+# catches rows outside the monthly partitions created so far.
+for _partitioned in (PostLike.__table__, ReplyLike.__table__, ContentReport.__table__):
+    event.listen(
+        _partitioned,
+        "after_create",
+        DDL("CREATE TABLE %(table)s_default PARTITION OF %(table)s DEFAULT"),
+    )
+
+
 class ModerationTarget(Base):
     __tablename__ = "moderation_targets"
+    __table_args__ = (
+        # Admin queue: optionally filter by status, newest first
+        Index(
+            "ix_moderation_targets_status_created_at_id", "status", "created_at", "id"
+        ),
+        Index("ix_moderation_targets_created_at_id", "created_at", "id"),
+        Index("ix_moderation_targets_target", "target_type", "target_id"),
+        # At most one open case per reported target
+        Index(
+            "uq_moderation_targets_pending_target",
+            "target_type",
+            "target_id",
+            unique=True,
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
@@ -522,6 +753,19 @@ class ModerationTarget(Base):
 
 class BusinessVerificationRequest(Base):
     __tablename__ = "business_verification_requests"
+    __table_args__ = (
+        # Verification queue only ever looks at pending requests
+        Index(
+            "ix_business_verification_requests_pending_created_at",
+            "created_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        Index(
+            "ix_business_verification_requests_pending_profile_id",
+            "profile_id",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
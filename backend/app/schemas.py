@@ -103,7 +103,10 @@ class TagSchema(BaseModel):
 class MetaData(BaseModel):
     page: int
     limit: int
-    total_items: int
+    # None when the request skipped counting (include_total=false)
+    total_items: int | None
+    # Opaque keyset cursor of the next page, None on the last page
+    next_cursor: str | None = None
 
 
 class APIResponse[T](BaseModel):
@@ -187,6 +190,21 @@ class UserDetail(UserPublic):
     ban_reason: str | None
 
 
+class UserProfileTab[T](BaseModel):
+    items: list[T]
+    # Cursor of the tab's second page, None when everything fit
+    next_cursor: str | None = None
+
+
+class UserProfilePage(BaseModel):
+    profile: UserPublic
+    reviews: UserProfileTab[UserReviewResponse]
+    posts: UserProfileTab[UserPostResponse]
+    replies: UserProfileTab[UserReplyResponse]
+    photos: UserProfileTab[UserPhotoResponse]
+    trips: UserProfileTab["TripListSchema"]
+
+
 # --- Place Data Schemas ---
 
 
@@ -274,6 +292,13 @@ class PlaceSearchFilter(BaseModel):
     sort_by: Literal["rating", "distance", "newest"] = "rating"
     page: int = 1
     limit: int = 20
+    cursor: str | None = Field(
+        None, description="Cursor from meta.next_cursor; takes precedence over page"
+    )
+    include: str = Field(
+        "posts,trips",
+        description="Comma-separated supplementary results (posts, trips)",
+    )
 
     place_type: str | None = None
 
@@ -605,6 +630,8 @@ class ForumCommentSchema(BaseModel):
     parent_id: uuid.UUID | None = None
     like_count: int = 0
     is_liked: bool = False
+    # Number of visible direct replies, loaded or not
+    child_count: int = 0
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -616,7 +643,11 @@ class ForumPostDetail(BaseModel):
     author: ForumAuthorSchema
     images: list[ForumPostImageSchema] = Field(default_factory=list)
     tags: list[ForumTagSchema] = Field(default_factory=list)
+    # First page of top-level replies, each followed by its descendants up to
+    # the reply depth limit (flat, threaded by parent_id)
     replies: list[ForumCommentSchema] = Field(default_factory=list)
+    # Cursor of the next page of top-level replies, see GET /posts/{id}/replies
+    replies_next_cursor: str | None = None
     reply_count: int = 0
     like_count: int = 0
     view_count: int = 0
@@ -746,6 +777,9 @@ class ForumSearchFilter(BaseModel):
     sort: Literal["newest", "oldest", "popular"] = "newest"
     page: int = 1
     limit: int = 20
+    cursor: str | None = Field(
+        None, description="Cursor from meta.next_cursor; takes precedence over page"
+    )
 
 
 class TripGenerateRequest(BaseModel):
@@ -755,6 +789,27 @@ class TripGenerateRequest(BaseModel):
     # Removed interests and budget to match UI
 
 
+class TripDayPlan(BaseModel):
+    """One day of a generated itinerary, streamed before the trip is saved."""
+
+    day: int
+    stops: list[TripStopCreate] = Field(default_factory=list)
+
+
+class TripGenerationJobSchema(BaseModel):
+    id: uuid.UUID
+    status: Literal["queued", "running", "succeeded", "failed"]
+    days_total: int
+    days_done: int
+    # Set once the job succeeded
+    trip_id: uuid.UUID | None = None
+    error: str | None = None
+    created_at: datetime
+    finished_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 # --- AI Recommendation Schemas ---
 
 
@@ -28,6 +28,7 @@ from app.service.trip_service import (
     create_trip,
     get_trip,
     list_trips,
+    optimize_trip_route,
     remove_trip_stop,
     update_trip,
     update_trip_stop,
@@ -60,6 +61,7 @@ __all__ = [
     "create_trip",
     "get_trip",
     "list_trips",
+    "optimize_trip_route",
     "remove_trip_stop",
     "update_trip",
     "update_trip_stop",
@@ -15,6 +15,7 @@ from app.models import (
     ModerationTarget,
     PostReply,
     Profile,
+    ProfileStats,
 )
 from app.schemas import (
     BusinessVerificationDetail,
@@ -28,8 +29,9 @@ from app.schemas import (
     ModerationCaseSummary,
     ReportDetail,
     UserPublic,
-    UserStats,
 )
+from app.service.pagination import CountMode, count_total, paginate, split_page
+from app.service.stats_service import reconcile_profile_stats, to_user_stats
 
 
 async def get_moderation_cases(
@@ -37,12 +39,14 @@ async def get_moderation_cases(
     page: int = 1,
     limit: int = 20,
     status_filter: str | None = None,
-) -> tuple[list[ModerationCaseSummary], int]:
+    cursor: str | None = None,
+    count_mode: CountMode = "exact",
+) -> tuple[list[ModerationCaseSummary], int | None, str | None]:
     """
     Get all moderation cases with aggregated report counts.
 
     Returns:
-        Tuple of (cases_list, total_count)
+        Tuple of (cases_list, total_count, next_cursor)
     """
     # Build base query
     stmt = (
@@ -57,24 +61,28 @@ async def get_moderation_cases(
     )
 
     # Apply status filter
+    count_source = select(ModerationTarget.id)
     if status_filter and status_filter in ["pending", "approved", "rejected"]:
         stmt = stmt.where(ModerationTarget.status == status_filter)
-
-    # Order by created_at descending (newest first)
-    stmt = stmt.order_by(ModerationTarget.created_at.desc())
-
-    # Get total count
-    count_stmt = select(func.count()).select_from(stmt.alias())
-    total_result = await session.execute(count_stmt)
-    total_count = total_result.scalar_one()
-
-    # Apply pagination
-    offset = (page - 1) * limit
-    stmt = stmt.offset(offset).limit(limit)
+        count_source = count_source.where(ModerationTarget.status == status_filter)
+
+    # Get total count (one row per case, no need to join the reports)
+    total_count = await count_total(session, count_source, count_mode)
+
+    # Order by created_at descending (newest first) and apply pagination
+    stmt = paginate(
+        stmt,
+        [(ModerationTarget.created_at, True), (ModerationTarget.id, True)],
+        page,
+        limit,
+        cursor,
+    )
 
     # Execute query
     result = await session.execute(stmt)
-    rows = result.all()
+    rows, next_cursor = split_page(
+        result.all(), limit, lambda row: (row[0].created_at, row[0].id)
+    )
 
     # Build response
     cases = []
@@ -90,7 +98,7 @@ async def get_moderation_cases(
             )
         )
 
-    return cases, total_count
+    return cases, total_count, next_cursor
 
 
 async def get_case_detail(
@@ -385,22 +393,13 @@ async def get_unverified_businesses(
     total_res = await session.execute(count_stmt)
     total = int(total_res.scalar() or 0)
 
-    # Fetch pending requests with profile information
+    # Fetch pending requests with profile information and activity counters
     stmt = (
-        select(BusinessVerificationRequest)
-        .options(
-            selectinload(BusinessVerificationRequest.profile).selectinload(
-                Profile.posts
-            ),
-            selectinload(BusinessVerificationRequest.profile).selectinload(
-                Profile.replies
-            ),
-            selectinload(BusinessVerificationRequest.profile).selectinload(
-                Profile.reviews
-            ),
-            selectinload(BusinessVerificationRequest.profile).selectinload(
-                Profile.trips
-            ),
+        select(BusinessVerificationRequest, ProfileStats)
+        .options(selectinload(BusinessVerificationRequest.profile))
+        .outerjoin(
+            ProfileStats,
+            ProfileStats.profile_id == BusinessVerificationRequest.profile_id,
         )
         .where(BusinessVerificationRequest.status == "pending")
         .order_by(BusinessVerificationRequest.created_at.asc())
@@ -409,21 +408,11 @@ async def get_unverified_businesses(
     )
 
     result = await session.execute(stmt)
-    requests = result.scalars().all()
+    rows = result.all()
 
     # Convert to response schema
     verification_list = []
-    for req in requests:
-        # Get user stats
-        posts_count = len(req.profile.posts) if req.profile.posts else 0
-        replies_count = len(req.profile.replies) if req.profile.replies else 0
-        reviews_count = len(req.profile.reviews) if req.profile.reviews else 0
-        trips_count = (
-            len([t for t in req.profile.trips if t.is_public])
-            if req.profile.trips
-            else 0
-        )
-
+    for req, profile_stats in rows:
         user_public = UserPublic(
             id=req.profile.id,
             username=req.profile.username,
@@ -431,13 +420,7 @@ async def get_unverified_businesses(
             avatar_url=req.profile.avatar_url,
             role=req.profile.role,
             is_verified_business=req.profile.is_verified_business,
-            stats=UserStats(
-                reviews_count=reviews_count,
-                posts_count=posts_count,
-                photos_count=0,  # Not tracking individual photos
-                public_trips_count=trips_count,
-                replies_count=replies_count,
-            ),
+            stats=to_user_stats(profile_stats),
             created_at=req.profile.updated_at,  # Using updated_at as created_at proxy
         )
 
@@ -498,3 +481,21 @@ async def verify_business(
 
     await session.commit()
     return True
+
+
+async def reconcile_stats(
+    session: AsyncSession,
+    user_id: uuid.UUID | None = None,
+) -> int:
+    """
+    Rebuild profile activity counters from the source tables.
+
+    Intended to run periodically (or after bulk data fixes) to repair any
+    drift in the incrementally maintained counters.
+
+    Returns:
+        Number of profiles reconciled
+    """
+    reconciled = await reconcile_profile_stats(session, user_id)
+    await session.commit()
+    return reconciled
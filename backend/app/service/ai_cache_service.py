@@ -0,0 +1,145 @@
+"""Cache of Gemini results shared by identical AI requests."""
+
+import asyncio
+import contextlib
+import hashlib
+import sqlite3
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+
+from app.core.config import settings
+
+
+def cache_key(model: str, prompt: str) -> str:
+    """
+    Key of a model call, insensitive to case and whitespace in the prompt.
+
+    Prompts embed the candidate places they offer the model, so a changed
+    candidate set gives a new key and stale entries are never served.
+    """
+    normalized = " ".join(prompt.lower().split())
+    return hashlib.sha256(f"{model}\n{normalized}".encode()).hexdigest()
+
+
+class MemoryAICache:
+    """Per-worker LRU cache of model outputs with a TTL."""
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        # key -> (expires_at, value)
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    async def get(self, key: str) -> str | None:
+        hit = self._entries.get(key)
+        if hit is None:
+            return None
+        if hit[0] <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return hit[1]
+
+    async def set(self, key: str, value: str) -> None:
+        self._entries[key] = (self._clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class SQLiteAICache:
+    """
+    LRU cache of model outputs with a TTL in a local SQLite file.
+
+    Every worker on the host can point at the same file. Each call opens
+    its own connection in a thread so the event loop is never blocked.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS ai_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, used_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS ai_cache_used_at ON ai_cache (used_at)"
+            )
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """A connection for one transaction, closed when it ends."""
+        # The connection's own context manager only commits or rolls back
+        with contextlib.closing(sqlite3.connect(self.path, timeout=5)) as connection:
+            with connection:
+                yield connection
+
+    def _get(self, key: str) -> str | None:
+        now = self._clock()
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT value FROM ai_cache WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE ai_cache SET used_at = ? WHERE key = ?", (now, key)
+            )
+        return row[0]
+
+    def _set(self, key: str, value: str) -> None:
+        now = self._clock()
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO ai_cache VALUES (?, ?, ?, ?)",
+                (key, value, now + self.ttl, now),
+            )
+            connection.execute("DELETE FROM ai_cache WHERE expires_at <= ?", (now,))
+            connection.execute(
+                "DELETE FROM ai_cache WHERE key IN ("
+                "SELECT key FROM ai_cache ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    async def get(self, key: str) -> str | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: str) -> None:
+        await asyncio.to_thread(self._set, key, value)
+
+
+def _build_cache() -> MemoryAICache | SQLiteAICache | None:
+    if settings.AI_CACHE_BACKEND == "sqlite":
+        return SQLiteAICache(
+            settings.AI_CACHE_PATH,
+            settings.AI_CACHE_TTL_SECONDS,
+            settings.AI_CACHE_MAX_ENTRIES,
+        )
+    if settings.AI_CACHE_BACKEND == "memory":
+        return MemoryAICache(
+            settings.AI_CACHE_TTL_SECONDS, settings.AI_CACHE_MAX_ENTRIES
+        )
+    return None
+
+
+# Cache used by app.service.ai_service, None when caching is disabled
+ai_cache = _build_cache()
@@ -1,15 +1,22 @@
+import asyncio
 import json
+import logging
+import re
 import uuid
+from collections.abc import AsyncIterator
 from datetime import datetime, time, timedelta
 from math import ceil
+from typing import Any
 
+from geoalchemy2 import Geometry
 from google import genai
 from google.genai import types
-from sqlalchemy import select, or_, and_
+from sqlalchemy import Row, cast, func, select, or_, and_, union
 from sqlalchemy.orm import selectinload, with_polymorphic
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.gemini import gemini
 from app.models import (
     Place,
     SavedList,
@@ -24,6 +31,7 @@ from app.models import (
 )
 from app.schemas import (
     TripCreate,
+    TripDayPlan,
     TripGenerateRequest,
     TripStopCreate,
     UserContextSchema,
@@ -32,65 +40,160 @@ from app.schemas import (
     RecommendationResponse,
     PlacePublic,
 )
+from app.service.ai_cache_service import ai_cache, cache_key
+from app.service.itinerary_service import plan_itinerary
 
+logger = logging.getLogger(__name__)
 
-async def generate_trip_plan(
-    session: AsyncSession, request: TripGenerateRequest
-) -> TripCreate:
+GEMINI_MODEL = "gemini-2.5-flash"
+
+# Characters of a place description shown to the trip planner
+CANDIDATE_DESCRIPTION_LENGTH = 50
+
+
+async def _generate_json(client: genai.Client, prompt: str) -> Any:
     """
-    Generates a trip itinerary. Handles insufficient data by allowing the AI to reuse places.
+    Ask Gemini for a JSON answer to `prompt`, reusing a cached answer when
+    the same prompt was asked before. Only answers that parse are cached.
+
+    Raises:
+        json.JSONDecodeError: the model didn't return valid JSON
     """
-    if not settings.GEMINI_API_KEY:
-        raise ValueError("AI configuration missing (GEMINI_API_KEY)")
+    key = cache_key(GEMINI_MODEL, prompt)
+    if ai_cache is not None:
+        cached = await ai_cache.get(key)
+        if cached is not None:
+            return json.loads(cached)
+
+    response = await client.aio.models.generate_content(
+        model=GEMINI_MODEL,
+        contents=prompt,
+        config=types.GenerateContentConfig(response_mime_type="application/json"),
+    )
+    data = json.loads(response.text)
+    if ai_cache is not None:
+        await ai_cache.set(key, response.text)
+    return data
+
+
+def city_key(city: str) -> str:
+    """Python side of the Place.city_key generated column."""
+    return city.lower().replace(" ", "")
+
+
+def destination_city_key(destination: str) -> str:
+    """
+    Key of the city a trip destination ("Hoi An", "Saigon, Vietnam") names.
+    Known aliases are resolved to the city name used in the database.
+    """
+    city = destination.split(",")[0].strip()
+    return city_key(normalize_city_name(city) or city)
+
+
+async def get_trip_candidates(
+    session: AsyncSession,
+    city: str | None,
+    limits: dict[str, int],
+    country: str | None = None,
+) -> dict[str, list[Row[Any]]]:
+    """
+    Best rated places of each type in a city (by its key) or, when `country`
+    is given instead, anywhere in that country, at most `limits[type]` each.
+    Rows carry only what the prompt and the local planner need: id, name, a
+    short description, lat/lng and opening_hours.
+    """
+    if country is not None:
+        in_destination = func.lower(Place.country) == country.strip().lower()
+    else:
+        in_destination = Place.city_key == city
+    location = cast(Place.location, Geometry(srid=4326))
+    ranked = (
+        select(
+            Place.id,
+            Place.name,
+            Place.place_type,
+            func.left(Place.description, CANDIDATE_DESCRIPTION_LENGTH).label(
+                "description"
+            ),
+            func.ST_Y(location).label("lat"),
+            func.ST_X(location).label("lng"),
+            Place.opening_hours,
+            func.row_number()
+            .over(
+                partition_by=Place.place_type,
+                order_by=(Place.average_rating.desc(), Place.id),
+            )
+            .label("rank"),
+        )
+        .where(in_destination, Place.place_type.in_(list(limits)))
+        .subquery()
+    )
+    stmt = (
+        select(
+            ranked.c.id,
+            ranked.c.name,
+            ranked.c.place_type,
+            ranked.c.description,
+            ranked.c.lat,
+            ranked.c.lng,
+            ranked.c.opening_hours,
+        )
+        .where(
+            or_(
+                *(
+                    and_(ranked.c.place_type == place_type, ranked.c.rank <= limit)
+                    for place_type, limit in limits.items()
+                )
+            )
+        )
+        .order_by(ranked.c.place_type, ranked.c.rank)
+    )
+    candidates: dict[str, list[Row[Any]]] = {place_type: [] for place_type in limits}
+    for row in (await session.execute(stmt)).all():
+        candidates[row.place_type].append(row)
+    return candidates
 
-    client = genai.Client(api_key=settings.GEMINI_API_KEY)
 
+async def build_trip_prompt(
+    session: AsyncSession, request: TripGenerateRequest
+) -> tuple[str, set[uuid.UUID], list[TripDayPlan]]:
+    """
+    Build the trip planning prompt for a request.
+    Handles insufficient data by allowing the AI to reuse places.
+
+    The same candidates are planned locally by
+    `app.service.itinerary_service.plan_itinerary`; with
+    settings.TRIP_PLAN_DRAFT_IN_PROMPT that plan is in the prompt as a draft
+    for the model to polish.
+
+    Returns:
+        The prompt, the ids of the candidate places it offers and the local plan
+    """
     num_days = (request.end_date - request.start_date).days + 1
     if num_days < 1:
         raise ValueError("End date must be after start date")
 
     # ---------------------------------------------------------
-    # 1. Fetching Logic (Same as before)
+    # 1. Fetching Logic
     # ---------------------------------------------------------
-    limit_restaurants = max(10, num_days * 5)
-    limit_landmarks = max(10, num_days * 6)
-    limit_cafes = max(5, num_days * 2)
-    limit_hotels = 10
-
-    destination_str = request.destination.strip()
-
-    def build_search_filters(model):
-        parts = [p.strip() for p in destination_str.split(",") if p.strip()]
-        if len(parts) >= 2:
-            return or_(
-                and_(
-                    model.city.ilike(f"%{parts[0]}%"),
-                    model.country.ilike(f"%{parts[1]}%"),
-                ),
-                model.address.ilike(f"%{destination_str}%"),
-            )
-        else:
-            term = f"%{destination_str}%"
-            return or_(
-                model.city.ilike(term),
-                model.country.ilike(term),
-                model.address.ilike(term),
-                model.name.ilike(term),
-            )
-
-    async def get_places_by_type(place_type: str, limit: int):
-        stmt = (
-            select(Place)
-            .where(and_(Place.place_type == place_type, build_search_filters(Place)))
-            .limit(limit)
+    limits = {
+        "hotel": 10,
+        "restaurant": max(10, num_days * 5),
+        "cafe": max(5, num_days * 2),
+        "landmark": max(10, num_days * 6),
+    }
+    candidates = await get_trip_candidates(
+        session, destination_city_key(request.destination), limits
+    )
+    if not candidates["hotel"] and "," not in request.destination:
+        # A bare name that isn't a city may be a country ("Vietnam")
+        candidates = await get_trip_candidates(
+            session, None, limits, country=request.destination
         )
-        result = await session.execute(stmt)
-        return result.scalars().all()
-
-    hotels = await get_places_by_type("hotel", limit_hotels)
-    restaurants = await get_places_by_type("restaurant", limit_restaurants)
-    cafes = await get_places_by_type("cafe", limit_cafes)
-    landmarks = await get_places_by_type("landmark", limit_landmarks)
+    hotels = candidates["hotel"]
+    restaurants = candidates["restaurant"]
+    cafes = candidates["cafe"]
+    landmarks = candidates["landmark"]
 
     # ---------------------------------------------------------
     # 2. Dynamic Rules (The Logic Fix)
@@ -134,6 +237,8 @@ async def generate_trip_plan(
     else:
         cafe_rule = "(Skip coffee stops as no cafes are available)."
 
+    draft = plan_itinerary(request, candidates)
+
     # ---------------------------------------------------------
     # 3. Dynamic Prompt
     # ---------------------------------------------------------
@@ -141,12 +246,25 @@ async def generate_trip_plan(
         if not places:
             return "(No places available)"
         return "\n".join(
-            [
-                f"- {p.id}: {p.name} ({p.description[:50] if p.description else ''}...)"
-                for p in places
-            ]
+            [f"- {p.id}: {p.name} ({p.description or ''}...)" for p in places]
         )
 
+    draft_section = ""
+    if settings.TRIP_PLAN_DRAFT_IN_PROMPT:
+        draft_lines = "\n".join(
+            f"    Day {day_plan.day}: "
+            + "; ".join(
+                f"{stop.arrival_time:%H:%M} {stop.place_id} ({stop.notes})"
+                for stop in day_plan.stops
+            )
+            for day_plan in draft
+        )
+        draft_section = f"""
+    DRAFT PLAN (respects opening hours and groups nearby places by day;
+    keep what works, improve the rest, follow the rules above):
+{draft_lines}
+    """
+
     prompt = f"""
     Create a {num_days}-day trip itinerary for {request.destination}.
     
@@ -169,6 +287,7 @@ async def generate_trip_plan(
 
     [Landmarks]
     {format_list(landmarks)}
+    {draft_section}
 
     Return a JSON object with this structure:
     {{
@@ -188,52 +307,48 @@ async def generate_trip_plan(
     }}
     """
 
-    # ---------------------------------------------------------
-    # 4. Call AI
-    # ---------------------------------------------------------
-    response = await client.aio.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=prompt,
-        config=types.GenerateContentConfig(response_mime_type="application/json"),
-    )
+    place_ids = {p.id for places in candidates.values() for p in places}
+    return prompt, place_ids, draft
 
-    # ... (Rest of the JSON parsing and Loop logic remains the same) ...
-    try:
-        data = json.loads(response.text)
-    except json.JSONDecodeError:
-        raise ValueError("AI failed to generate valid JSON")
 
+def _day_stops(
+    request: TripGenerateRequest, day_plan: dict, place_ids: set[uuid.UUID]
+) -> list[TripStopCreate]:
+    """Stops of one itinerary day, skipping places that weren't offered."""
     stops: list[TripStopCreate] = []
-
-    for day_plan in data.get("itinerary", []):
-        day_offset = day_plan.get("day", 1) - 1
-        current_date = request.start_date + timedelta(days=day_offset)
-
-        for activity in day_plan.get("activities", []):
-            place_id_str = activity.get("place_id")
-            time_str = activity.get("time_of_day", "09:00")
-
-            try:
-                place_uuid = uuid.UUID(place_id_str)
-            except (TypeError, ValueError):
-                continue
-
-            try:
-                hour, minute = map(int, time_str.split(":"))
-                arrival_dt = datetime.combine(
-                    current_date, time(hour=hour, minute=minute)
-                )
-            except ValueError:
-                arrival_dt = datetime.combine(current_date, time(9, 0))
-
-            stops.append(
-                TripStopCreate(
-                    place_id=place_uuid,
-                    arrival_time=arrival_dt,
-                    notes=activity.get("notes"),
-                )
+    day_offset = day_plan.get("day", 1) - 1
+    current_date = request.start_date + timedelta(days=day_offset)
+
+    for activity in day_plan.get("activities", []):
+        place_id_str = activity.get("place_id")
+        time_str = activity.get("time_of_day", "09:00")
+
+        try:
+            place_uuid = uuid.UUID(place_id_str)
+        except (TypeError, ValueError):
+            continue
+        if place_uuid not in place_ids:
+            continue
+
+        try:
+            hour, minute = map(int, time_str.split(":"))
+            arrival_dt = datetime.combine(current_date, time(hour=hour, minute=minute))
+        except ValueError:
+            arrival_dt = datetime.combine(current_date, time(9, 0))
+
+        stops.append(
+            TripStopCreate(
+                place_id=place_uuid,
+                arrival_time=arrival_dt,
+                notes=activity.get("notes"),
             )
+        )
+    return stops
+
 
+def _trip_plan(
+    request: TripGenerateRequest, data: dict, stops: list[TripStopCreate]
+) -> TripCreate:
     return TripCreate(
         trip_name=data.get("trip_name", f"Trip to {request.destination}"),
         start_date=request.start_date,
@@ -244,6 +359,151 @@ async def generate_trip_plan(
     )
 
 
+def _draft_plan(request: TripGenerateRequest, draft: list[TripDayPlan]) -> TripCreate:
+    stops = [stop for day_plan in draft for stop in day_plan.stops]
+    return _trip_plan(request, {}, stops)
+
+
+async def generate_trip_plan(
+    session: AsyncSession, request: TripGenerateRequest
+) -> TripCreate:
+    """
+    Generates a trip itinerary.
+
+    The local plan is returned instead when GEMINI_API_KEY isn't set or the
+    model takes longer than settings.TRIP_AI_TIMEOUT_SECONDS.
+    """
+    prompt, place_ids, draft = await build_trip_prompt(session, request)
+    if not settings.GEMINI_API_KEY:
+        return _draft_plan(request, draft)
+
+    # Don't hold a pooled connection while the model runs
+    await session.commit()
+    try:
+        async with asyncio.timeout(settings.TRIP_AI_TIMEOUT_SECONDS):
+            data = await _generate_json(gemini.client, prompt)
+    except TimeoutError:
+        logger.warning("Gemini trip plan timed out, using the local plan")
+        return _draft_plan(request, draft)
+    except json.JSONDecodeError:
+        raise ValueError("AI failed to generate valid JSON")
+
+    stops = [
+        stop
+        for day_plan in data.get("itinerary", [])
+        for stop in _day_stops(request, day_plan, place_ids)
+    ]
+    return _trip_plan(request, data, stops)
+
+
+class ItineraryDays:
+    """
+    Pulls complete day objects out of a trip plan JSON document that
+    arrives in pieces, as soon as each day's closing brace is in.
+    """
+
+    _start = re.compile(r'"itinerary"\s*:\s*\[')
+    _decoder = json.JSONDecoder()
+
+    def __init__(self) -> None:
+        self.text = ""
+        # Where the next day object may start, once the array is found
+        self._pos: int | None = None
+        self._done = False
+
+    def feed(self, chunk: str) -> list[dict]:
+        """Add a piece of the document and return the days it completed."""
+        self.text += chunk
+        days: list[dict] = []
+        if self._pos is None:
+            match = self._start.search(self.text)
+            if match is None:
+                return days
+            self._pos = match.end()
+        while not self._done:
+            pos = self._pos
+            while pos < len(self.text) and self.text[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(self.text):
+                break
+            if self.text[pos] == "]":
+                self._done = True
+                break
+            try:
+                day, self._pos = self._decoder.raw_decode(self.text, pos)
+            except json.JSONDecodeError:
+                # Day not complete yet
+                break
+            if isinstance(day, dict):
+                days.append(day)
+        return days
+
+
+async def stream_trip_plan(
+    request: TripGenerateRequest,
+    prompt: str,
+    place_ids: set[uuid.UUID],
+    draft: list[TripDayPlan] | None = None,
+) -> AsyncIterator[TripDayPlan | TripCreate]:
+    """
+    Stream the plan for a prompt from `build_trip_prompt`: each day's
+    validated stops as soon as the model finishes that day, then the whole
+    TripCreate once the answer is complete.
+
+    Without GEMINI_API_KEY the local `draft` plan is streamed instead.
+
+    Raises:
+        ValueError: AI configuration and draft are missing or the answer
+            isn't valid JSON
+    """
+    if not settings.GEMINI_API_KEY:
+        if draft is None:
+            raise ValueError("AI configuration missing (GEMINI_API_KEY)")
+        for day_plan in draft:
+            yield day_plan
+        yield _draft_plan(request, draft)
+        return
+
+    key = cache_key(GEMINI_MODEL, prompt)
+    cached = await ai_cache.get(key) if ai_cache is not None else None
+    chunks: AsyncIterator[str]
+    if cached is not None:
+        chunks = _single(cached)
+    else:
+        chunks = _stream_text(gemini.client, prompt)
+
+    days = ItineraryDays()
+    stops: list[TripStopCreate] = []
+    async for chunk in chunks:
+        for day_plan in days.feed(chunk):
+            day_stops = _day_stops(request, day_plan, place_ids)
+            stops.extend(day_stops)
+            yield TripDayPlan(day=day_plan.get("day", 1), stops=day_stops)
+
+    try:
+        data = json.loads(days.text)
+    except json.JSONDecodeError:
+        raise ValueError("AI failed to generate valid JSON")
+    if cached is None and ai_cache is not None:
+        await ai_cache.set(key, days.text)
+    yield _trip_plan(request, data, stops)
+
+
+async def _single(text: str) -> AsyncIterator[str]:
+    yield text
+
+
+async def _stream_text(client: genai.Client, prompt: str) -> AsyncIterator[str]:
+    stream = await client.aio.models.generate_content_stream(
+        model=GEMINI_MODEL,
+        contents=prompt,
+        config=types.GenerateContentConfig(response_mime_type="application/json"),
+    )
+    async for chunk in stream:
+        if chunk.text:
+            yield chunk.text
+
+
 # --- AI Recommendation Functions ---
 
 # City name normalization for matching database entries
@@ -275,113 +535,117 @@ def normalize_city_name(city_input: str) -> str | None:
     return None
 
 
+# History considered when building a user's context
+CONTEXT_RECENT_TRIPS = 10
+CONTEXT_RECENT_REVIEWS = 50
+
+
 async def build_user_context(
     session: AsyncSession, user_id: uuid.UUID
 ) -> UserContextSchema:
     """
     Gather user preference context from saved lists, trips, and reviews.
-    """
-    context = UserContextSchema()
 
-    # 1. Analyze Saved Lists
-    stmt = select(SavedList).where(SavedList.user_id == user_id)
-    result = await session.execute(stmt)
-    saved_lists = result.scalars().all()
-
-    if saved_lists:
-        # Get all saved list items with place details
-        saved_place_ids = []
-        for saved_list in saved_lists:
-            stmt = select(SavedListItem).where(SavedListItem.list_id == saved_list.id)
-            result = await session.execute(stmt)
-            items = result.scalars().all()
-            saved_place_ids.extend([item.place_id for item in items])
-
-        if saved_place_ids:
-            # Use with_polymorphic to load subclass attributes (price_range, cuisine_type)
-            # Also eagerly load tags relationship to avoid lazy loading
-            poly_place = with_polymorphic(Place, [Restaurant, Cafe, Hotel, Landmark])
-            stmt = (
-                select(poly_place)
-                .options(selectinload(poly_place.tags))
-                .where(poly_place.id.in_(saved_place_ids))
-            )
-            result = await session.execute(stmt)
-            saved_places = result.scalars().all()
-
-            # Aggregate category counts
-            category_counts = {}
-            cities = set()
-            price_preferences = []
-            cuisines = set()
-
-            for place in saved_places:
-                # Count categories
-                category_counts[place.place_type] = (
-                    category_counts.get(place.place_type, 0) + 1
-                )
-                context.saved_categories.append(place.place_type)
-
-                # Track cities
-                if place.city:
-                    cities.add(place.city)
-
-                # Track prices (for restaurants/cafes) - safe access without lazy loading
-                if place.place_type in ("restaurant", "cafe") and place.price_range:
-                    price_preferences.append(place.price_range)
-
-                # Track cuisines (for restaurants) - safe access without lazy loading
-                if place.place_type == "restaurant" and place.cuisine_type:
-                    cuisines.add(place.cuisine_type)
-
-            context.saved_count_per_category = category_counts
-            context.visited_cities = list(cities)
-            context.saved_categories = list(set(context.saved_categories))
-
-            # Determine most common price preference
-            if price_preferences:
-                context.price_preference = max(
-                    set(price_preferences), key=price_preferences.count
-                )
-
-            context.preferred_cuisines = list(cuisines)
+    Everything is aggregated by the database in a single query, so the cost
+    doesn't grow with the number of lists, trips or reviews a user has.
+    """
+    restaurants = Restaurant.__table__
+    cafes = Cafe.__table__
+
+    # 1. Saved places (each counted once even if saved to several lists)
+    saved_ids = (
+        select(SavedListItem.place_id)
+        .join(SavedList, SavedList.id == SavedListItem.list_id)
+        .where(SavedList.user_id == user_id)
+        .distinct()
+        .subquery()
+    )
+    saved = (
+        select(
+            Place.place_type,
+            Place.city,
+            func.coalesce(restaurants.c.price_range, cafes.c.price_range).label(
+                "price_range"
+            ),
+            restaurants.c.cuisine_type,
+        )
+        .join(saved_ids, saved_ids.c.place_id == Place.id)
+        .outerjoin(restaurants, restaurants.c.id == Place.id)
+        .outerjoin(cafes, cafes.c.id == Place.id)
+        .cte("saved")
+    )
+    category_counts = (
+        select(saved.c.place_type, func.count().label("saved_count"))
+        .group_by(saved.c.place_type)
+        .subquery()
+    )
 
-            # Determine recent activity focus
-            if category_counts:
-                context.recent_activity_focus = max(
-                    category_counts, key=category_counts.get
-                )
+    # 2. Cities of saved places and of the first stop of recent trips
+    recent_trips = (
+        select(Trip.id)
+        .where(Trip.user_id == user_id)
+        .order_by(Trip.created_at.desc())
+        .limit(CONTEXT_RECENT_TRIPS)
+    )
+    first_stops = (
+        select(TripStop.place_id)
+        .where(TripStop.trip_id.in_(recent_trips))
+        .distinct(TripStop.trip_id)
+        .order_by(TripStop.trip_id, TripStop.stop_order, TripStop.id)
+        .subquery()
+    )
+    cities = union(
+        select(saved.c.city),
+        select(Place.city).join(first_stops, first_stops.c.place_id == Place.id),
+    ).subquery()
+
+    # 3. Ratings of recent reviews
+    recent_ratings = (
+        select(Review.rating)
+        .where(Review.user_id == user_id)
+        .order_by(Review.created_at.desc())
+        .limit(CONTEXT_RECENT_REVIEWS)
+        .subquery()
+    )
 
-    # 2. Analyze Trip History
-    stmt = select(Trip).where(Trip.user_id == user_id).limit(10)
-    result = await session.execute(stmt)
-    trips = result.scalars().all()
-
-    if trips:
-        trip_cities = set()
-        for trip in trips:
-            # Extract city from trip name or first place
-            stmt = select(TripStop).where(TripStop.trip_id == trip.id).limit(1)
-            result = await session.execute(stmt)
-            trip_stop = result.scalar_one_or_none()
-
-            if trip_stop:
-                place = await session.get(Place, trip_stop.place_id)
-                if place and place.city:
-                    trip_cities.add(place.city)
-
-        # Merge with visited cities
-        context.visited_cities = list(set(context.visited_cities) | trip_cities)
-
-    # 3. Analyze Review History
-    stmt = select(Review).where(Review.user_id == user_id).limit(50)
-    result = await session.execute(stmt)
-    reviews = result.scalars().all()
+    stmt = select(
+        select(
+            func.jsonb_object_agg(
+                category_counts.c.place_type, category_counts.c.saved_count
+            )
+        )
+        .scalar_subquery()
+        .label("category_counts"),
+        select(func.array_agg(cities.c.city))
+        .where(cities.c.city.is_not(None))
+        .scalar_subquery()
+        .label("cities"),
+        select(func.mode().within_group(saved.c.price_range))
+        .where(saved.c.place_type.in_(("restaurant", "cafe")))
+        .scalar_subquery()
+        .label("price_preference"),
+        select(func.array_agg(saved.c.cuisine_type.distinct()))
+        .where(saved.c.place_type == "restaurant", saved.c.cuisine_type.is_not(None))
+        .scalar_subquery()
+        .label("cuisines"),
+        select(func.avg(recent_ratings.c.rating))
+        .scalar_subquery()
+        .label("avg_rating"),
+    )
+    row = (await session.execute(stmt)).one()
 
-    if reviews:
-        ratings = [r.rating for r in reviews if r.rating]
-        if ratings:
-            context.avg_rating_given = sum(ratings) / len(ratings)
+    context = UserContextSchema()
+    counts = row.category_counts or {}
+    if counts:
+        # Most saved category first
+        context.saved_categories = sorted(counts, key=lambda t: (-counts[t], t))
+        context.saved_count_per_category = counts
+        context.recent_activity_focus = context.saved_categories[0]
+    context.visited_cities = row.cities or []
+    context.price_preference = row.price_preference
+    context.preferred_cuisines = row.cuisines or []
+    if row.avg_rating is not None:
+        context.avg_rating_given = float(row.avg_rating)
 
     return context
 
@@ -413,7 +677,7 @@ async def generate_search_criteria(
         criteria.reasoning = "Showing popular highly-rated places"
         return criteria
 
-    client = genai.Client(api_key=settings.GEMINI_API_KEY)
+    client = gemini.client
 
     prompt = f"""You are a travel recommendation AI for Vietnam.
 
@@ -465,12 +729,7 @@ RULES:
 """
 
     try:
-        response = await client.aio.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt,
-            config=types.GenerateContentConfig(response_mime_type="application/json"),
-        )
-        criteria_dict = json.loads(response.text)
+        criteria_dict = await _generate_json(client, prompt)
         criteria = SearchCriteriaSchema(**criteria_dict)
         
         # Cap min_rating at 4.5 to prevent unrealistic perfect rating requirements
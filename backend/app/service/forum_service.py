@@ -2,9 +2,10 @@
 
 import uuid
 
-from sqlalchemy import func, or_, select
+from sqlalchemy import false, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 
 from app.models import (
     ContentReport,
@@ -33,7 +34,28 @@ from app.schemas import (
     ForumSearchFilter,
     ForumTagSchema,
 )
-from app.service.utils import is_user_banned
+from app.service.pagination import CountMode, count_total, paginate, split_page
+from app.service.stats_service import adjust_profile_stats, bump_profile_stats
+from app.service.tag_service import resolve_tags
+from app.service.utils import is_user_banned, sync_child_rows
+from app.service.view_count_service import view_counter
+
+# Top-level replies returned per page of a thread
+REPLY_PAGE_SIZE = 20
+# Levels of replies loaded below each top-level reply (1 = no children);
+# deeper replies are fetched per parent with list_forum_replies
+REPLY_MAX_DEPTH = 3
+REPLY_SORT_KEYS = [(PostReply.created_at, False), (PostReply.id, False)]
+
+# Loader profiles: ForumPost relationships are lazy, so each use case loads
+# exactly what it reads. Replies are always paged separately.
+POST_SUMMARY_LOADERS = (
+    selectinload(ForumPost.author),
+    selectinload(ForumPost.tags),
+    selectinload(ForumPost.images),
+)
+# Updates replace the tag collection; images are synced by diff
+POST_EDIT_LOADERS = (selectinload(ForumPost.tags),)
 
 
 async def _get_or_create_moderation_target(
@@ -59,16 +81,19 @@ async def _get_or_create_moderation_target(
     if existing_target:
         return existing_target
 
-    # Create a new moderation target (case/ticket)
-    new_target = ModerationTarget(
-        target_type=target_type,
-        target_id=target_id,
-        status="pending",
+    # Create a new moderation target (case/ticket).
+    # The unique partial index allows one pending case per target, so a
+    # concurrent report creating the same case is absorbed by ON CONFLICT.
+    await session.execute(
+        insert(ModerationTarget)
+        .values(target_type=target_type, target_id=target_id, status="pending")
+        .on_conflict_do_nothing(
+            index_elements=["target_type", "target_id"],
+            index_where=ModerationTarget.status == "pending",
+        )
     )
-    session.add(new_target)
-    await session.flush()  # Get the ID without committing
-
-    return new_target
+    result = await session.execute(stmt)
+    return result.scalars().one()
 
 
 def _sanitize_author(author: Profile) -> ForumAuthorSchema:
@@ -108,12 +133,61 @@ def _sanitize_comment_user(user: Profile) -> ForumCommentUserSchema:
     )
 
 
+async def _liked_post_ids(
+    session: AsyncSession,
+    post_ids: list[uuid.UUID],
+    user_id: uuid.UUID | None,
+) -> set[uuid.UUID]:
+    """Ids among `post_ids` liked by `user_id`, fetched with one IN query."""
+    if user_id is None or not post_ids:
+        return set()
+    res = await session.execute(
+        select(PostLike.post_id)
+        .where(PostLike.post_id.in_(post_ids), PostLike.user_id == user_id)
+        .distinct()
+    )
+    return set(res.scalars().all())
+
+
+async def _reply_like_state(
+    session: AsyncSession,
+    reply_ids: list[uuid.UUID],
+    user_id: uuid.UUID | None,
+) -> tuple[dict[uuid.UUID, int], set[uuid.UUID]]:
+    """
+    Like counts of `reply_ids` and the ones liked by `user_id`, fetched with
+    one grouped IN query.
+
+    Returns:
+        Tuple of (like count per reply id, ids of replies liked by the user)
+    """
+    if not reply_ids:
+        return {}, set()
+    liked_by_user = ReplyLike.user_id == user_id if user_id else false()
+    res = await session.execute(
+        select(ReplyLike.reply_id, func.count(), func.bool_or(liked_by_user))
+        .where(ReplyLike.reply_id.in_(reply_ids))
+        .group_by(ReplyLike.reply_id)
+    )
+    counts: dict[uuid.UUID, int] = {}
+    liked: set[uuid.UUID] = set()
+    for reply_id, count, is_liked in res.all():
+        counts[reply_id] = count
+        if is_liked:
+            liked.add(reply_id)
+    return counts, liked
+
+
 async def list_forum_posts(
     session: AsyncSession,
     filter_params: ForumSearchFilter,
     current_user_id: uuid.UUID | None = None,
-) -> tuple[list[ForumPostListItem], int]:
-    """Search and list forum posts with filtering and pagination."""
+    count_mode: CountMode = "exact",
+) -> tuple[list[ForumPostListItem], int | None, str | None]:
+    """
+    Search and list forum posts with filtering and pagination.
+    Returns the page, total count and the cursor of the next page.
+    """
     # Base query - visible posts OR posts authored by current user
     if current_user_id:
         base_query = select(ForumPost.id).where(
@@ -139,19 +213,12 @@ async def list_forum_posts(
         )
 
     # Count total
-    total_res = await session.execute(
-        select(func.count()).select_from(base_query.subquery())
-    )
-    total = int(total_res.scalar() or 0)
+    total = await count_total(session, base_query, count_mode)
 
     # Build main query using cached reply_count from database
     main_query = (
         select(ForumPost)
-        .options(
-            selectinload(ForumPost.author),
-            selectinload(ForumPost.tags),
-            selectinload(ForumPost.images),
-        )
+        .options(*POST_SUMMARY_LOADERS)
     )
 
     # Apply visibility filter - same logic as base_query
@@ -178,32 +245,44 @@ async def list_forum_posts(
             main_query.join(post_tags).join(Tag).where(Tag.name.in_(filter_params.tags))
         )
 
-    # Apply sorting
-    if filter_params.sort == "newest":
-        main_query = main_query.order_by(ForumPost.created_at.desc())
-    elif filter_params.sort == "oldest":
-        main_query = main_query.order_by(ForumPost.created_at.asc())
+    # Apply sorting (id breaks ties so keyset cursors are stable)
+    if filter_params.sort == "oldest":
+        sort_keys = [(ForumPost.created_at, False), (ForumPost.id, False)]
+        sort_attr = "created_at"
     elif filter_params.sort == "popular":
-        main_query = main_query.order_by(ForumPost.reply_count.desc())
+        sort_keys = [(ForumPost.reply_count, True), (ForumPost.id, True)]
+        sort_attr = "reply_count"
+    else:
+        sort_keys = [(ForumPost.created_at, True), (ForumPost.id, True)]
+        sort_attr = "created_at"
 
     # Apply pagination
-    main_query = main_query.offset(
-        (filter_params.page - 1) * filter_params.limit
-    ).limit(filter_params.limit)
+    main_query = paginate(
+        main_query,
+        sort_keys,
+        filter_params.page,
+        filter_params.limit,
+        filter_params.cursor,
+    )
 
     res = await session.execute(main_query)
+    page, next_cursor = split_page(
+        res.scalars().all(),
+        filter_params.limit,
+        lambda post: (getattr(post, sort_attr), post.id),
+    )
+    # Posts of this page liked by the current user, in one query
+    liked_ids = await _liked_post_ids(
+        session, [post.id for post in page], current_user_id
+    )
+
     posts = []
-    for post in res.scalars().all():
+    for post in page:
         # Create content snippet (first 200 characters)
         content_snippet = (
             post.content[:200] + "..." if len(post.content) > 200 else post.content
         )
 
-        # Check if current user liked this post
-        is_liked = False
-        if current_user_id:
-            is_liked = await check_user_liked_post(session, post.id, current_user_id)
-
         posts.append(
             ForumPostListItem(
                 id=post.id,
@@ -219,69 +298,183 @@ async def list_forum_posts(
                 like_count=post.like_count,
                 view_count=post.view_count,
                 created_at=post.created_at,
-                is_liked=is_liked,
+                is_liked=post.id in liked_ids,
+            )
+        )
+
+    return posts, total, next_cursor
+
+
+async def _load_reply_page(
+    session: AsyncSession,
+    post_id: uuid.UUID,
+    parent_id: uuid.UUID | None,
+    current_user_id: uuid.UUID | None,
+    limit: int = REPLY_PAGE_SIZE,
+    cursor: str | None = None,
+    depth: int = REPLY_MAX_DEPTH,
+    page: int = 1,
+) -> tuple[list[ForumCommentSchema], str | None]:
+    """
+    Load one page of the visible replies directly under `parent_id` (top-level
+    replies when None), oldest first, each followed by its visible descendants
+    down to `depth` levels.
+
+    Runs a fixed number of queries: the page, the descendants (recursive CTE),
+    child counts and viewer state, plus one user load for each reply query.
+
+    Returns:
+        Tuple of (replies in thread order, cursor of the next page or None)
+    """
+    siblings = (
+        select(PostReply)
+        .options(selectinload(PostReply.user))
+        .where(
+            PostReply.post_id == post_id,
+            PostReply.parent_id == parent_id
+            if parent_id is not None
+            else PostReply.parent_id.is_(None),
+            PostReply.visible.is_(True),
+        )
+    )
+    res = await session.execute(
+        paginate(siblings, REPLY_SORT_KEYS, page, limit, cursor)
+    )
+    roots, next_cursor = split_page(
+        res.scalars().all(), limit, lambda reply: (reply.created_at, reply.id)
+    )
+    if not roots:
+        return [], None
+
+    # Descendants of the page down to `depth` levels in one recursive query
+    descendants: list[PostReply] = []
+    if depth > 1:
+        tree = (
+            select(PostReply.id, literal(2).label("depth"))
+            .where(
+                PostReply.post_id == post_id,
+                PostReply.parent_id.in_([reply.id for reply in roots]),
+                PostReply.visible.is_(True),
+            )
+            .cte("reply_tree", recursive=True)
+        )
+        child = aliased(PostReply)
+        tree = tree.union_all(
+            select(child.id, tree.c.depth + 1).where(
+                child.post_id == post_id,
+                child.parent_id == tree.c.id,
+                child.visible.is_(True),
+                tree.c.depth < depth,
+            )
+        )
+        res = await session.execute(
+            select(PostReply)
+            .options(selectinload(PostReply.user))
+            .where(PostReply.id.in_(select(tree.c.id)))
+            .order_by(*(expr for expr, _ in REPLY_SORT_KEYS))
+        )
+        descendants = list(res.scalars().all())
+
+    loaded = [*roots, *descendants]
+    loaded_ids = [reply.id for reply in loaded]
+    res = await session.execute(
+        select(PostReply.parent_id, func.count())
+        .where(
+            PostReply.post_id == post_id,
+            PostReply.parent_id.in_(loaded_ids),
+            PostReply.visible.is_(True),
+        )
+        .group_by(PostReply.parent_id)
+    )
+    child_counts = dict(res.tuples().all())
+    like_counts, liked_ids = await _reply_like_state(
+        session, loaded_ids, current_user_id
+    )
+
+    # Depth-first thread order: each reply followed by its subtree
+    children: dict[uuid.UUID, list[PostReply]] = {}
+    for reply in descendants:
+        children.setdefault(reply.parent_id, []).append(reply)
+
+    replies: list[ForumCommentSchema] = []
+    stack = list(reversed(roots))
+    while stack:
+        reply = stack.pop()
+        replies.append(
+            ForumCommentSchema(
+                id=reply.id,
+                content=reply.content,
+                user=_sanitize_comment_user(reply.user),
+                created_at=reply.created_at,
+                parent_id=reply.parent_id,
+                like_count=like_counts.get(reply.id, 0),
+                is_liked=reply.id in liked_ids,
+                child_count=child_counts.get(reply.id, 0),
             )
         )
+        stack.extend(reversed(children.get(reply.id, [])))
+    return replies, next_cursor
+
 
-    return posts, total
+async def list_forum_replies(
+    session: AsyncSession,
+    post_id: uuid.UUID,
+    parent_id: uuid.UUID | None = None,
+    current_user_id: uuid.UUID | None = None,
+    limit: int = REPLY_PAGE_SIZE,
+    cursor: str | None = None,
+    depth: int = REPLY_MAX_DEPTH,
+    page: int = 1,
+) -> tuple[list[ForumCommentSchema], str | None]:
+    """
+    Get a page of replies of a visible post: top-level replies, or the direct
+    replies of `parent_id`, each with descendants down to `depth` levels.
+    Returns the replies in thread order and the cursor of the next page.
+    """
+    res = await session.execute(
+        select(ForumPost.id).where(
+            ForumPost.id == post_id, ForumPost.visible.is_(True)
+        )
+    )
+    if res.first() is None:
+        raise ValueError("Post not found")
+    return await _load_reply_page(
+        session, post_id, parent_id, current_user_id, limit, cursor, depth, page
+    )
 
 
 async def get_forum_post(
-    session: AsyncSession, post_id: uuid.UUID, current_user_id: uuid.UUID | None = None
+    session: AsyncSession,
+    post_id: uuid.UUID,
+    current_user_id: uuid.UUID | None = None,
+    viewer_key: str | None = None,
 ) -> ForumPostDetail | None:
     """
     Get a forum post with all its details including replies.
     Only visible posts and replies are shown on forum routes.
+
+    The view is recorded in the write-behind view counter rather than written
+    here, so reading a post never opens a write transaction. `viewer_key`
+    identifies the viewer for de-duplicating repeat views.
     """
     res = await session.execute(
         select(ForumPost)
-        .options(
-            selectinload(ForumPost.author),
-            selectinload(ForumPost.images),
-            selectinload(ForumPost.tags),
-            selectinload(ForumPost.replies).selectinload(PostReply.user),
-        )
+        .options(*POST_SUMMARY_LOADERS)
         .where(ForumPost.id == post_id, ForumPost.visible.is_(True))
     )
     post = res.scalars().first()
     if not post:
         return None
 
-    # Increment view count
-    post.view_count += 1
-    await session.commit()
+    # Buffer the view; it is flushed to the database in batches
+    view_counter.record(post.id, viewer_key)
 
-    # Check if current user liked this post
-    is_liked = False
-    if current_user_id:
-        is_liked = await check_user_liked_post(session, post.id, current_user_id)
-
-    # Check which replies are liked by current user
-    replies_data = []
-    for comment in post.replies:
-        if not comment.visible:
-            continue
-
-        is_reply_liked = False
-        if current_user_id:
-            is_reply_liked = await check_user_liked_reply(
-                session, comment.id, current_user_id
-            )
+    is_liked = post.id in await _liked_post_ids(session, [post.id], current_user_id)
 
-        # Calculate like count for reply
-        reply_like_count = await get_reply_like_count(session, comment.id)
-
-        replies_data.append(
-            ForumCommentSchema(
-                id=comment.id,
-                content=comment.content,
-                user=_sanitize_comment_user(comment.user),
-                created_at=comment.created_at,
-                parent_id=comment.parent_id,
-                like_count=reply_like_count,
-                is_liked=is_reply_liked,
-            )
-        )
+    # Only the first page of the reply tree; the rest is fetched on demand
+    replies_data, replies_next_cursor = await _load_reply_page(
+        session, post.id, None, current_user_id
+    )
 
     return ForumPostDetail(
         id=post.id,
@@ -294,9 +487,10 @@ async def get_forum_post(
         ],
         tags=[ForumTagSchema(id=tag.id, name=tag.name) for tag in post.tags],
         replies=replies_data,
+        replies_next_cursor=replies_next_cursor,
         reply_count=post.reply_count,
         like_count=post.like_count,
-        view_count=post.view_count,
+        view_count=post.view_count + view_counter.pending(post.id),
         created_at=post.created_at,
         is_liked=is_liked,
     )
@@ -306,18 +500,8 @@ async def create_forum_post(
     session: AsyncSession, user_id: uuid.UUID, data: ForumPostCreate
 ) -> ForumPostDetail:
     """Create a new forum post."""
-    # Collect tags first before creating the post
-    tags_to_add = []
-    if data.tags:
-        for tag_name in data.tags:
-            # Check if tag exists
-            tag_res = await session.execute(select(Tag).where(Tag.name == tag_name))
-            tag = tag_res.scalars().first()
-            if not tag:
-                tag = Tag(name=tag_name)
-                session.add(tag)
-                await session.flush()
-            tags_to_add.append(tag)
+    # Resolve tags first before creating the post
+    tags_to_add = await resolve_tags(session, data.tags) if data.tags else []
 
     # Create the post with tags initialized
     post = ForumPost(
@@ -335,6 +519,7 @@ async def create_forum_post(
             image = PostImage(post_id=post.id, image_url=image_url)
             session.add(image)
 
+    await bump_profile_stats(session, user_id, posts_count=1)
     await session.commit()
     await session.refresh(post)
 
@@ -385,6 +570,7 @@ async def create_forum_reply(
     )
     post.reply_count = int(count_res.scalar() or 0)
 
+    await bump_profile_stats(session, user_id, replies_count=1)
     await session.commit()
 
     # Load user info
@@ -417,11 +603,7 @@ async def update_forum_post(
     # Get the post
     res = await session.execute(
         select(ForumPost)
-        .options(
-            selectinload(ForumPost.author),
-            selectinload(ForumPost.tags),
-            selectinload(ForumPost.images),
-        )
+        .options(*POST_EDIT_LOADERS)
         .where(ForumPost.id == post_id)
     )
     post = res.scalars().first()
@@ -440,34 +622,18 @@ async def update_forum_post(
 
     # Update tags
     if data.tags is not None:
-        # Clear existing tags
-        post.tags = []
-        await session.flush()
-
-        # Add new tags
-        tags_to_add = []
-        for tag_name in data.tags:
-            tag_res = await session.execute(select(Tag).where(Tag.name == tag_name))
-            tag = tag_res.scalars().first()
-            if not tag:
-                tag = Tag(name=tag_name)
-                session.add(tag)
-                await session.flush()
-            tags_to_add.append(tag)
-        post.tags = tags_to_add
-
-    # Update images
-    if data.images is not None:
-        # Delete existing images
-        await session.execute(select(PostImage).where(PostImage.post_id == post_id))
-        for img in post.images:
-            await session.delete(img)
-        await session.flush()
+        post.tags = await resolve_tags(session, data.tags)
 
-        # Add new images
-        for image_url in data.images:
-            image = PostImage(post_id=post.id, image_url=image_url)
-            session.add(image)
+    # Update images (only changed rows are written)
+    if data.images is not None:
+        await sync_child_rows(
+            session,
+            PostImage.post_id,
+            post.id,
+            [PostImage.image_url],
+            [(image_url,) for image_url in data.images],
+        )
+        session.expire(post, ["images"])
 
     await session.commit()
 
@@ -532,11 +698,40 @@ async def delete_forum_post(
     if post.author_id != user_id:
         raise PermissionError("You can only delete your own posts")
 
+    # Replies of every participant go away with the post
+    reply_counts = await session.execute(
+        select(PostReply.user_id, func.count(PostReply.id))
+        .where(PostReply.post_id == post_id)
+        .group_by(PostReply.user_id)
+    )
+    deltas = {uid: {"replies_count": -count} for uid, count in reply_counts.all()}
+    deltas.setdefault(post.author_id, {})["posts_count"] = -1
+
     # Delete the post (cascading deletes will handle images and replies)
     await session.delete(post)
+    await adjust_profile_stats(session, deltas)
     await session.commit()
 
 
+async def _reply_subtree_counts(
+    session: AsyncSession, reply_id: uuid.UUID
+) -> list[tuple[uuid.UUID, int]]:
+    """Count replies per author in the thread rooted at `reply_id` (inclusive)."""
+    subtree = (
+        select(PostReply.id, PostReply.user_id)
+        .where(PostReply.id == reply_id)
+        .cte("reply_subtree", recursive=True)
+    )
+    child = aliased(PostReply)
+    subtree = subtree.union_all(
+        select(child.id, child.user_id).where(child.parent_id == subtree.c.id)
+    )
+    res = await session.execute(
+        select(subtree.c.user_id, func.count()).group_by(subtree.c.user_id)
+    )
+    return [(uid, count) for uid, count in res.all()]
+
+
 async def delete_forum_reply(
     session: AsyncSession, post_id: uuid.UUID, reply_id: uuid.UUID, user_id: uuid.UUID
 ) -> None:
@@ -556,9 +751,16 @@ async def delete_forum_reply(
     if reply.user_id != user_id:
         raise PermissionError("You can only delete your own replies")
 
+    # Child replies are deleted along with this one
+    deltas = {
+        uid: {"replies_count": -count}
+        for uid, count in await _reply_subtree_counts(session, reply_id)
+    }
+
     # Delete the reply (cascading deletes will handle child replies)
     await session.delete(reply)
     await session.flush()
+    await adjust_profile_stats(session, deltas)
 
     # Recount replies for the post
     post = await session.get(ForumPost, post_id)
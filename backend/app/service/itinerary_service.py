@@ -0,0 +1,249 @@
+"""
+Deterministic local trip planner.
+
+Builds an itinerary from the candidate places of
+`app.service.ai_service.get_trip_candidates` without calling a model: one
+hotel for the whole trip, a restaurant for every meal, landmarks grouped
+into days by proximity and a morning coffee every other day. Places are
+only scheduled at times their opening_hours say they are open; places
+without (parseable) opening hours are assumed open.
+"""
+
+import math
+import re
+import uuid
+from collections.abc import Sequence
+from datetime import date, datetime, time, timedelta
+from typing import Any, Protocol
+
+from app.schemas import TripDayPlan, TripGenerateRequest, TripStopCreate
+
+BREAKFAST = time(8, 0)
+COFFEE = time(9, 30)
+LUNCH = time(12, 0)
+DINNER = time(19, 0)
+HOTEL = time(21, 0)
+LANDMARK_SLOTS = (time(10, 30), time(14, 0), time(16, 0))
+
+EARTH_RADIUS_KM = 6371.0
+
+_DAY_KEYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+_RANGE = re.compile(r"(\d{1,2})(?::(\d{2}))?\s*[-–]\s*(\d{1,2})(?::(\d{2}))?")
+
+
+class Candidate(Protocol):
+    id: uuid.UUID
+    name: str
+    place_type: str
+    lat: float | None
+    lng: float | None
+    opening_hours: dict[str, Any] | None
+
+
+def _minutes(hour: str, minute: str | None) -> int:
+    return int(hour) * 60 + int(minute or 0)
+
+
+def is_open(opening_hours: dict[str, Any] | None, day: date, at: time) -> bool:
+    """
+    Whether a place is open on `day` at `at`.
+
+    Understands {"mon": "08:00-22:00", "tue": "Closed", ...} with full or
+    abbreviated day names, several comma-separated ranges and ranges past
+    midnight. Missing or unparseable hours count as open.
+    """
+    if not opening_hours:
+        return True
+    day_key = _DAY_KEYS[day.weekday()]
+    hours = None
+    for key, value in opening_hours.items():
+        if str(key).lower()[:3] == day_key:
+            hours = value
+            break
+    else:
+        # Hours are given per day and this day isn't listed
+        by_day = all(str(key).lower()[:3] in _DAY_KEYS for key in opening_hours)
+        return not by_day
+
+    if isinstance(hours, list):
+        hours = ",".join(str(part) for part in hours)
+    if not hours or str(hours).strip().lower() == "closed":
+        return False
+    ranges = _RANGE.findall(str(hours))
+    if not ranges:
+        return True
+    minute = at.hour * 60 + at.minute
+    for open_h, open_m, close_h, close_m in ranges:
+        opens, closes = _minutes(open_h, open_m), _minutes(close_h, close_m)
+        if closes <= opens:
+            closes += 24 * 60
+        if opens <= minute < closes or opens <= minute + 24 * 60 < closes:
+            return True
+    return False
+
+
+def distance_km(a: Candidate, b: Candidate) -> float:
+    """Great-circle distance; infinite when either place has no coordinates."""
+    if a.lat is None or a.lng is None or b.lat is None or b.lng is None:
+        return math.inf
+    lat1, lng1, lat2, lng2 = map(math.radians, (a.lat, a.lng, b.lat, b.lng))
+    h = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(h))
+
+
+def _cluster(landmarks: Sequence[Candidate], days: int) -> list[list[Candidate]]:
+    """
+    Split landmarks (best first) into `days` groups of nearby places.
+
+    Seeds are picked farthest-first starting from the best landmark, then
+    each landmark joins the nearest group that still has room.
+    """
+    groups: list[list[Candidate]] = [[] for _ in range(days)]
+    if not landmarks:
+        return groups
+    capacity = math.ceil(len(landmarks) / days)
+    located = [p for p in landmarks if p.lat is not None and p.lng is not None]
+    seeds = located[:1]
+    while located and len(seeds) < min(days, len(located)):
+        seeds.append(
+            max(
+                (p for p in located if p not in seeds),
+                key=lambda p: min(distance_km(p, seed) for seed in seeds),
+            )
+        )
+
+    for place in landmarks:
+        open_groups = [i for i in range(days) if len(groups[i]) < capacity]
+        if place.lat is None or place.lng is None or not seeds:
+            target = min(open_groups, key=lambda i: (len(groups[i]), i))
+        else:
+            target = min(
+                open_groups,
+                key=lambda i: (
+                    distance_km(place, seeds[i]) if i < len(seeds) else math.inf,
+                    len(groups[i]),
+                    i,
+                ),
+            )
+        groups[target].append(place)
+    return groups
+
+
+def _open_that_day(place: Candidate, day: date) -> bool:
+    return any(is_open(place.opening_hours, day, at) for at in LANDMARK_SLOTS)
+
+
+def _nearest_open(
+    places: Sequence[Candidate],
+    anchor: Candidate,
+    day: date,
+    at: time,
+    exclude: set[uuid.UUID],
+) -> Candidate | None:
+    """The place nearest to `anchor` that is open then; ties go to the best rated."""
+    best = None
+    best_distance = math.inf
+    for place in places:
+        if place.id in exclude or not is_open(place.opening_hours, day, at):
+            continue
+        distance = distance_km(anchor, place)
+        if best is None or distance < best_distance:
+            best, best_distance = place, distance
+    return best
+
+
+def plan_itinerary(
+    request: TripGenerateRequest, candidates: dict[str, Sequence[Candidate]]
+) -> list[TripDayPlan]:
+    """
+    Plan every day of a trip from candidates grouped by place type, each
+    group ordered best first.
+
+    Raises:
+        ValueError: there is no hotel to stay at
+    """
+    num_days = (request.end_date - request.start_date).days + 1
+    if num_days < 1:
+        raise ValueError("End date must be after start date")
+    hotels = candidates.get("hotel", [])
+    if not hotels:
+        raise ValueError(f"No hotels found in '{request.destination}'.")
+    hotel = hotels[0]
+    restaurants = candidates.get("restaurant", [])
+    cafes = candidates.get("cafe", [])
+    landmarks = candidates.get("landmark", [])[: num_days * len(LANDMARK_SLOTS)]
+
+    # Restaurants and cafes repeat only once every option has been used
+    used_restaurants: set[uuid.UUID] = set()
+    used_cafes: set[uuid.UUID] = set()
+
+    def pick(places, used, anchor, day, at):
+        place = _nearest_open(places, anchor, day, at, used)
+        if place is None and used:
+            used.clear()
+            place = _nearest_open(places, anchor, day, at, used)
+        if place is not None:
+            used.add(place.id)
+        return place
+
+    # Each day takes the remaining group with the most places open that day
+    groups = _cluster(landmarks, num_days)
+    plans = []
+    for index in range(num_days):
+        day = request.start_date + timedelta(days=index)
+        group = max(
+            groups, key=lambda g: sum(_open_that_day(place, day) for place in g)
+        )
+        groups.remove(group)
+        visits: list[tuple[time, Candidate, str]] = []
+
+        breakfast = pick(restaurants, used_restaurants, hotel, day, BREAKFAST)
+        if breakfast:
+            visits.append((BREAKFAST, breakfast, "Breakfast"))
+        if index % 2 == 0:
+            cafe = pick(cafes, used_cafes, breakfast or hotel, day, COFFEE)
+            if cafe:
+                visits.append((COFFEE, cafe, "Coffee break"))
+
+        # Walk the day's landmarks nearest-first, each at an open slot
+        position = hotel
+        remaining = list(group)
+        for slot in LANDMARK_SLOTS:
+            landmark = _nearest_open(remaining, position, day, slot, set())
+            if landmark is None:
+                continue
+            remaining.remove(landmark)
+            visits.append((slot, landmark, "Sightseeing"))
+            position = landmark
+            if slot == LANDMARK_SLOTS[0]:
+                lunch = pick(restaurants, used_restaurants, position, day, LUNCH)
+                if lunch:
+                    visits.append((LUNCH, lunch, "Lunch"))
+        if not any(note == "Lunch" for _, _, note in visits):
+            lunch = pick(restaurants, used_restaurants, position, day, LUNCH)
+            if lunch:
+                visits.append((LUNCH, lunch, "Lunch"))
+
+        dinner = pick(restaurants, used_restaurants, position, day, DINNER)
+        if dinner:
+            visits.append((DINNER, dinner, "Dinner"))
+        visits.append((HOTEL, hotel, "Back to the hotel"))
+
+        visits.sort(key=lambda visit: visit[0])
+        plans.append(
+            TripDayPlan(
+                day=index + 1,
+                stops=[
+                    TripStopCreate(
+                        place_id=place.id,
+                        arrival_time=datetime.combine(day, at),
+                        notes=note,
+                    )
+                    for at, place, note in visits
+                ],
+            )
+        )
+    return plans
@@ -0,0 +1,203 @@
+"""Keyset (cursor) pagination helpers shared by list endpoints."""
+
+import base64
+import hashlib
+import json
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Literal, TypeVar
+
+from sqlalchemy import Select, and_, func, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+# (sort expression, descending)
+SortKey = tuple[ColumnElement[Any], bool]
+
+# How total_items is computed for a list request:
+# - exact: count(*) over the filtered rows
+# - estimated: planner row estimate (exact below COUNT_ESTIMATE_EXACT_BELOW)
+# - cached: exact count reused for COUNT_CACHE_TTL_SECONDS
+# - none: not computed, total_items is null
+CountMode = Literal["exact", "estimated", "cached", "none"]
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor can't be decoded for the current sort."""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, uuid.UUID):
+        return {"u": str(value)}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if not isinstance(value, dict):
+        return value
+    ((kind, raw),) = value.items()
+    if kind == "dt":
+        return datetime.fromisoformat(raw)
+    if kind == "d":
+        return date.fromisoformat(raw)
+    if kind == "u":
+        return uuid.UUID(raw)
+    if kind == "n":
+        return Decimal(raw)
+    raise ValueError(kind)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key values of the last returned row as an opaque cursor."""
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_count: int) -> list[Any]:
+    """Decode a cursor produced by `encode_cursor` for a sort of `key_count` keys."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != key_count:
+            raise ValueError("key count mismatch")
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+
+def _after(keys: Sequence[SortKey], values: Sequence[Any]) -> ColumnElement[bool]:
+    """Condition selecting rows strictly after `values` in the `keys` order."""
+    if all(desc == keys[0][1] for _, desc in keys):
+        # Uniform direction: a row comparison the composite index can serve
+        row = tuple_(*(expr for expr, _ in keys))
+        return row < tuple_(*values) if keys[0][1] else row > tuple_(*values)
+
+    conditions = []
+    for i, (expr, desc) in enumerate(keys):
+        ties = [keys[j][0] == values[j] for j in range(i)]
+        conditions.append(
+            and_(*ties, expr < values[i] if desc else expr > values[i])
+        )
+    return or_(*conditions)
+
+
+def paginate(
+    stmt: Select[Any],
+    keys: Sequence[SortKey],
+    page: int,
+    limit: int,
+    cursor: str | None = None,
+) -> Select[Any]:
+    """
+    Order `stmt` by `keys` and restrict it to one page.
+
+    With a cursor the page starts right after the cursor row (keyset
+    pagination) and `page` is ignored; otherwise it falls back to OFFSET.
+    One extra row is fetched so `split_page` can tell whether a next page
+    exists. The last key must be unique (usually the primary key).
+    """
+    stmt = stmt.order_by(*(expr.desc() if desc else expr.asc() for expr, desc in keys))
+    if cursor:
+        stmt = stmt.where(_after(keys, decode_cursor(cursor, len(keys))))
+    else:
+        stmt = stmt.offset((page - 1) * limit)
+    return stmt.limit(limit + 1)
+
+
+def split_page(
+    rows: Sequence[T],
+    limit: int,
+    key_values: Callable[[T], Sequence[Any]],
+) -> tuple[list[T], str | None]:
+    """
+    Trim the extra row fetched by `paginate`.
+
+    Returns:
+        Tuple of (rows of this page, cursor of the next page or None)
+    """
+    if len(rows) <= limit:
+        return list(rows), None
+    rows = list(rows[:limit])
+    return rows, encode_cursor(key_values(rows[-1]))
+
+
+# Cache of exact counts for the "cached" mode: key -> (expires_at, count)
+_count_cache: OrderedDict[str, tuple[float, int]] = OrderedDict()
+
+
+async def _exact_count(session: AsyncSession, source: Select[Any]) -> int:
+    result = await session.execute(select(func.count()).select_from(source.subquery()))
+    return int(result.scalar() or 0)
+
+
+async def _estimated_count(session: AsyncSession, source: Select[Any]) -> int:
+    connection = await session.connection()
+    compiled = source.compile(
+        dialect=connection.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    result = await connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    )
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    estimate = int(plan[0]["Plan"]["Plan Rows"])
+    # Estimates of small results are unreliable and exact counts are cheap
+    if estimate < settings.COUNT_ESTIMATE_EXACT_BELOW:
+        return await _exact_count(session, source)
+    return estimate
+
+
+async def _cached_count(session: AsyncSession, source: Select[Any]) -> int:
+    # Compile for the real dialect: the default one drops DISTINCT ON and
+    # other PostgreSQL-only clauses, so different queries would share a key
+    connection = await session.connection()
+    compiled = source.compile(
+        dialect=connection.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    key = hashlib.sha256(
+        f"{compiled}|{sorted(compiled.params.items(), key=repr)!r}".encode()
+    ).hexdigest()
+    now = time.monotonic()
+    hit = _count_cache.get(key)
+    if hit is not None and hit[0] > now:
+        return hit[1]
+
+    count = await _exact_count(session, source)
+    _count_cache[key] = (now + settings.COUNT_CACHE_TTL_SECONDS, count)
+    _count_cache.move_to_end(key)
+    while len(_count_cache) > settings.COUNT_CACHE_MAX_ENTRIES:
+        _count_cache.popitem(last=False)
+    return count
+
+
+async def count_total(
+    session: AsyncSession, source: Select[Any], mode: CountMode = "exact"
+) -> int | None:
+    """
+    Count the rows of `source` (the filtered, unpaginated query) using `mode`.
+
+    Returns:
+        The total, or None when mode is "none"
+    """
+    if mode == "none":
+        return None
+    if mode == "estimated":
+        return await _estimated_count(session, source)
+    if mode == "cached":
+        return await _cached_count(session, source)
+    return await _exact_count(session, source)
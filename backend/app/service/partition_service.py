@@ -0,0 +1,192 @@
+"""Monthly range partitions for append-mostly tables."""
+
+import asyncio
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.db import sessionmanager
+
+logger = logging.getLogger(__name__)
+
+# Tables partitioned by RANGE (created_at), one partition per calendar month
+PARTITIONED_TABLES = ("post_likes", "reply_likes", "content_reports")
+
+# Called with (session, table, partition) right before a partition is dropped,
+# e.g. to archive its rows elsewhere
+RetentionHook = Callable[[AsyncSession, str, str], Awaitable[None]]
+_retention_hooks: list[RetentionHook] = []
+
+
+def register_retention_hook(hook: RetentionHook) -> RetentionHook:
+    """Register a hook to run before expired partitions are dropped."""
+    _retention_hooks.append(hook)
+    return hook
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _current_month() -> date:
+    return datetime.now(timezone.utc).date().replace(day=1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Name of the partition holding `month`, e.g. `post_likes_p202610`."""
+    return f"{table}_p{month:%Y%m}"
+
+
+async def _create_partition(session: AsyncSession, table: str, month: date) -> bool:
+    """
+    Create the partition of `table` for `month` unless it exists.
+
+    Rows of that month already in the DEFAULT partition (written while
+    maintenance lagged behind) would make the plain CREATE fail, so the
+    DEFAULT partition is detached, the rows are moved into the new
+    partition and it is attached again, all in the caller's transaction.
+
+    Returns:
+        Whether the partition was created.
+    """
+    name = partition_name(table, month)
+    exists = await session.scalar(
+        text("SELECT to_regclass(CAST(:name AS text))"), {"name": name}
+    )
+    if exists:
+        return False
+    lower = f"'{month.isoformat()} 00:00:00+00'"
+    upper = f"'{_add_months(month, 1).isoformat()} 00:00:00+00'"
+    bounds = f"FROM ({lower}) TO ({upper})"
+    in_month = f"created_at >= {lower} AND created_at < {upper}"
+    default = f"{table}_default"
+    stranded = await session.scalar(
+        text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_month})")
+    )
+    if not stranded:
+        await session.execute(
+            text(f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES {bounds}")
+        )
+        return True
+
+    logger.warning("Moving %s rows of %s out of %s", table, month, default)
+    await session.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+    await session.execute(
+        text(f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES {bounds}")
+    )
+    await session.execute(
+        text(f"INSERT INTO {name} SELECT * FROM {default} WHERE {in_month}")
+    )
+    await session.execute(text(f"DELETE FROM {default} WHERE {in_month}"))
+    await session.execute(
+        text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT")
+    )
+    return True
+
+
+async def ensure_partitions(
+    session: AsyncSession,
+    months_ahead: int | None = None,
+    tables: tuple[str, ...] = PARTITIONED_TABLES,
+) -> list[str]:
+    """
+    Create the partitions for the current month and `months_ahead` months
+    ahead for each of `tables`. Existing partitions are left alone.
+    Does not commit.
+
+    Returns:
+        Names of the created partitions.
+    """
+    if months_ahead is None:
+        months_ahead = settings.PARTITION_MONTHS_AHEAD
+    start = _current_month()
+    created = []
+    for table in tables:
+        for offset in range(months_ahead + 1):
+            month = _add_months(start, offset)
+            if await _create_partition(session, table, month):
+                created.append(partition_name(table, month))
+    return created
+
+
+async def drop_expired_partitions(
+    session: AsyncSession, table: str, retain_months: int
+) -> list[str]:
+    """
+    Detach and drop the monthly partitions of `table` that lie entirely before
+    the last `retain_months` months. Retention hooks run before each drop.
+    Does not commit.
+
+    Returns:
+        Names of the dropped partitions.
+    """
+    cutoff = _add_months(_current_month(), -retain_months)
+    result = await session.execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits i
+            JOIN pg_class child ON child.oid = i.inhrelid
+            JOIN pg_class parent ON parent.oid = i.inhparent
+            WHERE parent.relname = :table
+            """
+        ),
+        {"table": table},
+    )
+    pattern = re.compile(rf"^{re.escape(table)}_p(\d{{4}})(\d{{2}})$")
+
+    dropped = []
+    for (name,) in result.all():
+        match = pattern.match(name)
+        if not match:
+            continue  # e.g. the DEFAULT partition
+        month = date(int(match.group(1)), int(match.group(2)), 1)
+        if _add_months(month, 1) > cutoff:
+            continue
+        for hook in _retention_hooks:
+            await hook(session, table, name)
+        await session.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        await session.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+    return dropped
+
+
+async def maintain_partitions(session: AsyncSession) -> None:
+    """
+    Create upcoming partitions and apply the configured retention.
+
+    Each table is maintained in its own transaction, so a failure on one
+    table is logged and doesn't hold back the others.
+    """
+    for table in PARTITIONED_TABLES:
+        try:
+            await ensure_partitions(session, tables=(table,))
+            retain = settings.PARTITION_RETENTION_MONTHS.get(table)
+            if retain is not None:
+                dropped = await drop_expired_partitions(session, table, retain)
+                if dropped:
+                    logger.info("Dropped expired partitions: %s", ", ".join(dropped))
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            logger.exception("Partition maintenance of %s failed", table)
+    for table in settings.PARTITION_RETENTION_MONTHS:
+        if table not in PARTITIONED_TABLES:
+            logger.warning("Retention configured for unpartitioned table %s", table)
+
+
+async def run_partition_maintenance(interval: float) -> None:
+    """Run `maintain_partitions` now and then every `interval` seconds."""
+    while True:
+        try:
+            async with sessionmanager.session() as session:
+                await maintain_partitions(session)
+        except Exception:
+            logger.exception("Partition maintenance failed")
+        await asyncio.sleep(interval)
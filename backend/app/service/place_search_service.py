@@ -0,0 +1,147 @@
+"""Maintenance of the denormalized place_search read model."""
+
+import re
+import uuid
+from collections.abc import Sequence
+
+from sqlalchemy import func, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models import Cafe, Hotel, Place, PlaceSearch, Restaurant, Tag, place_tags
+
+# Text search configuration: no stemming or stop words, place names are
+# proper nouns in many languages
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+
+REFRESHED_COLUMNS = (
+    "name",
+    "place_type",
+    "address",
+    "city",
+    "country",
+    "location",
+    "main_image_url",
+    "average_rating",
+    "review_count",
+    "opening_hours",
+    "price_range",
+    "amenities",
+    "hotel_class",
+    "price_per_night",
+    "tags",
+    "search_vector",
+    "created_at",
+)
+
+
+def _search_vector(
+    name: ColumnElement, city: ColumnElement, country: ColumnElement
+) -> ColumnElement:
+    """Text vector of a place: its name, then (lower weight) its city and country."""
+    place_text = func.setweight(
+        func.to_tsvector(SEARCH_CONFIG, func.coalesce(name, "")), "A"
+    )
+    area_text = func.setweight(
+        func.to_tsvector(
+            SEARCH_CONFIG,
+            func.concat_ws(" ", func.coalesce(city, ""), func.coalesce(country, "")),
+        ),
+        "B",
+    )
+    return place_text.op("||")(area_text)
+
+
+def search_query(q: str) -> ColumnElement | None:
+    """
+    Build a prefix-matching tsquery for a user search string, e.g.
+    "ha lon" -> 'ha:* & lon:*'. Returns None if `q` contains no words.
+    """
+    words = re.findall(r"\w+", q)
+    if not words:
+        return None
+    return func.to_tsquery(SEARCH_CONFIG, " & ".join(f"{w}:*" for w in words))
+
+
+async def refresh_place_search(
+    session: AsyncSession, place_ids: Sequence[uuid.UUID] | None = None
+) -> int:
+    """
+    Rebuild the place_search rows of `place_ids` (every place when None) from
+    the normalized tables in one INSERT ... SELECT ... ON CONFLICT statement.
+    Pending ORM changes are flushed first. Does not commit.
+
+    Returns:
+        Number of rows written.
+    """
+    await session.flush()
+
+    places = Place.__table__
+    hotels = Hotel.__table__
+    restaurants = Restaurant.__table__
+    cafes = Cafe.__table__
+
+    tag_names = (
+        select(
+            func.coalesce(
+                func.array_agg(Tag.name), literal_column("'{}'::varchar[]")
+            )
+        )
+        .select_from(place_tags.join(Tag, Tag.id == place_tags.c.tag_id))
+        .where(place_tags.c.place_id == places.c.id)
+        .scalar_subquery()
+    )
+    source = select(
+        places.c.id,
+        places.c.name,
+        places.c.place_type,
+        places.c.address,
+        places.c.city,
+        places.c.country,
+        places.c.location,
+        places.c.main_image_url,
+        places.c.average_rating,
+        places.c.review_count,
+        places.c.opening_hours,
+        func.coalesce(restaurants.c.price_range, cafes.c.price_range),
+        func.coalesce(hotels.c.amenities, cafes.c.amenities),
+        hotels.c.hotel_class,
+        hotels.c.price_per_night,
+        tag_names,
+        _search_vector(places.c.name, places.c.city, places.c.country),
+        places.c.created_at,
+    ).select_from(
+        places.outerjoin(hotels, hotels.c.id == places.c.id)
+        .outerjoin(restaurants, restaurants.c.id == places.c.id)
+        .outerjoin(cafes, cafes.c.id == places.c.id)
+    )
+    if place_ids is not None:
+        if not place_ids:
+            return 0
+        source = source.where(places.c.id.in_(place_ids))
+
+    stmt = insert(PlaceSearch).from_select(["place_id", *REFRESHED_COLUMNS], source)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PlaceSearch.place_id],
+        set_={
+            **{column: getattr(stmt.excluded, column) for column in REFRESHED_COLUMNS},
+            "updated_at": func.now(),
+        },
+    )
+    result = await session.execute(stmt)
+    return result.rowcount or 0
+
+
+async def sync_place_search_rating(session: AsyncSession, place_id: uuid.UUID) -> None:
+    """Copy the rating aggregates of a place into its place_search row."""
+    await session.execute(
+        update(PlaceSearch)
+        .where(PlaceSearch.place_id == place_id, Place.id == PlaceSearch.place_id)
+        .values(
+            average_rating=Place.average_rating,
+            review_count=Place.review_count,
+            updated_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
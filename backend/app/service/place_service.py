@@ -6,7 +6,7 @@ from typing import Sequence
 from geoalchemy2.elements import WKBElement
 from geoalchemy2.shape import to_shape
 from shapely.geometry import Point
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, with_polymorphic
 
@@ -18,7 +18,8 @@ from app.models import (
     PlaceImage,
     Profile,
     Restaurant,
-    Tag,
+    Review,
+    ReviewImage,
     auth_users,
 )
 from app.schemas import (
@@ -30,6 +31,10 @@ from app.schemas import (
     PlacePublic,
     PlaceUpdate,
 )
+from app.service.place_search_service import refresh_place_search
+from app.service.stats_service import adjust_profile_stats
+from app.service.tag_service import resolve_tags
+from app.service.utils import sync_child_rows
 
 
 def _enrich_place_public(place: Place) -> PlacePublic:
@@ -190,27 +195,11 @@ async def create_place(
             )
             session.add(img)
 
-    # 5. Handle Tags with race condition protection
+    # 5. Tags
     if place_create.tags:
-        for tag_name in place_create.tags:
-            result = await session.execute(select(Tag).where(Tag.name == tag_name))
-            tag = result.scalars().first()
-            if not tag:
-                try:
-                    tag = Tag(name=tag_name)
-                    session.add(tag)
-                    await session.flush()
-                except Exception:
-                    # Tag may have been created by concurrent request
-                    await session.rollback()
-                    result = await session.execute(
-                        select(Tag).where(Tag.name == tag_name)
-                    )
-                    tag = result.scalars().first()
-                    if not tag:
-                        raise ValueError(f"Failed to create or find tag: {tag_name}")
-            db_place.tags.append(tag)
+        db_place.tags = await resolve_tags(session, place_create.tags)
 
+    await refresh_place_search(session, [db_place.id])
     await session.commit()
     # We return via get_place to ensure relationships are loaded properly
     place_detail = await get_place(session, db_place.id)
@@ -271,42 +260,25 @@ async def update_place(
         if key in db_place.__mapper__.attrs.keys():
             setattr(db_place, key, value)
 
-    # 3. Images (Full Replace strategy)
+    # 3. Images (Full Replace, only changed rows are written)
     if "images" in update_data and update_data["images"] is not None:
-        # Clear old
-        for img in db_place.images:
-            await session.delete(img)
-        # Add new
         new_urls = update_data["images"]
-        if new_urls:
-            db_place.main_image_url = new_urls[0]  # Update main image
-            for url in new_urls:
-                session.add(PlaceImage(place_id=db_place.id, image_url=url))
-        else:
-            db_place.main_image_url = None
-
-    # 4. Tags (Full Replace) with race condition protection
+        await sync_child_rows(
+            session,
+            PlaceImage.place_id,
+            db_place.id,
+            [PlaceImage.image_url],
+            [(url,) for url in new_urls],
+        )
+        session.expire(db_place, ["images"])
+        # Update main image
+        db_place.main_image_url = new_urls[0] if new_urls else None
+
+    # 4. Tags (Full Replace)
     if "tags" in update_data and update_data["tags"] is not None:
-        db_place.tags = []
-        for tag_name in update_data["tags"]:
-            result = await session.execute(select(Tag).where(Tag.name == tag_name))
-            tag = result.scalars().first()
-            if not tag:
-                try:
-                    tag = Tag(name=tag_name)
-                    session.add(tag)
-                    await session.flush()
-                except Exception:
-                    # Tag may have been created by concurrent request
-                    await session.rollback()
-                    result = await session.execute(
-                        select(Tag).where(Tag.name == tag_name)
-                    )
-                    tag = result.scalars().first()
-                    if not tag:
-                        raise ValueError(f"Failed to create or find tag: {tag_name}")
-            db_place.tags.append(tag)
+        db_place.tags = await resolve_tags(session, update_data["tags"])
 
+    await refresh_place_search(session, [db_place.id])
     await session.commit()
     await session.refresh(db_place)
     place_detail = await get_place(session, db_place.id)
@@ -317,7 +289,25 @@ async def update_place(
 
 async def delete_place(session: AsyncSession, db_place: Place) -> None:
     """Delete a place."""
+    # Reviews (and their photos) of every reviewer go away with the place
+    review_counts = await session.execute(
+        select(
+            Review.user_id,
+            func.count(func.distinct(Review.id)),
+            func.count(ReviewImage.id),
+        )
+        .outerjoin(ReviewImage, ReviewImage.review_id == Review.id)
+        .where(Review.place_id == db_place.id)
+        .group_by(Review.user_id)
+    )
+    deltas = {
+        uid: {"reviews_count": -reviews, "photos_count": -photos}
+        for uid, reviews, photos in review_counts.all()
+    }
+
+    # The place_search row is removed by its ON DELETE CASCADE foreign key
     await session.delete(db_place)
+    await adjust_profile_stats(session, deltas)
     await session.commit()
 
 
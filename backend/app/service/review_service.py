@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import func, select
+from sqlalchemy import Numeric, case, cast, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -15,6 +15,9 @@ from app.schemas import (
     ReviewUpdate,
     ReviewerSchema,
 )
+from app.service.pagination import CountMode, count_total, paginate, split_page
+from app.service.place_search_service import sync_place_search_rating
+from app.service.stats_service import bump_profile_stats
 from app.service.utils import is_user_banned
 
 
@@ -29,23 +32,39 @@ def _sanitize_reviewer(user: Profile | None) -> ReviewerSchema | None:
     )
 
 
-async def _recalculate_place_rating(session: AsyncSession, place_id: uuid.UUID) -> None:
-    """Recalculate average rating and review count for a place.
-
-    Note: This should be called within a transaction to ensure consistency.
+async def _apply_place_rating_delta(
+    session: AsyncSession,
+    place_id: uuid.UUID,
+    rating_delta: int,
+    count_delta: int,
+) -> None:
+    """Apply a review delta to the place's running rating aggregates.
+
+    A single UPDATE adjusts `rating_sum` and `review_count` relative to the
+    row's current values and derives `average_rating` from them. The row lock
+    taken by the UPDATE serializes concurrent review writes on the same place,
+    and each writer recomputes from the latest committed values, so no deltas
+    are lost. The place_search copy of the aggregates is updated in the same
+    transaction. Must be called within the caller's transaction.
     """
+    new_sum = Place.rating_sum + rating_delta
+    new_count = Place.review_count + count_delta
     result = await session.execute(
-        select(func.avg(Review.rating), func.count(Review.id)).where(
-            Review.place_id == place_id
+        update(Place)
+        .where(Place.id == place_id)
+        .values(
+            rating_sum=new_sum,
+            review_count=new_count,
+            average_rating=case(
+                (new_count > 0, func.round(cast(new_sum, Numeric) / new_count, 1)),
+                else_=0,
+            ),
         )
+        .execution_options(synchronize_session=False)
     )
-    avg, count = result.first() or (0, 0)
-    place = await session.get(Place, place_id)
-    if place:
-        place.average_rating = float(avg or 0.0)
-        place.review_count = int(count or 0)
-    else:
+    if result.rowcount == 0:
         raise ValueError(f"Place not found with ID: {place_id}")
+    await sync_place_search_rating(session, place_id)
 
 
 async def create_review(
@@ -72,7 +91,10 @@ async def create_review(
         await session.rollback()
         raise ValueError(f"Failed to create review: {str(e)}")
 
-    await _recalculate_place_rating(session, data.place_id)
+    await bump_profile_stats(
+        session, user_id, reviews_count=1, photos_count=len(data.images)
+    )
+    await _apply_place_rating_delta(session, data.place_id, data.rating, 1)
     await session.commit()
     await session.refresh(review)
     review_detail = await get_review(session, review.id)
@@ -106,25 +128,32 @@ async def get_review(
 
 
 async def list_reviews_for_place(
-    session: AsyncSession, place_id: uuid.UUID, page: int, limit: int
-) -> tuple[list[ReviewSchema], int]:
-    """List all reviews for a specific place with pagination."""
+    session: AsyncSession,
+    place_id: uuid.UUID,
+    page: int,
+    limit: int,
+    cursor: str | None = None,
+    count_mode: CountMode = "exact",
+) -> tuple[list[ReviewSchema], int | None, str | None]:
+    """
+    List all reviews for a specific place with pagination, newest first.
+    Returns the page, total count and the cursor of the next page.
+    """
     base_query = select(Review.id).where(Review.place_id == place_id)
-    total_res = await session.execute(
-        select(func.count()).select_from(base_query.subquery())
-    )
-    total = int(total_res.scalar() or 0)
+    total = await count_total(session, base_query, count_mode)
 
     stmt = (
         select(Review)
         .options(selectinload(Review.images), selectinload(Review.user))
         .where(Review.place_id == place_id)
-        .order_by(Review.created_at.desc())
-        .offset((page - 1) * limit)
-        .limit(limit)
+    )
+    stmt = paginate(
+        stmt, [(Review.created_at, True), (Review.id, True)], page, limit, cursor
     )
     res = await session.execute(stmt)
-    reviews = res.scalars().all()
+    reviews, next_cursor = split_page(
+        res.scalars().all(), limit, lambda r: (r.created_at, r.id)
+    )
     data = [
         ReviewSchema(
             id=r.id,
@@ -137,7 +166,7 @@ async def list_reviews_for_place(
         )
         for r in reviews
     ]
-    return data, total
+    return data, total, next_cursor
 
 
 async def update_review(
@@ -150,6 +179,7 @@ async def update_review(
     if review.user_id != user_id:
         raise PermissionError("Not authorized to update this review")
 
+    old_rating = review.rating
     try:
         upd = data.model_dump(exclude_unset=True)
         images = upd.pop("images", None)
@@ -158,14 +188,21 @@ async def update_review(
 
         if images is not None:
             # Use ORM relationship to clear images (CASCADE handles deletion)
+            removed_images = len(review.images)
             review.images.clear()
             for url in images:
                 session.add(ReviewImage(review_id=review.id, image_url=url))
+            await bump_profile_stats(
+                session, user_id, photos_count=len(images) - removed_images
+            )
     except Exception as e:
         await session.rollback()
         raise ValueError(f"Failed to update review: {str(e)}")
 
-    await _recalculate_place_rating(session, review.place_id)
+    if review.rating != old_rating:
+        await _apply_place_rating_delta(
+            session, review.place_id, review.rating - old_rating, 0
+        )
     await session.commit()
     review_detail = await get_review(session, review.id)
     if not review_detail:
@@ -183,6 +220,13 @@ async def delete_review(
     if review.user_id != user_id:
         raise PermissionError("Not authorized to delete this review")
     place_id = review.place_id
+    rating = review.rating
+    image_count = await session.scalar(
+        select(func.count(ReviewImage.id)).where(ReviewImage.review_id == review_id)
+    )
     await session.delete(review)
-    await _recalculate_place_rating(session, place_id)
+    await bump_profile_stats(
+        session, user_id, reviews_count=-1, photos_count=-(image_count or 0)
+    )
+    await _apply_place_rating_delta(session, place_id, -rating, -1)
     await session.commit()
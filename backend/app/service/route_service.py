@@ -0,0 +1,137 @@
+"""
+Shortest visiting order of trip stops, computed with NumPy.
+
+A day's stops are split at anchors (stops that must not move); the stops
+between two anchors are reordered into the shortest path from the first
+anchor to the second with nearest-neighbour construction and 2-opt.
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+# 2-opt stops once no reversal shortens the route by more than this (km)
+MIN_IMPROVEMENT_KM = 1e-9
+
+
+def haversine_matrix(lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+    """Pairwise great-circle distances in km between points given in degrees."""
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lng = np.radians(np.asarray(lng, dtype=float))
+    dlat = lat[:, None] - lat[None, :]
+    dlng = lng[:, None] - lng[None, :]
+    h = (
+        np.sin(dlat / 2) ** 2
+        + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlng / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+def _nearest_neighbour(dist: np.ndarray, start: int, end: int) -> np.ndarray:
+    """Path from `start` to `end` through every other node, nearest first."""
+    n = len(dist)
+    unvisited = np.ones(n, dtype=bool)
+    unvisited[[start, end]] = False
+    path = [start]
+    current = start
+    for _ in range(n - 2):
+        candidates = np.where(unvisited, dist[current], np.inf)
+        current = int(np.argmin(candidates))
+        unvisited[current] = False
+        path.append(current)
+    path.append(end)
+    return np.array(path)
+
+
+def _two_opt(dist: np.ndarray, path: np.ndarray) -> np.ndarray:
+    """
+    Improve a path with fixed ends by reversing sections of it.
+
+    Every pass scores all reversals at once, then applies the best
+    reversal of each start edge, best first, skipping those that overlap
+    one already applied (disjoint reversals don't change each other's gain).
+    """
+    path = path.copy()
+    m = len(path)
+    if m < 4:
+        return path
+    # Reversing path[p + 1 : q + 1] swaps edges (p, p + 1) and (q, q + 1)
+    invalid = ~np.triu(np.ones((m - 1, m - 1), dtype=bool), k=2)
+    rows = np.arange(m - 1)
+    while True:
+        a, b = path[:-1], path[1:]
+        edge = dist[a, b]
+        gain = (
+            edge[:, None]
+            + edge[None, :]
+            - dist[np.ix_(a, a)]
+            - dist[np.ix_(b, b)]
+        )
+        gain[invalid] = -np.inf
+        best_q = gain.argmax(axis=1)
+        best_gain = gain[rows, best_q]
+        improving = np.flatnonzero(best_gain > MIN_IMPROVEMENT_KM)
+        if not len(improving):
+            return path
+        taken = np.zeros(m - 1, dtype=bool)
+        for p in improving[np.argsort(-best_gain[improving], kind="stable")]:
+            q = best_q[p]
+            if taken[p : q + 1].any():
+                continue
+            taken[p : q + 1] = True
+            path[p + 1 : q + 1] = path[p + 1 : q + 1][::-1]
+
+
+def shortest_path(
+    dist: np.ndarray, nodes: Sequence[int], start: int | None, end: int | None
+) -> list[int]:
+    """
+    Order of `nodes` (indices into `dist`) for the shortest route from
+    `start` to `end`. A None end is free: a zero-cost point stands in for it.
+    """
+    k = len(nodes)
+    if k < 2:
+        return list(nodes)
+    sub = np.zeros((k + 2, k + 2))
+    sub[1:-1, 1:-1] = dist[np.ix_(nodes, nodes)]
+    if start is not None:
+        sub[0, 1:-1] = sub[1:-1, 0] = dist[start, nodes]
+    if end is not None:
+        sub[-1, 1:-1] = sub[1:-1, -1] = dist[end, nodes]
+    path = _two_opt(sub, _nearest_neighbour(sub, 0, k + 1))
+    return [nodes[i - 1] for i in path[1:-1]]
+
+
+def optimize_order(
+    lat: Sequence[float | None], lng: Sequence[float | None], fixed: Sequence[bool]
+) -> list[int]:
+    """
+    Visiting order (indices into the inputs) for one day's stops.
+
+    Fixed stops and stops without coordinates keep their positions; the
+    stops between them are reordered for the shortest route.
+    """
+    located = [la is not None and lo is not None for la, lo in zip(lat, lng)]
+    dist = haversine_matrix(
+        [la if ok else 0.0 for la, ok in zip(lat, located)],
+        [lo if ok else 0.0 for lo, ok in zip(lng, located)],
+    )
+
+    order: list[int] = []
+    segment: list[int] = []
+    previous: int | None = None
+    for i, is_fixed in enumerate([*fixed, True]):
+        if i < len(fixed) and not is_fixed and located[i]:
+            segment.append(i)
+            continue
+        if segment:
+            start = previous if previous is not None and located[previous] else None
+            end = i if i < len(fixed) and located[i] else None
+            order.extend(shortest_path(dist, segment, start, end))
+            segment = []
+        if i < len(fixed):
+            order.append(i)
+            previous = i
+    return order
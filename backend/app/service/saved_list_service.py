@@ -16,7 +16,9 @@ from app.schemas import (
     SavedListSchema,
     SavedListUpdate,
 )
+from app.service.pagination import CountMode, count_total, paginate, split_page
 from app.service.place_service import _enrich_place_public
+from app.service.utils import ensure_rows_exist, sync_child_rows
 
 
 async def create_saved_list(
@@ -35,25 +37,38 @@ async def create_saved_list(
 
 
 async def list_saved_lists(
-    session: AsyncSession, user_id: uuid.UUID, page: int, limit: int
-) -> tuple[list[SavedListSchema], int]:
-    """List all saved lists for a user with pagination."""
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    page: int,
+    limit: int,
+    cursor: str | None = None,
+    count_mode: CountMode = "exact",
+) -> tuple[list[SavedListSchema], int | None, str | None]:
+    """
+    List all saved lists for a user with pagination, newest first.
+    Returns the page, total count and the cursor of the next page.
+    """
     base_query = select(SavedList.id).where(SavedList.user_id == user_id)
-    total_res = await session.execute(
-        select(func.count()).select_from(base_query.subquery())
-    )
-    total = int(total_res.scalar() or 0)
+    total = await count_total(session, base_query, count_mode)
 
     stmt = (
         select(SavedList, func.count(SavedListItem.place_id).label("item_count"))
         .outerjoin(SavedListItem, SavedList.id == SavedListItem.list_id)
         .where(SavedList.user_id == user_id)
         .group_by(SavedList.id)
-        .order_by(SavedList.created_at.desc())
-        .offset((page - 1) * limit)
-        .limit(limit)
     )
-    rows = (await session.execute(stmt)).all()
+    stmt = paginate(
+        stmt,
+        [(SavedList.created_at, True), (SavedList.id, True)],
+        page,
+        limit,
+        cursor,
+    )
+    rows, next_cursor = split_page(
+        (await session.execute(stmt)).all(),
+        limit,
+        lambda row: (row[0].created_at, row[0].id),
+    )
     data: list[SavedListSchema] = []
     for lst, item_count in rows:
         data.append(
@@ -64,7 +79,7 @@ async def list_saved_lists(
                 item_count=int(item_count or 0),
             )
         )
-    return data, total
+    return data, total, next_cursor
 
 
 async def get_saved_list(
@@ -205,22 +220,17 @@ async def update_saved_list(
         if data.name is not None:
             saved_list.name = data.name
 
-        # Update places if provided
+        # Update places if provided (only changed items are written)
         if data.place_ids is not None:
-            # Remove all existing items
-            for item in saved_list.items:
-                await session.delete(item)
-            await session.flush()
-
-            # Add new items
-            for place_id in data.place_ids:
-                # Verify place exists
-                place = await session.get(Place, place_id)
-                if not place:
-                    raise ValueError(f"Place {place_id} not found")
-                
-                new_item = SavedListItem(list_id=list_id, place_id=place_id)
-                session.add(new_item)
+            await ensure_rows_exist(session, Place.id, data.place_ids, "Place")
+            await sync_child_rows(
+                session,
+                SavedListItem.list_id,
+                list_id,
+                [SavedListItem.place_id],
+                [(place_id,) for place_id in dict.fromkeys(data.place_ids)],
+            )
+            session.expire(saved_list, ["items"])
 
         await session.commit()
         await session.refresh(saved_list)
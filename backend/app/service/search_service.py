@@ -1,126 +1,175 @@
 """Place search functionality."""
 
-from geoalchemy2 import Geography
-from sqlalchemy import and_, func, or_, select
+import asyncio
+import uuid
+from typing import Any
+
+from geoalchemy2 import Geography, Geometry
+from sqlalchemy import Row, and_, cast, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload, with_polymorphic
-
-from app.models import (
-    Cafe,
-    Hotel,
-    Landmark,
-    Place,
-    Restaurant,
-    Tag,
-    Trip,
-    TripStop,
-)
+
+from app.core.config import settings
+from app.core.db import sessionmanager
+from app.models import PlaceSearch, Trip, TripStop
 from app.schemas import (
+    ForumPostListItem,
     ForumSearchFilter,
+    LocationSchema,
+    PlacePublic,
     PlaceSearchFilter,
     PlaceSearchResponse,
     TripListSchema,
 )
 from app.service.forum_service import list_forum_posts
-from app.service.place_service import _enrich_place_public
+from app.service.pagination import CountMode, count_total, paginate, split_page
+from app.service.place_search_service import search_query
+from app.service.utils import in_own_session
+
+# Supplementary results are extras, not the primary search result
+SUPPLEMENTARY_LIMIT = 5
+
+
+def _place_public_from_row(row: Row[Any]) -> PlacePublic:
+    """Build PlacePublic from a row of the search projection."""
+    return PlacePublic(
+        id=row.id,
+        name=row.name,
+        place_type=row.place_type,
+        address=row.address,
+        city=row.city,
+        country=row.country,
+        location=LocationSchema(lat=row.lat or 0.0, lng=row.lng or 0.0),
+        average_rating=float(row.average_rating or 0.0),
+        review_count=row.review_count or 0,
+        main_image_url=row.main_image_url,
+        opening_hours=row.opening_hours,
+        price_range=row.price_range,
+        tags=row.tags or [],
+        created_at=row.created_at,
+    )
+
+
+async def _related_posts(q: str | None) -> list[ForumPostListItem]:
+    """Newest forum posts matching the keyword, on a session of their own."""
+    if not q:
+        return []
+    forum_filter = ForumSearchFilter(
+        q=q, sort="newest", page=1, limit=SUPPLEMENTARY_LIMIT
+    )
+    async with sessionmanager.session() as session:
+        posts, _, _ = await list_forum_posts(session, forum_filter, count_mode="none")
+    return posts
+
+
+async def _related_trips(
+    session: AsyncSession, place_ids: list[uuid.UUID]
+) -> list[TripListSchema]:
+    """Newest public trips that visit any of the given places."""
+    if not place_ids:
+        return []
+    trips_query = (
+        select(Trip, func.count(TripStop.id).label("stop_count"))
+        .join(TripStop, Trip.id == TripStop.trip_id)
+        .where(
+            and_(
+                TripStop.place_id.in_(place_ids),
+                Trip.public,
+            )
+        )
+        .group_by(Trip.id)
+        .order_by(Trip.created_at.desc())
+        .limit(SUPPLEMENTARY_LIMIT)
+    )
+    trips_result = await session.execute(trips_query)
+    return [
+        TripListSchema(
+            id=trip.id,
+            trip_name=trip.trip_name,
+            start_date=trip.start_date,
+            end_date=trip.end_date,
+            public=trip.public,
+            stop_count=int(stop_count or 0),
+        )
+        for trip, stop_count in trips_result.all()
+    ]
 
 
 async def search_places(
-    session: AsyncSession, filter_params: PlaceSearchFilter
-) -> tuple[PlaceSearchResponse, int]:
+    session: AsyncSession,
+    filter_params: PlaceSearchFilter,
+    count_mode: CountMode = "exact",
+) -> tuple[PlaceSearchResponse, int | None, str | None]:
     """
     Search places with various filters including keyword, type, tags, location, and radius.
-    Returns paginated results and total count.
+    Returns paginated results, total count and the cursor of the next page.
     Only approved places are shown for all users.
+
+    Places are read from the denormalized place_search table, so no joins
+    to the subtype or tag tables are needed.
+
+    `filter_params.include` picks the supplementary results (related forum
+    posts and public trips); the page, count and posts queries run
+    concurrently under settings.SEARCH_TIMEOUT_SECONDS.
     """
-    # Load all possible subclasses to prevent lazy loading of polymorphic attributes
-    poly = with_polymorphic(Place, [Hotel, Restaurant, Landmark, Cafe])
-
-    # We MUST selectinload relationships used in _enrich_place_public
-    # otherwise accessing them on async objects triggers MissingGreenlet errors
-    query = select(poly).options(
-        selectinload(poly.tags),
-        selectinload(poly.images),  # For primary_image
-        selectinload(poly.reviews),  # For average_rating calculation
+    ps = PlaceSearch
+    location = cast(ps.location, Geometry(srid=4326))
+    query = select(
+        ps.place_id.label("id"),
+        ps.name,
+        ps.place_type,
+        ps.address,
+        ps.city,
+        ps.country,
+        func.ST_Y(location).label("lat"),
+        func.ST_X(location).label("lng"),
+        ps.main_image_url,
+        ps.average_rating,
+        ps.review_count,
+        ps.opening_hours,
+        ps.price_range,
+        ps.tags,
+        ps.created_at,
     )
 
-    # 1. Keyword (Name only as Description is generic only in some subclasses)
+    # 1. Keyword (prefix match on the words of name, city and country)
     if filter_params.q:
-        term = f"%{filter_params.q}%"
-        # We search name. Searching subclass specific 'description' requires complicated joins
-        # or casting. For V1, we search Name.
-        query = query.where(poly.name.ilike(term))
+        ts_query = search_query(filter_params.q)
+        if ts_query is not None:
+            query = query.where(ps.search_vector.op("@@")(ts_query))
+        else:
+            query = query.where(ps.name.ilike(f"%{filter_params.q}%"))
 
     # 2. Type Filter
     if filter_params.place_type:
-        query = query.where(poly.place_type == filter_params.place_type)
+        query = query.where(ps.place_type == filter_params.place_type)
 
-    # 3. Tags
+    # 3. Tags (any of the requested tags)
     if filter_params.tags:
         tag_list = [t.strip() for t in filter_params.tags.split(",")]
-        query = query.join(poly.tags).where(Tag.name.in_(tag_list))
+        query = query.where(ps.tags.overlap(tag_list))
 
-    # 4. Amenities (for Hotel and Cafe)
+    # 4. Amenities (only hotels and cafes have them)
     if filter_params.amenities:
         amenity_list = [a.strip() for a in filter_params.amenities.split(",")]
-        # Check if the place has any of the requested amenities
-        # This works because amenities is an ARRAY field in PostgreSQL
-        query = query.where(
-            or_(
-                and_(
-                    poly.place_type == "hotel",
-                    Hotel.amenities.overlap(amenity_list),
-                ),
-                and_(
-                    poly.place_type == "cafe",
-                    Cafe.amenities.overlap(amenity_list),
-                ),
-            )
-        )
+        query = query.where(ps.amenities.overlap(amenity_list))
 
-    # 5. Price Range (for Restaurant and Cafe)
+    # 5. Price Range (only restaurants and cafes have one)
     if filter_params.price_range:
-        query = query.where(
-            or_(
-                and_(
-                    poly.place_type == "restaurant",
-                    Restaurant.price_range == filter_params.price_range,
-                ),
-                and_(
-                    poly.place_type == "cafe",
-                    Cafe.price_range == filter_params.price_range,
-                ),
-            )
-        )
+        query = query.where(ps.price_range == filter_params.price_range)
 
     # 6. Minimum Rating
     if filter_params.rating:
-        query = query.where(poly.average_rating >= filter_params.rating)
+        query = query.where(ps.average_rating >= filter_params.rating)
 
     # 7. Hotel Class (for Hotels only)
     if filter_params.hotel_class:
-        query = query.where(
-            and_(
-                poly.place_type == "hotel",
-                Hotel.hotel_class == filter_params.hotel_class,
-            )
-        )
+        query = query.where(ps.hotel_class == filter_params.hotel_class)
 
     # 8. Hotel Price Per Night Range (for Hotels only)
-    if (
-        filter_params.price_per_night_min is not None
-        or filter_params.price_per_night_max is not None
-    ):
-        conditions = [poly.place_type == "hotel"]
-        if filter_params.price_per_night_min is not None:
-            conditions.append(
-                Hotel.price_per_night >= filter_params.price_per_night_min
-            )
-        if filter_params.price_per_night_max is not None:
-            conditions.append(
-                Hotel.price_per_night <= filter_params.price_per_night_max
-            )
-        query = query.where(and_(*conditions))
+    if filter_params.price_per_night_min is not None:
+        query = query.where(ps.price_per_night >= filter_params.price_per_night_min)
+    if filter_params.price_per_night_max is not None:
+        query = query.where(ps.price_per_night <= filter_params.price_per_night_max)
 
     # 9. Geo with validation
     distance_expr = None
@@ -136,7 +185,7 @@ async def search_places(
             user_geo = func.ST_SetSRID(func.ST_MakePoint(lng, lat), 4326).cast(
                 Geography
             )
-            distance_expr = func.ST_Distance(poly.location, user_geo)
+            distance_expr = func.ST_Distance(ps.location, user_geo)
 
             if filter_params.radius:
                 # Validate radius
@@ -146,97 +195,66 @@ async def search_places(
                     raise ValueError("Radius too large (max 20,000 km)")
                 # Radius in meters
                 query = query.where(
-                    func.ST_DWithin(
-                        poly.location, user_geo, filter_params.radius * 1000
-                    )
+                    func.ST_DWithin(ps.location, user_geo, filter_params.radius * 1000)
                 )
         except (ValueError, AttributeError):
             # Invalid format or coordinate values - silently ignore and continue without geo filter
             # This matches the original behavior but logs the issue
             pass
 
-    # 10. Sorting
-    if filter_params.sort_by == "distance" and distance_expr is not None:
-        # Add distance to select list for ORDER BY compatibility with DISTINCT
+    # 10. Sorting (id breaks ties so keyset cursors are stable)
+    sort_by_distance = (
+        filter_params.sort_by == "distance" and distance_expr is not None
+    )
+    if sort_by_distance:
+        # Distance is also returned so it can go into the next page cursor
         query = query.add_columns(distance_expr.label("distance"))
-        query = query.order_by(distance_expr.asc())
-    elif filter_params.sort_by == "rating":
-        query = query.order_by(poly.average_rating.desc())
+        sort_keys = [(distance_expr, False), (ps.place_id, False)]
+        key_attr = "distance"
     elif filter_params.sort_by == "newest":
         # Sort by created_at descending for newest first
-        query = query.order_by(poly.created_at.desc())
+        sort_keys = [(ps.created_at, True), (ps.place_id, True)]
+        key_attr = "created_at"
     else:
         # Default to rating
-        query = query.order_by(poly.average_rating.desc())
-
-    # Count distinct places (handling duplicates from joins like tags)
-    # Create a subquery from the filtered query (before pagination), then count distinct IDs
-    filtered_subquery = query.subquery()
-    count_query = select(func.count(func.distinct(filtered_subquery.c.id)))
-    count_result = await session.execute(count_query)
-    total = count_result.scalar() or 0
-
-    # Paginate
-    offset = (filter_params.page - 1) * filter_params.limit
-    query = query.offset(offset).limit(filter_params.limit)
+        sort_keys = [(ps.average_rating, True), (ps.place_id, True)]
+        key_attr = "average_rating"
 
-    result = await session.execute(query)
-
-    # Handle results differently if distance was added to columns
-    if filter_params.sort_by == "distance" and distance_expr is not None:
-        # Extract just the Place objects (first column), ignoring distance column
-        results = [row[0] for row in result.unique().all()]
-    else:
-        results = result.unique().scalars().all()
-
-    # Enrich places
-    places = [_enrich_place_public(p) for p in results]
+    include = {part.strip() for part in filter_params.include.split(",")}
+    count_query = query.with_only_columns(ps.place_id)
+    page_query = paginate(
+        query,
+        sort_keys,
+        filter_params.page,
+        filter_params.limit,
+        filter_params.cursor,
+    )
 
-    # Fetch supplementary posts using existing forum search logic
-    # Limited to 5 as these are extras, not the primary search result
-    posts = []
-    if filter_params.q:
-        forum_filter = ForumSearchFilter(
-            q=filter_params.q,
-            sort="newest",
-            page=1,
-            limit=5,
+    async def places_and_trips():
+        # Trips depend on the page of places, so they follow it on this session
+        result = await session.execute(page_query)
+        rows, next_cursor = split_page(
+            result.all(),
+            filter_params.limit,
+            lambda row: (getattr(row, key_attr), row.id),
         )
-        posts, _ = await list_forum_posts(session, forum_filter)
-        # Ignore total count (second return value) as we don't need it for supplementary results
-
-    # Fetch supplementary public trips that visit any of the returned places
-    # Limited to 5 as these are extras, not the primary search result
-    trips = []
-    if results:
-        place_ids = [place.id for place in results]
-        trips_query = (
-            select(Trip, func.count(TripStop.id).label("stop_count"))
-            .join(TripStop, Trip.id == TripStop.trip_id)
-            .where(
-                and_(
-                    TripStop.place_id.in_(place_ids),
-                    Trip.public,
-                )
-            )
-            .group_by(Trip.id)
-            .order_by(Trip.created_at.desc())
-            .limit(5)
+        places = [_place_public_from_row(row) for row in rows]
+        trips = (
+            await _related_trips(session, [place.id for place in places])
+            if "trips" in include
+            else []
+        )
+        return places, next_cursor, trips
+
+    # The count and the forum search don't depend on the page, so they run
+    # concurrently on their own connections. Raises TimeoutError past the
+    # deadline.
+    async with asyncio.timeout(settings.SEARCH_TIMEOUT_SECONDS):
+        (places, next_cursor, trips), total, posts = await asyncio.gather(
+            places_and_trips(),
+            in_own_session(count_total, count_query, count_mode),
+            _related_posts(filter_params.q if "posts" in include else None),
         )
-        trips_result = await session.execute(trips_query)
-        trip_rows = trips_result.all()
-
-        trips = [
-            TripListSchema(
-                id=trip.id,
-                trip_name=trip.trip_name,
-                start_date=trip.start_date,
-                end_date=trip.end_date,
-                public=trip.public,
-                stop_count=int(stop_count or 0),
-            )
-            for trip, stop_count in trip_rows
-        ]
 
     response = PlaceSearchResponse(
         places=places,
@@ -244,4 +262,4 @@ async def search_places(
         trips=trips,
     )
 
-    return response, total
+    return response, total, next_cursor
@@ -0,0 +1,167 @@
+"""Per-user activity counters backing profile statistics."""
+
+import uuid
+from typing import Mapping
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import (
+    ForumPost,
+    PostReply,
+    Profile,
+    ProfileStats,
+    Review,
+    ReviewImage,
+    Trip,
+)
+from app.schemas import UserStats
+
+STAT_FIELDS = (
+    "reviews_count",
+    "posts_count",
+    "photos_count",
+    "trips_count",
+    "public_trips_count",
+    "replies_count",
+)
+
+
+def to_user_stats(stats: ProfileStats | None) -> UserStats:
+    """Map a counters row to the public UserStats schema."""
+    if stats is None:
+        return UserStats(
+            reviews_count=0,
+            posts_count=0,
+            photos_count=0,
+            public_trips_count=0,
+            replies_count=0,
+        )
+    return UserStats(
+        reviews_count=stats.reviews_count,
+        posts_count=stats.posts_count,
+        photos_count=stats.photos_count,
+        public_trips_count=stats.public_trips_count,
+        replies_count=stats.replies_count,
+    )
+
+
+async def adjust_profile_stats(
+    session: AsyncSession,
+    deltas: Mapping[uuid.UUID | None, Mapping[str, int]],
+) -> None:
+    """
+    Apply counter deltas for one or more profiles.
+
+    Each counter is incremented in place (`col = col + delta`) so concurrent
+    writers never overwrite each other. Counters are clamped at zero; any
+    remaining drift is repaired by `reconcile_profile_stats`.
+    Must be called inside the caller's transaction (it does not commit).
+    """
+    params = [
+        {"pid": profile_id, **{f"d_{f}": delta.get(f, 0) for f in STAT_FIELDS}}
+        for profile_id, delta in deltas.items()
+        if profile_id is not None and any(delta.get(f, 0) for f in STAT_FIELDS)
+    ]
+    if not params:
+        return
+
+    table = ProfileStats.__table__
+    stmt = (
+        update(table)
+        .where(table.c.profile_id == bindparam("pid"))
+        .values(
+            {
+                **{
+                    field: func.greatest(table.c[field] + bindparam(f"d_{field}"), 0)
+                    for field in STAT_FIELDS
+                },
+                "updated_at": func.now(),
+            }
+        )
+    )
+    await session.execute(stmt, params)
+
+
+async def bump_profile_stats(
+    session: AsyncSession, profile_id: uuid.UUID | None, **delta: int
+) -> None:
+    """Apply counter deltas for a single profile, e.g. `reviews_count=1`."""
+    await adjust_profile_stats(session, {profile_id: delta})
+
+
+async def get_profile_stats(
+    session: AsyncSession, profile_id: uuid.UUID
+) -> ProfileStats | None:
+    """
+    Read the counters row of a profile.
+
+    Profiles created before the counters existed get their row rebuilt
+    (and committed) on first read.
+    """
+    stats = await session.get(ProfileStats, profile_id)
+    if stats is None:
+        await reconcile_profile_stats(session, profile_id)
+        await session.commit()
+        stats = await session.get(ProfileStats, profile_id)
+    return stats
+
+
+async def reconcile_profile_stats(
+    session: AsyncSession, profile_id: uuid.UUID | None = None
+) -> int:
+    """
+    Recompute counters from the source tables and upsert them.
+
+    Repairs drift left by cascading deletes or failed writes. Reconciles a
+    single profile when `profile_id` is given, otherwise every profile.
+    Does not commit.
+
+    Returns:
+        Number of profiles reconciled.
+    """
+    reviews = (
+        select(func.count(Review.id))
+        .where(Review.user_id == Profile.id)
+        .scalar_subquery()
+    )
+    posts = (
+        select(func.count(ForumPost.id))
+        .where(ForumPost.author_id == Profile.id)
+        .scalar_subquery()
+    )
+    photos = (
+        select(func.count(ReviewImage.id))
+        .join(Review, Review.id == ReviewImage.review_id)
+        .where(Review.user_id == Profile.id)
+        .scalar_subquery()
+    )
+    trips = (
+        select(func.count(Trip.id)).where(Trip.user_id == Profile.id).scalar_subquery()
+    )
+    public_trips = (
+        select(func.count(Trip.id))
+        .where(Trip.user_id == Profile.id, Trip.public)
+        .scalar_subquery()
+    )
+    replies = (
+        select(func.count(PostReply.id))
+        .where(PostReply.user_id == Profile.id)
+        .scalar_subquery()
+    )
+
+    source = select(Profile.id, reviews, posts, photos, trips, public_trips, replies)
+    if profile_id is not None:
+        source = source.where(Profile.id == profile_id)
+
+    stmt = insert(ProfileStats).from_select(["profile_id", *STAT_FIELDS], source)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ProfileStats.profile_id],
+        set_={
+            **{field: getattr(stmt.excluded, field) for field in STAT_FIELDS},
+            "updated_at": func.now(),
+        },
+    )
+    result = await session.execute(stmt)
+    return result.rowcount or 0
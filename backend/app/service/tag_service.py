@@ -0,0 +1,83 @@
+"""Bulk tag resolution shared by places, trips and forum posts."""
+
+import uuid
+from collections import OrderedDict
+from collections.abc import Sequence
+
+from sqlalchemy import String, any_, bindparam, event, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.config import settings
+from app.models import Tag
+
+# Tag name -> id of committed tags, least recently used first. Tags are never
+# renamed or deleted, so entries don't go stale.
+_tag_ids: OrderedDict[str, uuid.UUID] = OrderedDict()
+
+# session.info key of the tags a session resolved from the database; they are
+# cached once its transaction commits, so a rollback never leaves a bad id
+_PENDING = "pending_tag_ids"
+
+
+def _remember(name: str, tag_id: uuid.UUID) -> None:
+    _tag_ids[name] = tag_id
+    _tag_ids.move_to_end(name)
+    while len(_tag_ids) > settings.TAG_CACHE_MAX_ENTRIES:
+        _tag_ids.popitem(last=False)
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_committed(session: Session) -> None:
+    for name, tag_id in session.info.pop(_PENDING, {}).items():
+        _remember(name, tag_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_rolled_back(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING, None)
+
+
+async def _attach(session: AsyncSession, tag_id: uuid.UUID, name: str) -> Tag:
+    """Return the session's Tag for a known row without querying for it."""
+    tag = Tag(id=tag_id, name=name)
+    make_transient_to_detached(tag)
+    return await session.merge(tag, load=False)
+
+
+async def resolve_tags(session: AsyncSession, names: Sequence[str]) -> list[Tag]:
+    """
+    Return Tag entities for `names`, creating the missing ones.
+
+    Names not in the cache are inserted with a single
+    `INSERT ... ON CONFLICT DO NOTHING` (concurrent creators don't fail or
+    roll back the caller's session) and read back with a single
+    `SELECT ... WHERE name = ANY(...)`. Duplicates are dropped, order is kept.
+    Does not commit; the tags read back are cached when the session commits.
+    """
+    unique_names = list(dict.fromkeys(names))
+    resolved = {name: _tag_ids[name] for name in unique_names if name in _tag_ids}
+    for name in resolved:
+        _tag_ids.move_to_end(name)
+
+    missing = [name for name in unique_names if name not in resolved]
+    if missing:
+        await session.execute(
+            insert(Tag)
+            .values([{"id": uuid.uuid4(), "name": name} for name in missing])
+            .on_conflict_do_nothing(index_elements=[Tag.name])
+        )
+        result = await session.execute(
+            select(Tag.id, Tag.name).where(
+                Tag.name == any_(bindparam("names", missing, type_=ARRAY(String)))
+            )
+        )
+        # Even conflicting rows may be this transaction's own, so nothing is
+        # cached before the commit
+        pending = session.info.setdefault(_PENDING, {})
+        for tag_id, name in result.all():
+            resolved[name] = tag_id
+            pending[name] = tag_id
+
+    return [await _attach(session, resolved[name], name) for name in unique_names]
@@ -0,0 +1,232 @@
+"""Background AI trip generation jobs backed by the trip_generation_jobs table."""
+
+import asyncio
+import contextlib
+import logging
+import uuid
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import ColumnElement, and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.db import sessionmanager
+from app.models import TripGenerationJob
+from app.schemas import TripDayPlan, TripGenerateRequest
+from app.service.ai_service import build_trip_prompt, stream_trip_plan
+from app.service.trip_service import add_trip
+
+logger = logging.getLogger(__name__)
+
+# Set when a job is enqueued so an idle worker of this process starts at once
+_wakeup = asyncio.Event()
+
+
+async def enqueue_trip_generation(
+    session: AsyncSession, user_id: uuid.UUID, request: TripGenerateRequest
+) -> TripGenerationJob:
+    """Store a generation job for the worker pool and return it."""
+    job = TripGenerationJob(
+        user_id=user_id,
+        request=request.model_dump(mode="json"),
+        days_total=max((request.end_date - request.start_date).days + 1, 0),
+    )
+    session.add(job)
+    await session.commit()
+    await session.refresh(job)
+    _wakeup.set()
+    return job
+
+
+async def get_trip_generation_job(
+    session: AsyncSession, user_id: uuid.UUID, job_id: uuid.UUID
+) -> TripGenerationJob | None:
+    """A job of `user_id`, or None if it doesn't exist or isn't theirs."""
+    job = await session.get(TripGenerationJob, job_id, populate_existing=True)
+    if job is None or job.user_id != user_id:
+        return None
+    return job
+
+
+async def claim_trip_generation_job(
+    session: AsyncSession,
+) -> TripGenerationJob | None:
+    """
+    Mark the oldest runnable job as running and return it.
+
+    Queued jobs are runnable, and so are running jobs whose worker stopped
+    sending heartbeats (it died or was restarted). SKIP LOCKED lets workers
+    in every process claim concurrently without taking the same job.
+    """
+    job_table = TripGenerationJob
+    stale_before = func.now() - timedelta(seconds=settings.TRIP_JOB_STALE_SECONDS)
+    next_job = (
+        select(job_table.id)
+        .where(
+            or_(
+                job_table.status == "queued",
+                and_(
+                    job_table.status == "running",
+                    job_table.updated_at < stale_before,
+                ),
+            )
+        )
+        .order_by(job_table.created_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    result = await session.execute(
+        update(job_table)
+        .where(job_table.id == next_job)
+        .values(
+            status="running",
+            attempts=job_table.attempts + 1,
+            days_done=0,
+            updated_at=func.now(),
+        )
+        .returning(job_table)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    job = result.scalar_one_or_none()
+    await session.commit()
+    return job
+
+
+def _owned_by(job: TripGenerationJob) -> ColumnElement[bool]:
+    """
+    Whether the row is still the running attempt `job` was claimed as.
+    A job reclaimed by another worker has a higher attempts count.
+    """
+    return and_(
+        TripGenerationJob.id == job.id,
+        TripGenerationJob.attempts == job.attempts,
+        TripGenerationJob.status == "running",
+    )
+
+
+async def _update_job(job: TripGenerationJob, **values: Any) -> bool:
+    """
+    Update a job while this worker still owns it.
+
+    Returns:
+        False if the job was reclaimed or finished elsewhere
+    """
+    async with sessionmanager.session() as session:
+        result = await session.execute(
+            update(TripGenerationJob)
+            .where(_owned_by(job))
+            .values(updated_at=func.now(), **values)
+        )
+        await session.commit()
+    return result.rowcount > 0
+
+
+async def _heartbeat(job: TripGenerationJob) -> None:
+    """Keep a running job from looking stale while the model works on a day."""
+    while True:
+        await asyncio.sleep(settings.TRIP_JOB_HEARTBEAT_SECONDS)
+        try:
+            await _update_job(job)
+        except Exception:
+            logger.exception("Heartbeat of trip generation job %s failed", job.id)
+
+
+async def run_trip_generation_job(job: TripGenerationJob) -> None:
+    """
+    Generate and save the trip of a claimed job.
+
+    Database connections are only held to read the candidate places, to
+    record progress and to save the result, never while the model runs.
+    Every write is conditional on this attempt still owning the job, so a
+    worker whose job was reclaimed can't save a second trip.
+    """
+    if job.attempts > settings.TRIP_JOB_MAX_ATTEMPTS:
+        await _update_job(
+            job,
+            status="failed",
+            error=f"Gave up after {settings.TRIP_JOB_MAX_ATTEMPTS} attempts",
+            finished_at=func.now(),
+        )
+        return
+
+    request = TripGenerateRequest.model_validate(job.request)
+    heartbeat = asyncio.create_task(_heartbeat(job))
+    try:
+        async with sessionmanager.session() as session:
+            prompt, place_ids, draft = await build_trip_prompt(session, request)
+
+        plan = None
+        days_done = 0
+        async for item in stream_trip_plan(request, prompt, place_ids, draft):
+            if isinstance(item, TripDayPlan):
+                days_done += 1
+                await _update_job(job, days_done=days_done)
+            else:
+                plan = item
+
+        # The trip and the job's success commit together, so a crash in
+        # between can't have the job retried and the trip saved twice
+        async with sessionmanager.session() as session:
+            trip = await add_trip(session, job.user_id, plan)
+            result = await session.execute(
+                update(TripGenerationJob)
+                .where(_owned_by(job))
+                .values(
+                    status="succeeded",
+                    trip_id=trip.id,
+                    updated_at=func.now(),
+                    finished_at=func.now(),
+                )
+            )
+            if result.rowcount == 0:
+                await session.rollback()
+                logger.warning(
+                    "Trip generation job %s was reclaimed; dropping attempt %s",
+                    job.id,
+                    job.attempts,
+                )
+                return
+            await session.commit()
+    except asyncio.CancelledError:
+        # Shutting down: hand the job back to the queue for the next worker
+        with contextlib.suppress(Exception):
+            await asyncio.shield(_update_job(job, status="queued"))
+        raise
+    except Exception as e:
+        if isinstance(e, ValueError):
+            error = str(e)
+        else:
+            logger.exception("Trip generation job %s failed", job.id)
+            error = f"AI generation failed: {str(e)}"
+        await _update_job(job, status="failed", error=error, finished_at=func.now())
+    finally:
+        heartbeat.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await heartbeat
+
+
+async def run_trip_generation_workers(workers: int, poll_interval: float) -> None:
+    """Run `workers` concurrent job loops, polling every `poll_interval` seconds."""
+
+    async def worker() -> None:
+        while True:
+            job = None
+            try:
+                async with sessionmanager.session() as session:
+                    job = await claim_trip_generation_job(session)
+            except Exception:
+                logger.exception("Claiming a trip generation job failed")
+            if job is None:
+                _wakeup.clear()
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(_wakeup.wait(), poll_interval)
+                continue
+            try:
+                await run_trip_generation_job(job)
+            except Exception:
+                # Keep the loop alive; a stale running job is claimed again
+                logger.exception("Trip generation job %s failed", job.id)
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
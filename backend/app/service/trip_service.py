@@ -1,12 +1,14 @@
 """Trip and itinerary CRUD operations."""
 
 import uuid
+from datetime import date
 
-from sqlalchemy import func, select, delete
+from geoalchemy2 import Geometry
+from sqlalchemy import cast, delete, func, literal_column, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, with_polymorphic
 
-from app.models import Place, Tag, Trip, TripStop, Hotel, Restaurant, Cafe, Landmark
+from app.models import Place, Trip, TripStop, Hotel, Restaurant, Cafe, Landmark
 from app.schemas import (
     TripCreate,
     TripListSchema,
@@ -17,7 +19,12 @@ from app.schemas import (
     TripStopWithPlace,
     TripUpdate,
 )
+from app.service.pagination import CountMode, count_total, paginate, split_page
 from app.service.place_service import _enrich_place_public
+from app.service.route_service import optimize_order
+from app.service.stats_service import bump_profile_stats
+from app.service.tag_service import resolve_tags
+from app.service.utils import ensure_rows_exist, sync_child_rows
 
 
 async def _load_trip_detail(session: AsyncSession, trip: Trip) -> TripSchema:
@@ -40,12 +47,13 @@ async def _load_trip_detail(session: AsyncSession, trip: Trip) -> TripSchema:
         raise ValueError("Trip not found")
 
     stops = []
-    for stop in sorted(trip_obj.stops, key=lambda s: s.stop_order or 0):
+    ordered = sorted(trip_obj.stops, key=lambda s: (s.stop_order or 0, s.id))
+    for position, stop in enumerate(ordered, start=1):
         stops.append(
             TripStopWithPlace(
                 id=stop.id,
                 trip_id=stop.trip_id,
-                stop_order=stop.stop_order,
+                stop_order=position,
                 arrival_time=stop.arrival_time,
                 notes=stop.notes,
                 place=_enrich_place_public(stop.place) if stop.place else None,
@@ -63,34 +71,66 @@ async def _load_trip_detail(session: AsyncSession, trip: Trip) -> TripSchema:
     )
 
 
+# Trips without a start date sort last; the sentinel keeps keyset cursors
+# comparable and matches the expression indexes on trips
+TRIP_START_SORT_KEY = func.coalesce(
+    Trip.start_date, literal_column("DATE '9999-12-31'")
+)
+TRIP_SORT_KEYS = [(TRIP_START_SORT_KEY, False), (Trip.id, False)]
+
+# TripStop.stop_order is a sparse sort key: stops are written STOP_ORDER_GAP
+# apart so inserting or moving one only rewrites that stop. The 1-based
+# positions exposed by the API are derived from the key order (id breaks ties).
+STOP_ORDER_GAP = 1024
+STOP_SORT = (TripStop.stop_order, TripStop.id)
+
+
+def _stop_keys(stops_data: list[TripStopCreate]) -> list[int]:
+    """Sparse keys for a full list of stops, in their requested order."""
+    requested = sorted(
+        (stop.stop_order if stop.stop_order is not None else i + 1, i)
+        for i, stop in enumerate(stops_data)
+    )
+    keys = [0] * len(stops_data)
+    for rank, (_, i) in enumerate(requested, start=1):
+        keys[i] = rank * STOP_ORDER_GAP
+    return keys
+
+
+def _trip_cursor_values(row) -> tuple:
+    trip = row[0]
+    return (trip.start_date or date.max, trip.id)
+
+
 async def list_trips(
     session: AsyncSession,
     user_id: uuid.UUID,
     page: int,
     limit: int,
     public_only: bool = False,
-) -> tuple[list[TripListSchema], int]:
-    """List all trips for a user with pagination."""
+    cursor: str | None = None,
+    count_mode: CountMode = "exact",
+) -> tuple[list[TripListSchema], int | None, str | None]:
+    """
+    List all trips for a user with pagination, by start date.
+    Returns the page, total count and the cursor of the next page.
+    """
     base_query = select(Trip.id).where(Trip.user_id == user_id)
     if public_only:
         base_query = base_query.where(Trip.public)
-    total_res = await session.execute(
-        select(func.count()).select_from(base_query.subquery())
-    )
-    total = int(total_res.scalar() or 0)
+    total = await count_total(session, base_query, count_mode)
 
     stmt = (
         select(Trip, func.count(TripStop.id).label("stop_count"))
         .outerjoin(TripStop, Trip.id == TripStop.trip_id)
         .where(Trip.user_id == user_id)
         .group_by(Trip.id)
-        .order_by(Trip.start_date.asc())
-        .offset((page - 1) * limit)
-        .limit(limit)
     )
     if public_only:
         stmt = stmt.where(Trip.public)
+    stmt = paginate(stmt, TRIP_SORT_KEYS, page, limit, cursor)
     res = await session.execute(stmt)
+    rows, next_cursor = split_page(res.all(), limit, _trip_cursor_values)
     data = [
         TripListSchema(
             id=trip.id,
@@ -100,33 +140,34 @@ async def list_trips(
             public=trip.public,
             stop_count=int(stop_count or 0),
         )
-        for trip, stop_count in res.all()
+        for trip, stop_count in rows
     ]
-    return data, total
+    return data, total, next_cursor
 
 
 async def list_public_trips(
     session: AsyncSession,
     page: int,
     limit: int,
-) -> tuple[list[TripListSchema], int]:
-    """List all public trips with pagination (no authentication required)."""
+    cursor: str | None = None,
+    count_mode: CountMode = "exact",
+) -> tuple[list[TripListSchema], int | None, str | None]:
+    """
+    List all public trips with pagination (no authentication required).
+    Returns the page, total count and the cursor of the next page.
+    """
     base_query = select(Trip.id).where(Trip.public == True)
-    total_res = await session.execute(
-        select(func.count()).select_from(base_query.subquery())
-    )
-    total = int(total_res.scalar() or 0)
+    total = await count_total(session, base_query, count_mode)
 
     stmt = (
         select(Trip, func.count(TripStop.id).label("stop_count"))
         .outerjoin(TripStop, Trip.id == TripStop.trip_id)
         .where(Trip.public == True)
         .group_by(Trip.id)
-        .order_by(Trip.start_date.asc())
-        .offset((page - 1) * limit)
-        .limit(limit)
     )
+    stmt = paginate(stmt, TRIP_SORT_KEYS, page, limit, cursor)
     res = await session.execute(stmt)
+    rows, next_cursor = split_page(res.all(), limit, _trip_cursor_values)
     data = [
         TripListSchema(
             id=trip.id,
@@ -136,15 +177,18 @@ async def list_public_trips(
             public=trip.public,
             stop_count=int(stop_count or 0),
         )
-        for trip, stop_count in res.all()
+        for trip, stop_count in rows
     ]
-    return data, total
+    return data, total, next_cursor
 
 
-async def create_trip(
+async def add_trip(
     session: AsyncSession, user_id: uuid.UUID, data: TripCreate
-) -> TripSchema:
-    """Create a new trip for a user."""
+) -> Trip:
+    """
+    Add a new trip of a user, with its stops, tags and stats, to the session.
+    Does not commit.
+    """
     # Validate dates
     if data.start_date and data.end_date and data.end_date < data.start_date:
         raise ValueError("End date cannot be before start date")
@@ -160,40 +204,30 @@ async def create_trip(
     session.add(trip)
     await session.flush()
     if data.tags:
-        for tag_name in data.tags:
-            result = await session.execute(select(Tag).where(Tag.name == tag_name))
-            tag = result.scalars().first()
-            if not tag:
-                try:
-                    tag = Tag(name=tag_name)
-                    session.add(tag)
-                    await session.flush()
-                except Exception:
-                    # Tag may have been created by concurrent request
-                    await session.rollback()
-                    result = await session.execute(
-                        select(Tag).where(Tag.name == tag_name)
-                    )
-                    tag = result.scalars().first()
-                    if not tag:
-                        raise ValueError(f"Failed to create or find tag: {tag_name}")
-            trip.tags.append(tag)
+        trip.tags = await resolve_tags(session, data.tags)
 
     if data.stops:
-        for i, stop_data in enumerate(data.stops):
-            # If stop_order is not provided, use 1-based index
-            order = (
-                stop_data.stop_order if stop_data.stop_order is not None else (i + 1)
-            )
+        for stop_data, key in zip(data.stops, _stop_keys(data.stops)):
             trip_stop = TripStop(
                 trip_id=trip.id,
                 place_id=stop_data.place_id,
-                stop_order=order,
+                stop_order=key,
                 arrival_time=stop_data.arrival_time,
                 notes=stop_data.notes,
             )
             session.add(trip_stop)
 
+    await bump_profile_stats(
+        session, user_id, trips_count=1, public_trips_count=int(trip.public)
+    )
+    return trip
+
+
+async def create_trip(
+    session: AsyncSession, user_id: uuid.UUID, data: TripCreate
+) -> TripSchema:
+    """Create a new trip for a user."""
+    trip = await add_trip(session, user_id, data)
     await session.commit()
     await session.refresh(trip)
     return await _load_trip_detail(session, trip)
@@ -246,80 +280,126 @@ async def update_trip(
     if start_date and end_date and end_date < start_date:
         raise ValueError("End date cannot be before start date")
 
+    if upd.get("public") is not None and upd["public"] != trip.public:
+        await bump_profile_stats(
+            session, user_id, public_trips_count=1 if upd["public"] else -1
+        )
+
     for k, v in upd.items():
         setattr(trip, k, v)
 
     if tags is not None:
-        trip.tags.clear()
-        for tag_name in tags:
-            result = await session.execute(select(Tag).where(Tag.name == tag_name))
-            tag = result.scalars().first()
-            if not tag:
-                try:
-                    tag = Tag(name=tag_name)
-                    session.add(tag)
-                    await session.flush()
-                except Exception:
-                    # Tag may have been created by concurrent request
-                    await session.rollback()
-                    result = await session.execute(
-                        select(Tag).where(Tag.name == tag_name)
-                    )
-                    tag = result.scalars().first()
-                    if not tag:
-                        raise ValueError(f"Failed to create or find tag: {tag_name}")
-            trip.tags.append(tag)
-
-    # Handle stops updates
-    if stops_data is not None:
-        # Remove all existing stops using bulk delete to avoid prepared statement conflicts
-        await session.execute(delete(TripStop).where(TripStop.trip_id == trip_id))
-        await session.flush()
-
-        # Add new stops
-        for i, stop_data in enumerate(stops_data):
-            # Validate place exists
-            place = await session.get(Place, stop_data.place_id)
-            if not place:
-                raise ValueError(f"Place {stop_data.place_id} not found")
+        trip.tags = await resolve_tags(session, tags)
 
-            # If stop_order is not provided, use 1-based index
-            order = (
-                stop_data.stop_order if stop_data.stop_order is not None else (i + 1)
-            )
-            trip_stop = TripStop(
-                trip_id=trip.id,
-                place_id=stop_data.place_id,
-                stop_order=order,
-                arrival_time=stop_data.arrival_time,
-                notes=stop_data.notes,
-            )
-            session.add(trip_stop)
+    # Handle stops updates (only changed stops are written)
+    if stops_data is not None:
+        await ensure_rows_exist(
+            session, Place.id, [stop.place_id for stop in stops_data], "Place"
+        )
+        await sync_child_rows(
+            session,
+            TripStop.trip_id,
+            trip.id,
+            [
+                TripStop.place_id,
+                TripStop.stop_order,
+                TripStop.arrival_time,
+                TripStop.notes,
+            ],
+            [
+                (stop.place_id, key, stop.arrival_time, stop.notes)
+                for stop, key in zip(stops_data, _stop_keys(stops_data))
+            ],
+        )
+        session.expire(trip, ["stops"])
 
     await session.commit()
     await session.refresh(trip)
     return await _load_trip_detail(session, trip)
 
 
-async def _insert_stop_at_order(
-    session: AsyncSession, trip_id: uuid.UUID, desired_order: int
+async def _renumber_stops(
+    session: AsyncSession, trip_id: uuid.UUID, exclude_id: uuid.UUID | None = None
+) -> None:
+    """Respace the keys of a trip's stops (except `exclude_id`) in one UPDATE."""
+    ranked = select(
+        TripStop.id,
+        (func.row_number().over(order_by=STOP_SORT) * STOP_ORDER_GAP).label("key"),
+    ).where(TripStop.trip_id == trip_id)
+    if exclude_id is not None:
+        ranked = ranked.where(TripStop.id != exclude_id)
+    ranked = ranked.subquery()
+    await session.execute(
+        update(TripStop)
+        .where(TripStop.id == ranked.c.id)
+        .values(stop_order=ranked.c.key)
+        # Expire the new keys on stops already loaded in the session
+        .execution_options(synchronize_session="fetch")
+    )
+
+
+async def _key_for_position(
+    session: AsyncSession,
+    trip_id: uuid.UUID,
+    position: int | None,
+    exclude_id: uuid.UUID | None = None,
 ) -> int:
-    """Helper to shift existing stops to make room at desired order position.
+    """
+    Sort key that places a stop at 1-based `position` among the other stops
+    of the trip (`exclude_id` is the stop being moved), or last when
+    `position` is None or past the end.
 
-    Note: This operation has race condition risk. Consider using SELECT FOR UPDATE
-    or implementing optimistic locking if concurrent stop modifications are common.
+    The key is taken halfway between the neighbouring keys, so only the
+    placed stop is written. When the neighbours have no gap left the trip's
+    stops are renumbered first.
     """
-    # Load and update stops using ORM to maintain event tracking
-    result = await session.execute(
-        select(TripStop)
-        .where(TripStop.trip_id == trip_id, TripStop.stop_order >= desired_order)
-        .order_by(TripStop.stop_order.desc())  # Reverse order to avoid conflicts
+    others = select(TripStop.stop_order).where(TripStop.trip_id == trip_id)
+    if exclude_id is not None:
+        others = others.where(TripStop.id != exclude_id)
+
+    for _ in range(2):
+        if position is not None and position > 1:
+            result = await session.execute(
+                others.order_by(*STOP_SORT).offset(position - 2).limit(2)
+            )
+            neighbours = list(result.scalars().all())
+        elif position == 1:
+            first = await session.scalar(others.order_by(*STOP_SORT).limit(1))
+            neighbours = [None, first]
+        else:
+            neighbours = []
+
+        if not neighbours:
+            # Append (also when `position` is past the end)
+            last = await session.scalar(
+                others.with_only_columns(func.max(TripStop.stop_order))
+            )
+            return (last or 0) + STOP_ORDER_GAP
+
+        before = neighbours[0]
+        after = neighbours[1] if len(neighbours) > 1 else None
+        if after is None:
+            return (before or 0) + STOP_ORDER_GAP
+        if before is None:
+            return after - STOP_ORDER_GAP
+        if after - before > 1:
+            return before + (after - before) // 2
+        await _renumber_stops(session, trip_id, exclude_id)
+
+    raise RuntimeError("No room for the stop after renumbering")
+
+
+async def _stop_schema(session: AsyncSession, stop: TripStop) -> TripStopSchema:
+    """TripStopSchema of a stop, with its 1-based position as stop_order."""
+    position = await session.scalar(
+        select(func.count()).where(
+            TripStop.trip_id == stop.trip_id,
+            tuple_(*STOP_SORT) <= tuple_(stop.stop_order, stop.id),
+        )
     )
-    stops = result.scalars().all()
-    for stop in stops:
-        stop.stop_order += 1
-    await session.flush()  # Ensure changes are visible
-    return desired_order
+    schema = TripStopSchema.model_validate(stop)
+    schema.stop_order = int(position or 1)
+    return schema
 
 
 async def add_trip_stop(
@@ -339,13 +419,7 @@ async def add_trip_stop(
     if data.stop_order is not None and data.stop_order < 1:
         raise ValueError("Stop order must be a positive integer")
 
-    if data.stop_order is None:
-        current_max_res = await session.execute(
-            select(func.max(TripStop.stop_order)).where(TripStop.trip_id == trip_id)
-        )
-        next_order = (current_max_res.scalar() or 0) + 1
-    else:
-        next_order = await _insert_stop_at_order(session, trip_id, data.stop_order)
+    next_order = await _key_for_position(session, trip_id, data.stop_order)
 
     stop = TripStop(
         trip_id=trip_id,
@@ -357,7 +431,7 @@ async def add_trip_stop(
     session.add(stop)
     await session.commit()
     await session.refresh(stop)
-    return TripStopSchema.model_validate(stop)
+    return await _stop_schema(session, stop)
 
 
 async def update_trip_stop(
@@ -382,44 +456,17 @@ async def update_trip_stop(
     if new_order is not None and new_order < 1:
         raise ValueError("Stop order must be a positive integer")
 
-    if new_order is not None and new_order != stop.stop_order:
-        if new_order < stop.stop_order:
-            # Load and update stops using ORM
-            result = await session.execute(
-                select(TripStop)
-                .where(
-                    TripStop.trip_id == trip_id,
-                    TripStop.stop_order >= new_order,
-                    TripStop.stop_order < stop.stop_order,
-                )
-                .order_by(TripStop.stop_order.desc())
-            )
-            stops = result.scalars().all()
-            for s in stops:
-                s.stop_order += 1
-        else:
-            # Load and update stops using ORM
-            result = await session.execute(
-                select(TripStop)
-                .where(
-                    TripStop.trip_id == trip_id,
-                    TripStop.stop_order <= new_order,
-                    TripStop.stop_order > stop.stop_order,
-                )
-                .order_by(TripStop.stop_order.asc())
-            )
-            stops = result.scalars().all()
-            for s in stops:
-                s.stop_order -= 1
-        await session.flush()  # Ensure order changes are visible
-        stop.stop_order = new_order
+    if new_order is not None:
+        stop.stop_order = await _key_for_position(
+            session, trip_id, new_order, exclude_id=stop.id
+        )
 
     for k, v in upd.items():
         setattr(stop, k, v)
 
     await session.commit()
     await session.refresh(stop)
-    return TripStopSchema.model_validate(stop)
+    return await _stop_schema(session, stop)
 
 
 async def remove_trip_stop(
@@ -432,19 +479,72 @@ async def remove_trip_stop(
     trip = await session.get(Trip, stop.trip_id)
     if not trip or trip.user_id != user_id or trip.id != trip_id:
         raise PermissionError("Not authorized to modify this trip")
-    removed_order = stop.stop_order
+    # Positions are derived from the key order, so nothing else moves
     await session.delete(stop)
-    await session.flush()
-    # Reorder remaining stops using ORM
+    await session.commit()
+
+
+# Meals and nights keep their place in the day when a route is optimized
+ROUTE_FIXED_PLACE_TYPES = ("hotel", "restaurant")
+
+
+async def optimize_trip_route(
+    session: AsyncSession, user_id: uuid.UUID, trip_id: uuid.UUID
+) -> TripSchema:
+    """
+    Reorder each day's stops for the shortest travel distance.
+
+    Days are runs of stops with the same arrival date (stops without an
+    arrival time belong to the day before them). Hotels, restaurants and
+    stops without a location stay where they are; the others are reordered
+    between them. Arrival times belong to positions, not places, so the
+    day's schedule keeps its times and only the places filling them move.
+    """
+    trip = await session.get(Trip, trip_id)
+    if not trip:
+        raise ValueError("Trip not found")
+    if trip.user_id != user_id:
+        raise PermissionError("Not authorized to modify this trip")
+
+    location = cast(Place.location, Geometry(srid=4326))
     result = await session.execute(
-        select(TripStop)
-        .where(TripStop.trip_id == trip_id, TripStop.stop_order > removed_order)
-        .order_by(TripStop.stop_order.asc())
+        select(
+            TripStop,
+            Place.place_type,
+            func.ST_Y(location).label("lat"),
+            func.ST_X(location).label("lng"),
+        )
+        .join(Place, TripStop.place_id == Place.id)
+        .where(TripStop.trip_id == trip_id)
+        .order_by(*STOP_SORT)
     )
-    stops = result.scalars().all()
-    for s in stops:
-        s.stop_order -= 1
+    days: list[list] = []
+    day_date = None
+    for row in result.all():
+        arrival = row.TripStop.arrival_time
+        if not days or (arrival is not None and arrival.date() != day_date):
+            days.append([])
+            day_date = arrival.date() if arrival is not None else day_date
+        days[-1].append(row)
+
+    position = 0
+    for day in days:
+        times = [row.TripStop.arrival_time for row in day]
+        order = optimize_order(
+            [row.lat for row in day],
+            [row.lng for row in day],
+            [row.place_type in ROUTE_FIXED_PLACE_TYPES for row in day],
+        )
+        for arrival, i in zip(times, order):
+            position += 1
+            stop = day[i].TripStop
+            # The session only writes stops whose key or time changed
+            stop.stop_order = position * STOP_ORDER_GAP
+            stop.arrival_time = arrival
+
     await session.commit()
+    await session.refresh(trip)
+    return await _load_trip_detail(session, trip)
 
 
 async def delete_trip(
@@ -464,6 +564,9 @@ async def delete_trip(
 
         # Then delete the trip
         await session.delete(trip)
+        await bump_profile_stats(
+            session, user_id, trips_count=-1, public_trips_count=-int(trip.public)
+        )
         await session.commit()
     except Exception as e:
         await session.rollback()
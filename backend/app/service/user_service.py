@@ -1,8 +1,9 @@
+import asyncio
 import uuid
 from datetime import datetime
 from typing import Sequence
 
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -13,9 +14,9 @@ from app.models import (
     ModerationTarget,
     PostReply,
     Profile,
+    ProfileStats,
     Review,
     ReviewImage,
-    Trip,
     auth_users,
 )
 from app.schemas import (
@@ -25,13 +26,20 @@ from app.schemas import (
     UserDetail,
     UserPhotoResponse,
     UserPostResponse,
+    UserProfilePage,
+    UserProfileTab,
     UserPublic,
     UserReplyResponse,
     UserReviewResponse,
-    UserStats,
     UserUpdate,
 )
-from app.service.utils import is_user_banned
+from app.service import trip_service
+from app.service.pagination import CountMode, count_total, paginate, split_page
+from app.service.stats_service import get_profile_stats, to_user_stats
+from app.service.utils import in_own_session, is_user_banned
+
+# Items per tab on the aggregated profile page
+PROFILE_TAB_SIZE = 10
 
 
 async def _get_profile(
@@ -56,7 +64,12 @@ async def _get_ban_reason(
     user_id: uuid.UUID,
 ) -> str | None:
     """Get the most recent ban reason from moderation targets."""
-    stmt = (
+    result = await session.execute(_ban_reason_query(user_id))
+    return result.scalar_one_or_none()
+
+
+def _ban_reason_query(user_id: uuid.UUID):
+    return (
         select(ModerationTarget.reason)
         .where(
             ModerationTarget.target_type == "profile",
@@ -66,22 +79,13 @@ async def _get_ban_reason(
         .order_by(ModerationTarget.created_at.desc())
         .limit(1)
     )
-    result = await session.execute(stmt)
-    return result.scalar_one_or_none()
 
 
-async def get_user_public(
+async def _to_user_public(
     session: AsyncSession,
-    user_id: uuid.UUID,
-) -> UserPublic | None:
-    """
-    Get public user profile by ID.
-    """
-    profile = await _get_profile(session, user_id)
-
-    if not profile:
-        return None
-
+    profile: Profile,
+    profile_stats: ProfileStats | None,
+) -> UserPublic:
     # Check if user is banned
     if is_user_banned(profile):
         return UserPublic(
@@ -91,48 +95,13 @@ async def get_user_public(
             id=profile.id,
             role=profile.role,
             is_verified_business=False,
-            stats=UserStats(
-                reviews_count=0,
-                posts_count=0,
-                photos_count=0,
-                public_trips_count=0,
-                replies_count=0,
-            ),
+            stats=to_user_stats(None),
             created_at=profile.updated_at,
         )
 
-    # Get statistics
-    reviews_count = await session.scalar(
-        select(func.count(Review.id)).where(Review.user_id == user_id)
-    )
-    posts_count = await session.scalar(
-        select(func.count(ForumPost.id)).where(ForumPost.author_id == user_id)
-    )
-
-    # Photos count from reviews
-    photos_from_reviews = await session.scalar(
-        select(func.count(ReviewImage.id)).join(Review).where(Review.user_id == user_id)
-    )
-
-    photos_count = photos_from_reviews or 0
-
-    # Public trips count
-    public_trips_count = await session.scalar(
-        select(func.count(Trip.id)).where(Trip.user_id == user_id)
-    )
-
-    # Replies count
-    replies_count = await session.scalar(
-        select(func.count(PostReply.id)).where(PostReply.user_id == user_id)
-    )
-
-    stats = UserStats(
-        reviews_count=reviews_count or 0,
-        posts_count=posts_count or 0,
-        photos_count=photos_count,
-        public_trips_count=public_trips_count or 0,
-        replies_count=replies_count or 0,
-    )
+    if profile_stats is None:
+        profile_stats = await get_profile_stats(session, profile.id)
+    stats = to_user_stats(profile_stats)
 
     return UserPublic(
         username=profile.username or "",
@@ -146,38 +115,98 @@ async def get_user_public(
     )
 
 
+async def get_user_public(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+) -> UserPublic | None:
+    """
+    Get public user profile by ID.
+    Profile and activity counters are read together in a single query.
+    """
+    result = await session.execute(
+        select(Profile, ProfileStats)
+        .outerjoin(ProfileStats, ProfileStats.profile_id == Profile.id)
+        .where(Profile.id == user_id)
+    )
+    row = result.first()
+
+    if not row:
+        return None
+
+    profile, profile_stats = row
+    return await _to_user_public(session, profile, profile_stats)
+
+
 async def get_user_detail(
     session: AsyncSession,
     user_id: uuid.UUID,
 ) -> UserDetail | None:
     """
     Get detail user profile by ID.
+    Profile, counters, email and the latest ban reason come from one query.
     """
-    user_public = await get_user_public(session, user_id)
+    result = await session.execute(
+        select(
+            Profile,
+            ProfileStats,
+            auth_users.c.email,
+            _ban_reason_query(user_id).scalar_subquery(),
+        )
+        .outerjoin(ProfileStats, ProfileStats.profile_id == Profile.id)
+        .outerjoin(auth_users, auth_users.c.id == Profile.id)
+        .where(Profile.id == user_id)
+    )
+    row = result.first()
 
-    if not user_public:
+    if not row:
         return None
 
-    email = await _get_email(session, user_id)
-    profile = await _get_profile(session, user_id)
-    ban_reason = (
-        await _get_ban_reason(session, user_id)
-        if profile and profile.ban_until
-        else None
-    )
+    profile, profile_stats, email, ban_reason = row
+    user_public = await _to_user_public(session, profile, profile_stats)
 
     return UserDetail(
-        username=user_public.username,
-        full_name=user_public.full_name,
-        avatar_url=user_public.avatar_url,
-        id=user_public.id,
-        role=user_public.role,
-        is_verified_business=user_public.is_verified_business,
-        stats=user_public.stats,
-        created_at=user_public.created_at,
+        **user_public.model_dump(),
         email=email,
-        ban_until=profile.ban_until if profile else None,
-        ban_reason=ban_reason,
+        ban_until=profile.ban_until,
+        ban_reason=ban_reason if profile.ban_until else None,
+    )
+
+
+async def get_user_profile_page(
+    user_id: uuid.UUID,
+    limit: int = PROFILE_TAB_SIZE,
+) -> UserProfilePage | None:
+    """
+    Get a public profile with its stats and the first page of every tab.
+
+    The profile and the five tabs don't depend on each other, so each is
+    loaded on a separate session and they run at the same time. Tabs skip
+    counting; their totals are already in the profile stats.
+    """
+    tab = {"page": 1, "limit": limit, "count_mode": "none"}
+    user_public, reviews, posts, replies, photos, trips = await asyncio.gather(
+        in_own_session(get_user_public, user_id),
+        in_own_session(get_user_reviews, user_id, **tab),
+        in_own_session(get_user_posts, user_id, **tab),
+        in_own_session(get_user_replies, user_id, **tab),
+        in_own_session(get_user_photos, user_id, **tab),
+        in_own_session(trip_service.list_trips, user_id, public_only=True, **tab),
+    )
+
+    if not user_public:
+        return None
+
+    def to_tab(page):
+        items, _, next_cursor = page
+        return UserProfileTab(items=items, next_cursor=next_cursor)
+
+    return UserProfilePage(
+        profile=user_public,
+        reviews=to_tab(reviews),
+        posts=to_tab(posts),
+        replies=to_tab(replies),
+        photos=to_tab(photos),
+        trips=to_tab(trips),
     )
 
 
@@ -199,6 +228,7 @@ async def create_user(
     )
 
     session.add(profile)
+    session.add(ProfileStats(profile_id=user_id))
 
     try:
         await session.commit()
@@ -222,13 +252,7 @@ async def create_user(
     email = await _get_email(session, user_id)
 
     # Get statistics for new user
-    stats = UserStats(
-        reviews_count=0,
-        posts_count=0,
-        photos_count=0,
-        public_trips_count=0,
-        replies_count=0,
-    )
+    stats = to_user_stats(None)
 
     return UserDetail(
         id=profile.id,
@@ -272,38 +296,7 @@ async def update_user(
 
     email = await _get_email(session, user_id)
 
-    # Get statistics
-    reviews_count = await session.scalar(
-        select(func.count(Review.id)).where(Review.user_id == user_id)
-    )
-    posts_count = await session.scalar(
-        select(func.count(ForumPost.id)).where(ForumPost.author_id == user_id)
-    )
-
-    # Photos count from reviews
-    photos_from_reviews = await session.scalar(
-        select(func.count(ReviewImage.id)).join(Review).where(Review.user_id == user_id)
-    )
-
-    photos_count = photos_from_reviews or 0
-
-    # Public trips count
-    public_trips_count = await session.scalar(
-        select(func.count(Trip.id)).where(Trip.user_id == user_id)
-    )
-
-    # Replies count
-    replies_count = await session.scalar(
-        select(func.count(PostReply.id)).where(PostReply.user_id == user_id)
-    )
-
-    stats = UserStats(
-        reviews_count=reviews_count or 0,
-        posts_count=posts_count or 0,
-        photos_count=photos_count,
-        public_trips_count=public_trips_count or 0,
-        replies_count=replies_count or 0,
-    )
+    stats = to_user_stats(await get_profile_stats(session, user_id))
 
     ban_reason = await _get_ban_reason(session, user_id) if profile.ban_until else None
 
@@ -327,16 +320,17 @@ async def get_user_reviews(
     user_id: uuid.UUID,
     page: int = 1,
     limit: int = 20,
-) -> tuple[Sequence[UserReviewResponse], int]:
+    cursor: str | None = None,
+    count_mode: CountMode = "exact",
+) -> tuple[Sequence[UserReviewResponse], int | None, str | None]:
     """
     Get list of reviews written by a specific user.
     """
     # Get total count
-    count_stmt = select(func.count(Review.id)).where(Review.user_id == user_id)
-    total = await session.scalar(count_stmt) or 0
+    count_source = select(Review.id).where(Review.user_id == user_id)
+    total = await count_total(session, count_source, count_mode)
 
     # Get paginated results
-    offset = (page - 1) * limit
     stmt = (
         select(Review)
         .options(
@@ -344,12 +338,14 @@ async def get_user_reviews(
             selectinload(Review.images),
         )
         .where(Review.user_id == user_id)
-        .order_by(Review.created_at.desc())
-        .offset(offset)
-        .limit(limit)
+    )
+    stmt = paginate(
+        stmt, [(Review.created_at, True), (Review.id, True)], page, limit, cursor
     )
     result = await session.execute(stmt)
-    reviews = result.scalars().all()
+    reviews, next_cursor = split_page(
+        result.scalars().all(), limit, lambda r: (r.created_at, r.id)
+    )
 
     return (
         [
@@ -373,6 +369,7 @@ async def get_user_reviews(
             for review in reviews
         ],
         total,
+        next_cursor,
     )
 
 
@@ -381,26 +378,29 @@ async def get_user_posts(
     user_id: uuid.UUID,
     page: int = 1,
     limit: int = 20,
-) -> tuple[Sequence[UserPostResponse], int]:
+    cursor: str | None = None,
+    count_mode: CountMode = "exact",
+) -> tuple[Sequence[UserPostResponse], int | None, str | None]:
     """
     Get list of forum threads created by a specific user.
     """
     # Get total count
-    count_stmt = select(func.count(ForumPost.id)).where(ForumPost.author_id == user_id)
-    total = await session.scalar(count_stmt) or 0
+    count_source = select(ForumPost.id).where(ForumPost.author_id == user_id)
+    total = await count_total(session, count_source, count_mode)
 
     # Get paginated results
-    offset = (page - 1) * limit
-    stmt = (
-        select(ForumPost)
-        .options(selectinload(ForumPost.replies))
-        .where(ForumPost.author_id == user_id)
-        .order_by(ForumPost.created_at.desc())
-        .offset(offset)
-        .limit(limit)
+    stmt = select(ForumPost).where(ForumPost.author_id == user_id)
+    stmt = paginate(
+        stmt,
+        [(ForumPost.created_at, True), (ForumPost.id, True)],
+        page,
+        limit,
+        cursor,
     )
     result = await session.execute(stmt)
-    posts = result.scalars().all()
+    posts, next_cursor = split_page(
+        result.scalars().all(), limit, lambda p: (p.created_at, p.id)
+    )
 
     return (
         [
@@ -410,12 +410,13 @@ async def get_user_posts(
                 content_snippet=post.content[:150] + "..."
                 if len(post.content) > 150
                 else post.content,
-                reply_count=len(post.replies),
+                reply_count=post.reply_count,
                 created_at=post.created_at,
             )
             for post in posts
         ],
         total,
+        next_cursor,
     )
 
 
@@ -424,28 +425,29 @@ async def get_user_photos(
     user_id: uuid.UUID,
     page: int = 1,
     limit: int = 20,
-) -> tuple[Sequence[UserPhotoResponse], int]:
+    cursor: str | None = None,
+    count_mode: CountMode = "exact",
+) -> tuple[Sequence[UserPhotoResponse], int | None, str | None]:
     """
     Get gallery of photos uploaded by the user.
     """
     # Get total count
-    count_stmt = (
-        select(func.count(ReviewImage.id)).join(Review).where(Review.user_id == user_id)
-    )
-    total = await session.scalar(count_stmt) or 0
+    count_source = select(ReviewImage.id).join(Review).where(Review.user_id == user_id)
+    total = await count_total(session, count_source, count_mode)
 
     # Get paginated results
-    offset = (page - 1) * limit
-    stmt = (
-        select(ReviewImage)
-        .join(Review)
-        .where(Review.user_id == user_id)
-        .order_by(ReviewImage.created_at.desc())
-        .offset(offset)
-        .limit(limit)
+    stmt = select(ReviewImage).join(Review).where(Review.user_id == user_id)
+    stmt = paginate(
+        stmt,
+        [(ReviewImage.created_at, True), (ReviewImage.id, True)],
+        page,
+        limit,
+        cursor,
     )
     result = await session.execute(stmt)
-    review_images = result.scalars().all()
+    review_images, next_cursor = split_page(
+        result.scalars().all(), limit, lambda img: (img.created_at, img.id)
+    )
 
     photos = [
         UserPhotoResponse(
@@ -457,7 +459,7 @@ async def get_user_photos(
         for img in review_images
     ]
 
-    return photos, total
+    return photos, total, next_cursor
 
 
 async def has_pending_verification_request(
@@ -532,26 +534,33 @@ async def get_user_replies(
     user_id: uuid.UUID,
     page: int = 1,
     limit: int = 20,
-) -> tuple[Sequence[UserReplyResponse], int]:
+    cursor: str | None = None,
+    count_mode: CountMode = "exact",
+) -> tuple[Sequence[UserReplyResponse], int | None, str | None]:
     """
     Get list of forum replies created by a specific user.
     """
     # Get total count
-    count_stmt = select(func.count(PostReply.id)).where(PostReply.user_id == user_id)
-    total = await session.scalar(count_stmt) or 0
+    count_source = select(PostReply.id).where(PostReply.user_id == user_id)
+    total = await count_total(session, count_source, count_mode)
 
     # Get paginated results
-    offset = (page - 1) * limit
     stmt = (
         select(PostReply)
         .options(selectinload(PostReply.post))
         .where(PostReply.user_id == user_id)
-        .order_by(PostReply.created_at.desc())
-        .offset(offset)
-        .limit(limit)
+    )
+    stmt = paginate(
+        stmt,
+        [(PostReply.created_at, True), (PostReply.id, True)],
+        page,
+        limit,
+        cursor,
     )
     result = await session.execute(stmt)
-    replies = result.scalars().all()
+    replies, next_cursor = split_page(
+        result.scalars().all(), limit, lambda r: (r.created_at, r.id)
+    )
 
     return (
         [
@@ -565,4 +574,5 @@ async def get_user_replies(
             for reply in replies
         ],
         total,
+        next_cursor,
     )
@@ -1,12 +1,113 @@
 """Utility functions for service layer."""
 
+import uuid
+from collections import Counter
+from collections.abc import Iterable, Sequence
 from datetime import datetime
+from typing import Any, Awaitable, Callable, TypeVar
 
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.core.db import sessionmanager
 from app.models import Profile
 
+T = TypeVar("T")
+
 
 def is_user_banned(profile: Profile) -> bool:
     """Check if user is currently banned based on ban_until timestamp."""
     if profile.ban_until is None:
         return False
     return datetime.now(profile.ban_until.tzinfo) < profile.ban_until
+
+
+async def ensure_rows_exist(
+    session: AsyncSession,
+    id_column: InstrumentedAttribute,
+    ids: Iterable[uuid.UUID],
+    label: str,
+) -> None:
+    """
+    Check that every id in `ids` has a row, using one IN query.
+
+    Raises:
+        ValueError: "<label> <id> not found" for the first missing id.
+    """
+    wanted = list(dict.fromkeys(ids))
+    if not wanted:
+        return
+    result = await session.execute(select(id_column).where(id_column.in_(wanted)))
+    found = set(result.scalars().all())
+    for id_ in wanted:
+        if id_ not in found:
+            raise ValueError(f"{label} {id_} not found")
+
+
+async def sync_child_rows(
+    session: AsyncSession,
+    parent_column: InstrumentedAttribute,
+    parent_id: uuid.UUID,
+    columns: Sequence[InstrumentedAttribute],
+    rows: Sequence[tuple[Any, ...]],
+) -> tuple[int, int]:
+    """
+    Make the child rows of `parent_id` match `rows`, given as values of
+    `columns`, writing only the difference.
+
+    Existing rows are compared as a multiset: rows that are already present
+    are kept as they are, surplus rows are removed with one DELETE and missing
+    rows are added with one bulk INSERT. Relationship collections already
+    loaded on the parent are not updated; expire them before reuse.
+
+    Returns:
+        Tuple of (rows inserted, rows deleted)
+    """
+    model = parent_column.class_
+    primary_key = [getattr(model, c.key) for c in model.__mapper__.primary_key]
+    result = await session.execute(
+        select(*primary_key, *columns).where(parent_column == parent_id)
+    )
+
+    wanted = Counter(tuple(row) for row in rows)
+    # Row slices compare and hash like plain tuples
+    surplus = []
+    for existing in result.all():
+        key, values = existing[: len(primary_key)], existing[len(primary_key) :]
+        if wanted[values] > 0:
+            wanted[values] -= 1
+        else:
+            surplus.append(key)
+
+    if surplus:
+        if len(primary_key) == 1:
+            condition = primary_key[0].in_([key[0] for key in surplus])
+        else:
+            condition = tuple_(*primary_key).in_([tuple(key) for key in surplus])
+        await session.execute(delete(model).where(condition))
+
+    missing = [
+        {
+            parent_column.key: parent_id,
+            **{column.key: value for column, value in zip(columns, values)},
+        }
+        for values, count in wanted.items()
+        for _ in range(count)
+    ]
+    if missing:
+        await session.execute(insert(model), missing)
+    return len(missing), len(surplus)
+
+
+async def in_own_session(
+    load: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any
+) -> T:
+    """
+    Run `load(session, *args, **kwargs)` on a session of its own.
+
+    Independent loads wrapped this way can be awaited together with
+    asyncio.gather, each on its own pooled connection.
+    """
+    async with sessionmanager.session() as session:
+        return await load(session, *args, **kwargs)
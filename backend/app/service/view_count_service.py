@@ -0,0 +1,116 @@
+"""Write-behind buffering of forum post view counts."""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import Counter
+
+from sqlalchemy import Integer, Uuid, column, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.db import sessionmanager
+from app.models import ForumPost
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on remembered (post, viewer) pairs before old entries are pruned
+MAX_TRACKED_VIEWERS = 100_000
+
+
+class ViewCountBuffer:
+    """
+    Per-worker buffer of post view increments.
+
+    Reading a post only records the view in memory; increments are summed
+    per post and written in one batched UPDATE by `flush`. Repeat views of
+    the same post by the same viewer within `dedup_window` seconds are
+    counted once. Views buffered when a worker dies are lost, which is an
+    acceptable trade-off for a popularity counter.
+    """
+
+    def __init__(self, dedup_window: float = 0) -> None:
+        self.dedup_window = dedup_window
+        self._pending: Counter[uuid.UUID] = Counter()
+        self._seen: dict[tuple[uuid.UUID, str], float] = {}
+
+    def record(self, post_id: uuid.UUID, viewer_key: str | None = None) -> None:
+        """Buffer one view of a post, ignoring repeat views by the same viewer."""
+        if viewer_key is not None and self.dedup_window > 0:
+            now = time.monotonic()
+            key = (post_id, viewer_key)
+            expires_at = self._seen.get(key)
+            if expires_at is not None and expires_at > now:
+                return
+            if len(self._seen) >= MAX_TRACKED_VIEWERS:
+                self._prune_seen(now)
+            self._seen[key] = now + self.dedup_window
+        self._pending[post_id] += 1
+
+    def pending(self, post_id: uuid.UUID) -> int:
+        """Views of a post buffered but not yet written to the database."""
+        return self._pending.get(post_id, 0)
+
+    def _prune_seen(self, now: float) -> None:
+        self._seen = {k: exp for k, exp in self._seen.items() if exp > now}
+        if len(self._seen) >= MAX_TRACKED_VIEWERS:
+            # Still full of live entries: forget the oldest half
+            by_expiry = sorted(self._seen.items(), key=lambda item: item[1])
+            self._seen = dict(by_expiry[len(by_expiry) // 2 :])
+
+    async def flush(self, session: AsyncSession) -> int:
+        """
+        Write buffered increments in a single `UPDATE ... FROM (VALUES ...)`.
+
+        Increments are put back into the buffer if the write fails or is
+        cancelled.
+
+        Returns:
+            Number of posts updated.
+        """
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, Counter()
+
+        deltas = values(
+            column("id", Uuid),
+            column("delta", Integer),
+            name="view_deltas",
+        ).data(list(batch.items()))
+        stmt = (
+            update(ForumPost)
+            .where(ForumPost.id == deltas.c.id)
+            .values(view_count=ForumPost.view_count + deltas.c.delta)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            await session.execute(stmt)
+            await session.commit()
+        except BaseException:
+            # Also when cancelled at shutdown, so the final flush still has it
+            self._pending.update(batch)
+            await session.rollback()
+            raise
+        return len(batch)
+
+    async def run(self, interval: float) -> None:
+        """Flush the buffer every `interval` seconds until cancelled."""
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    async with sessionmanager.session() as session:
+                        await self.flush(session)
+                except Exception:
+                    logger.exception("Failed to flush forum view counts")
+        finally:
+            # Final flush on shutdown
+            if self._pending and sessionmanager.is_initialized():
+                async with sessionmanager.session() as session:
+                    await self.flush(session)
+
+
+view_counter = ViewCountBuffer(
+    dedup_window=settings.VIEW_COUNT_DEDUP_WINDOW_SECONDS,
+)
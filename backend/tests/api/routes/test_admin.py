@@ -0,0 +1,22 @@
+import pytest
+from app.api.routes import admin
+from app.core.db import sessionmanager
+from app.models import ProfileStats, Trip
+from fastapi import HTTPException
+
+
+async def test_reconcile_stats_route_is_admin_only(make_user):
+    async with sessionmanager.session() as session:
+        traveller = await make_user(session)
+        staff = await make_user(session, role="admin")
+        session.add(Trip(user_id=traveller.id, trip_name="Sapa", public=True))
+        await session.commit()
+
+        with pytest.raises(HTTPException) as denied:
+            await admin.reconcile_stats(session, traveller, None)
+        assert denied.value.status_code == 403
+
+        response = await admin.reconcile_stats(session, staff, traveller.id)
+        assert response.data.message == "Reconciled stats for 1 profile(s)"
+        stats = await session.get(ProfileStats, traveller.id, populate_existing=True)
+        assert (stats.trips_count, stats.public_trips_count) == (1, 1)
@@ -1,16 +1,36 @@
-from contextlib import ExitStack
+import uuid
+from contextlib import ExitStack, contextmanager
 
 import pytest
 from app.api.deps import get_db
 from app.core.db import sessionmanager
 from app.main import init_app
+from app.models import Profile, ProfileStats, auth_users
 from fastapi.testclient import TestClient
 from pytest_postgresql import factories
 from pytest_postgresql.janitor import DatabaseJanitor
+from sqlalchemy import Engine, event, insert
 
 test_db = factories.postgresql_proc(port=None, dbname="test_db")
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        help="also run the latency benchmarks (tests marked benchmark)",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-benchmarks"):
+        return
+    skip = pytest.mark.skip(reason="benchmark, use --run-benchmarks to run")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest.fixture(autouse=True)
 def app():
     with ExitStack():
@@ -59,3 +79,47 @@ async def session_override(app, connection_test):
             yield session
 
     app.dependency_overrides[get_db] = get_db_override
+
+
+@pytest.fixture
+def count_queries():
+    """Context manager collecting the SQL statements executed inside it."""
+
+    @contextmanager
+    def counter():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(Engine, "before_cursor_execute", before_cursor_execute)
+
+    return counter
+
+
+@pytest.fixture
+def make_user():
+    """
+    Async factory of users: an auth.users row, its Profile and, unless
+    `stats` is False, a ProfileStats row with `counters`. Flushes only.
+    """
+
+    async def make(
+        session, role: str = "traveler", stats: bool = True, **counters: int
+    ) -> Profile:
+        user_id = uuid.uuid4()
+        await session.execute(
+            insert(auth_users).values(id=user_id, email=f"{user_id.hex}@example.com")
+        )
+        profile = Profile(id=user_id, username=f"{role}-{user_id.hex[:8]}", role=role)
+        session.add(profile)
+        if stats:
+            session.add(ProfileStats(profile_id=user_id, **counters))
+        await session.flush()
+        return profile
+
+    return make
@@ -0,0 +1,82 @@
+import functools
+import sqlite3
+
+from app.service.ai_cache_service import MemoryAICache, SQLiteAICache, cache_key
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_key_ignores_case_and_whitespace():
+    prompt = "Create a 3-day trip for Hanoi.\n  [Hotels]\n- a: Sofitel"
+    same = "create a 3-day  trip for hanoi. [hotels] - a: sofitel"
+    assert cache_key("m", prompt) == cache_key("m", same)
+    assert cache_key("m", prompt) != cache_key("m", prompt + "\n- b: Metropole")
+    assert cache_key("m", prompt) != cache_key("other", prompt)
+
+
+async def test_memory_cache_expires_and_evicts_least_recently_used():
+    clock = Clock()
+    cache = MemoryAICache(ttl=60, max_entries=2, clock=clock)
+    await cache.set("a", "1")
+    await cache.set("b", "2")
+    assert await cache.get("a") == "1"
+    await cache.set("c", "3")
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == "1"
+    clock.now += 61
+    assert await cache.get("a") is None
+
+
+async def test_sqlite_cache_is_shared_through_the_file(tmp_path):
+    clock = Clock()
+    path = str(tmp_path / "ai_cache.sqlite3")
+    writer = SQLiteAICache(path, ttl=60, max_entries=2, clock=clock)
+    reader = SQLiteAICache(path, ttl=60, max_entries=2, clock=clock)
+
+    await writer.set("a", '{"trip_name": "Hanoi"}')
+    assert await reader.get("a") == '{"trip_name": "Hanoi"}'
+
+    clock.now += 1
+    await writer.set("b", "2")
+    clock.now += 1
+    await writer.set("c", "3")
+    assert await reader.get("a") is None
+    assert await reader.get("c") == "3"
+
+    clock.now += 61
+    assert await reader.get("c") is None
+
+
+
+
+async def test_sqlite_cache_closes_its_connections(tmp_path, monkeypatch):
+    opened = []
+
+    class TrackedConnection(sqlite3.Connection):
+        closed = False
+
+        def close(self):
+            self.closed = True
+            super().close()
+
+    connect_tracked = functools.partial(sqlite3.connect, factory=TrackedConnection)
+
+    def connect(*args, **kwargs):
+        connection = connect_tracked(*args, **kwargs)
+        opened.append(connection)
+        return connection
+
+    monkeypatch.setattr(sqlite3, "connect", connect)
+    cache = SQLiteAICache(str(tmp_path / "ai_cache.sqlite3"), ttl=60, max_entries=2)
+    await cache.set("a", "1")
+    assert await cache.get("a") == "1"
+
+    assert len(opened) == 3
+    assert all(connection.closed for connection in opened)
@@ -0,0 +1,220 @@
+import json
+import uuid
+from datetime import date, datetime, timezone
+
+from app.core.db import sessionmanager
+from app.models import (
+    Cafe,
+    Hotel,
+    Landmark,
+    Restaurant,
+    Review,
+    SavedList,
+    SavedListItem,
+    Trip,
+    TripStop,
+)
+from app.schemas import TripCreate, TripDayPlan, TripGenerateRequest, TripStopCreate
+from app.service import ai_service
+from app.service.ai_service import (
+    ItineraryDays,
+    build_trip_prompt,
+    build_user_context,
+    destination_city_key,
+    get_trip_candidates,
+    stream_trip_plan,
+)
+
+ARRIVAL = datetime(2026, 11, 1, 9, tzinfo=timezone.utc)
+
+
+async def test_user_context_is_aggregated_in_one_query(count_queries, make_user):
+    async with sessionmanager.session() as session:
+        user_id = (await make_user(session)).id
+        places = [
+            Restaurant(
+                name="Pho 10", city="Hanoi", cuisine_type="pho", price_range="$"
+            ),
+            Restaurant(
+                name="Bun Cha", city="Hanoi", cuisine_type="bun", price_range="$"
+            ),
+            Cafe(name="Egg Coffee", city="Hanoi", price_range="$$"),
+            Landmark(name="Dragon Bridge", city="Da Nang"),
+            Landmark(name="Ben Thanh", city="Ho Chi Minh City"),
+        ]
+        lists = [SavedList(user_id=user_id, name=name) for name in ("Eat", "Again")]
+        trip = Trip(user_id=user_id, trip_name="South")
+        session.add_all([*places, *lists, trip])
+        await session.flush()
+
+        # The first restaurant is saved twice but counts once
+        session.add_all(
+            SavedListItem(list_id=saved_list.id, place_id=place.id)
+            for saved_list, place in (
+                (lists[0], places[0]),
+                (lists[1], places[0]),
+                (lists[0], places[1]),
+                (lists[1], places[2]),
+            )
+        )
+        session.add_all(
+            TripStop(
+                trip_id=trip.id,
+                place_id=place.id,
+                stop_order=order,
+                arrival_time=ARRIVAL,
+            )
+            for place, order in ((places[4], 1024), (places[3], 2048))
+        )
+        session.add_all(
+            Review(user_id=user_id, place_id=places[0].id, rating=rating)
+            for rating in (4, 5)
+        )
+        await session.commit()
+
+        with count_queries() as statements:
+            context = await build_user_context(session, user_id)
+
+    assert len(statements) == 1
+    assert context.saved_count_per_category == {"restaurant": 2, "cafe": 1}
+    assert context.saved_categories == ["restaurant", "cafe"]
+    assert context.recent_activity_focus == "restaurant"
+    # Trips contribute the city of their first stop only
+    assert sorted(context.visited_cities) == ["Hanoi", "Ho Chi Minh City"]
+    assert context.price_preference == "$"
+    assert sorted(context.preferred_cuisines) == ["bun", "pho"]
+    assert context.avg_rating_given == 4.5
+
+
+async def test_user_context_without_history_is_empty():
+    async with sessionmanager.session() as session:
+        context = await build_user_context(session, uuid.uuid4())
+
+    assert context.saved_categories == []
+    assert context.visited_cities == []
+    assert context.price_preference is None
+    assert context.avg_rating_given is None
+
+
+async def test_trip_candidates_are_best_rated_per_type_in_city(count_queries):
+    async with sessionmanager.session() as session:
+        session.add_all(
+            [
+                *(
+                    Landmark(name=f"Lantern {i}", city="Hoi An", average_rating=i)
+                    for i in range(4)
+                ),
+                Hotel(name="Riverside", city="Hoi An", description="x" * 80),
+                Hotel(name="Citadel Inn", city="Hue", average_rating=5),
+            ]
+        )
+        await session.commit()
+
+        with count_queries() as statements:
+            candidates = await get_trip_candidates(
+                session,
+                destination_city_key("hoian, Vietnam"),
+                {"hotel": 5, "landmark": 2, "cafe": 3},
+            )
+
+    assert len(statements) == 1
+    assert [row.name for row in candidates["landmark"]] == ["Lantern 3", "Lantern 2"]
+    (hotel,) = candidates["hotel"]
+    assert hotel.name == "Riverside"
+    assert len(hotel.description) == 50
+    assert candidates["cafe"] == []
+
+
+async def test_country_destination_plans_across_the_country():
+    async with sessionmanager.session() as session:
+        hotel = Hotel(name="Valley Lodge", city="Da Lat", country="Vietnam")
+        landmark = Landmark(name="Crazy House", city="Da Lat", country="Vietnam")
+        session.add_all([hotel, landmark, Hotel(name="Wat Inn", country="Laos")])
+        await session.commit()
+
+        request = TripGenerateRequest(
+            destination="Vietnam",
+            start_date=date(2026, 11, 1),
+            end_date=date(2026, 11, 1),
+        )
+        _, place_ids, _ = await build_trip_prompt(session, request)
+
+    assert place_ids == {hotel.id, landmark.id}
+
+
+def test_itinerary_days_are_emitted_once_complete():
+    document = json.dumps(
+        {
+            "trip_name": "Hue",
+            "itinerary": [
+                {"day": 1, "activities": [{"place_id": "a", "notes": "x, ]}"}]},
+                {"day": 2, "activities": []},
+            ],
+        }
+    )
+    days = ItineraryDays()
+    emitted = []
+    for i in range(0, len(document), 7):
+        emitted.extend((day["day"], i + 7) for day in days.feed(document[i : i + 7]))
+
+    assert [day for day, _ in emitted] == [1, 2]
+    # Day 1 came out while the rest of the document was still missing
+    assert emitted[0][1] < len(document)
+    assert days.text == document
+
+
+async def test_stream_trip_plan_yields_days_then_plan(monkeypatch):
+    offered, invented = uuid.uuid4(), uuid.uuid4()
+    document = json.dumps(
+        {
+            "trip_name": "Hue in two days",
+            "itinerary": [
+                {
+                    "day": day,
+                    "activities": [
+                        {"place_id": str(offered), "time_of_day": "08:30"},
+                        {"place_id": str(invented), "time_of_day": "12:00"},
+                    ],
+                }
+                for day in (1, 2)
+            ],
+        }
+    )
+
+    async def chunks(client, prompt):
+        for i in range(0, len(document), 16):
+            yield document[i : i + 16]
+
+    monkeypatch.setattr(ai_service.settings, "GEMINI_API_KEY", "test")
+    monkeypatch.setattr(ai_service.gemini, "_client", object())
+    monkeypatch.setattr(ai_service, "ai_cache", None)
+    monkeypatch.setattr(ai_service, "_stream_text", chunks)
+
+    request = TripGenerateRequest(
+        destination="Hue", start_date=date(2026, 11, 1), end_date=date(2026, 11, 2)
+    )
+    items = [item async for item in stream_trip_plan(request, "prompt", {offered})]
+
+    *day_plans, plan = items
+    assert all(isinstance(item, TripDayPlan) for item in day_plans)
+    assert [item.day for item in day_plans] == [1, 2]
+    assert [len(item.stops) for item in day_plans] == [1, 1]
+    assert day_plans[1].stops[0].arrival_time == datetime(2026, 11, 2, 8, 30)
+    assert isinstance(plan, TripCreate)
+    assert plan.trip_name == "Hue in two days"
+    assert len(plan.stops) == 2
+
+
+async def test_stream_trip_plan_falls_back_to_local_draft(monkeypatch):
+    monkeypatch.setattr(ai_service.settings, "GEMINI_API_KEY", None)
+    request = TripGenerateRequest(
+        destination="Hue", start_date=date(2026, 11, 1), end_date=date(2026, 11, 1)
+    )
+    stop = TripStopCreate(place_id=uuid.uuid4(), arrival_time=ARRIVAL)
+    draft = [TripDayPlan(day=1, stops=[stop])]
+
+    items = [item async for item in stream_trip_plan(request, "prompt", set(), draft)]
+
+    assert items[0] == draft[0]
+    assert items[1].stops == [stop]
+    assert items[1].trip_name == "Trip to Hue"
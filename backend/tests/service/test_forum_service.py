@@ -0,0 +1,155 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.core.db import sessionmanager
+from app.models import ForumPost, PostLike, PostReply, ReplyLike
+from app.schemas import ForumSearchFilter
+from app.service.forum_service import (
+    REPLY_MAX_DEPTH,
+    REPLY_PAGE_SIZE,
+    get_forum_post,
+    list_forum_posts,
+    list_forum_replies,
+    toggle_forum_post_like,
+)
+from app.service.user_service import get_user_posts
+
+STARTED = datetime(2026, 10, 1, 12, tzinfo=timezone.utc)
+
+
+async def _seed_thread(session, user_id: uuid.UUID, replies: int) -> uuid.UUID:
+    """A post with `replies` replies, every other one liked by `user_id`."""
+    post = ForumPost(author_id=user_id, title="Best pho?", content="Where to go")
+    session.add(post)
+    await session.flush()
+    session.add(PostLike(post_id=post.id, user_id=user_id))
+    for i in range(replies):
+        reply = PostReply(post_id=post.id, user_id=user_id, content=f"Reply {i}")
+        session.add(reply)
+        await session.flush()
+        if i % 2 == 0:
+            session.add(ReplyLike(reply_id=reply.id, user_id=user_id))
+    await session.commit()
+    return post.id
+
+
+async def test_forum_post_detail_query_count_is_independent_of_replies(
+    count_queries, make_user
+):
+    async with sessionmanager.session() as session:
+        user_id = (await make_user(session)).id
+        small = await _seed_thread(session, user_id, replies=2)
+        large = await _seed_thread(session, user_id, replies=40)
+
+    counts = []
+    for post_id, replies in ((small, 2), (large, 40)):
+        async with sessionmanager.session() as session:
+            with count_queries() as statements:
+                post = await get_forum_post(session, post_id, user_id)
+        counts.append(len(statements))
+
+        assert post.is_liked
+        assert len(post.replies) == min(replies, REPLY_PAGE_SIZE)
+        assert (post.replies_next_cursor is not None) == (replies > REPLY_PAGE_SIZE)
+        for reply in post.replies:
+            liked = int(reply.content.split()[1]) % 2 == 0
+            assert reply.is_liked is liked
+            assert reply.like_count == int(liked)
+
+    assert counts[0] == counts[1]
+
+
+async def test_forum_list_query_count_is_independent_of_page_size(
+    count_queries, make_user
+):
+    async with sessionmanager.session() as session:
+        user_id = (await make_user(session)).id
+        for _ in range(12):
+            await _seed_thread(session, user_id, replies=0)
+
+    counts = []
+    for limit in (2, 12):
+        async with sessionmanager.session() as session:
+            with count_queries() as statements:
+                posts, _, _ = await list_forum_posts(
+                    session, ForumSearchFilter(limit=limit), user_id
+                )
+        counts.append(len(statements))
+        assert len(posts) == limit
+        assert all(post.is_liked for post in posts)
+
+    assert counts[0] == counts[1]
+
+
+async def test_reply_tree_is_paged_and_depth_limited(make_user):
+    """Top-level replies come by cursor; children follow their parent."""
+    async with sessionmanager.session() as session:
+        user_id = (await make_user(session)).id
+        post = ForumPost(author_id=user_id, title="Itinerary", content="Thoughts?")
+        session.add(post)
+        await session.flush()
+
+        roots = []
+        for i in range(3):
+            root = PostReply(
+                post_id=post.id,
+                user_id=user_id,
+                content=f"Root {i}",
+                created_at=STARTED + timedelta(minutes=i),
+            )
+            session.add(root)
+            await session.flush()
+            roots.append(root)
+        # A chain one level deeper than the depth limit under the first root
+        parent = roots[0]
+        chain = []
+        for level in range(REPLY_MAX_DEPTH):
+            reply = PostReply(
+                post_id=post.id,
+                user_id=user_id,
+                parent_id=parent.id,
+                content=f"Level {level + 2}",
+                created_at=STARTED + timedelta(seconds=level),
+            )
+            session.add(reply)
+            await session.flush()
+            chain.append(reply)
+            parent = reply
+        await session.commit()
+
+        first, cursor = await list_forum_replies(session, post.id, limit=2)
+        assert [r.content for r in first] == [
+            "Root 0",
+            *(f"Level {level}" for level in range(2, REPLY_MAX_DEPTH + 1)),
+            "Root 1",
+        ]
+        deepest = first[REPLY_MAX_DEPTH - 1]
+        assert deepest.child_count == 1
+
+        rest, cursor = await list_forum_replies(session, post.id, cursor=cursor)
+        assert [r.content for r in rest] == ["Root 2"]
+        assert cursor is None
+
+        # The cut-off level is loaded lazily from its parent
+        deeper, _ = await list_forum_replies(session, post.id, parent_id=deepest.id)
+        assert [r.id for r in deeper] == [chain[-1].id]
+
+
+async def test_post_loads_never_touch_replies(count_queries, make_user):
+    """Plain ForumPost loads don't pull in replies, images or tags."""
+    async with sessionmanager.session() as session:
+        user_id = (await make_user(session)).id
+        post_id = await _seed_thread(session, user_id, replies=30)
+
+    async with sessionmanager.session() as session:
+        with count_queries() as statements:
+            post = await session.get(ForumPost, post_id)
+        assert post is not None
+        assert len(statements) == 1
+
+    async with sessionmanager.session() as session:
+        with count_queries() as statements:
+            await toggle_forum_post_like(session, post_id, user_id)
+            await get_user_posts(session, user_id)
+        assert not any("post_replies" in statement for statement in statements)
+        assert not any("post_images" in statement for statement in statements)
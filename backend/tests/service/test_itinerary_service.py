@@ -0,0 +1,108 @@
+import uuid
+from datetime import date, datetime, time
+from types import SimpleNamespace
+
+import pytest
+from app.schemas import TripGenerateRequest
+from app.service.itinerary_service import is_open, plan_itinerary
+
+REQUEST = TripGenerateRequest(
+    # 2026-11-02 is a Monday
+    destination="Hoi An",
+    start_date=date(2026, 11, 2),
+    end_date=date(2026, 11, 3),
+)
+
+
+def _place(name, place_type, lat=None, lng=None, opening_hours=None):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        name=name,
+        place_type=place_type,
+        lat=lat,
+        lng=lng,
+        opening_hours=opening_hours,
+    )
+
+
+def test_opening_hours_are_parsed_per_weekday():
+    hours = {"mon": "08:00-22:00", "tuesday": "Closed", "fri": "18:00-02:00"}
+    monday, tuesday = date(2026, 11, 2), date(2026, 11, 3)
+    friday, saturday = date(2026, 11, 6), date(2026, 11, 7)
+
+    assert is_open(hours, monday, time(8))
+    assert not is_open(hours, monday, time(7, 59))
+    assert not is_open(hours, tuesday, time(12))
+    # Wednesday isn't listed, so the place is closed that day
+    assert not is_open(hours, date(2026, 11, 4), time(12))
+    assert is_open(hours, friday, time(23, 30))
+    assert not is_open(hours, saturday, time(12))
+    assert is_open({"mon": "9-12, 14:00-18:00"}, monday, time(15))
+    assert is_open(None, tuesday, time(3))
+    assert is_open({"mon": "by appointment"}, monday, time(3))
+
+
+def test_plan_uses_one_hotel_meals_and_nearby_landmarks_per_day():
+    hotel = _place("Riverside", "hotel", 15.877, 108.327)
+    # Two groups of landmarks about 4 km apart
+    old_town = [
+        _place(f"Old Town {i}", "landmark", 15.877 + i / 1000, 108.328)
+        for i in range(3)
+    ]
+    beach = [
+        _place(f"Beach {i}", "landmark", 15.900 + i / 1000, 108.360)
+        for i in range(3)
+    ]
+    # By the beach, only open on Tuesday afternoons
+    museum = _place("Museum", "landmark", 15.901, 108.361, {"tue": "13:00-17:00"})
+    restaurants = [
+        _place(f"Restaurant {i}", "restaurant", 15.88, 108.33) for i in range(4)
+    ]
+    cafe = _place("Cafe", "cafe", 15.877, 108.327)
+
+    days = plan_itinerary(
+        REQUEST,
+        {
+            "hotel": [hotel, _place("Second best", "hotel")],
+            "restaurant": restaurants,
+            "cafe": [cafe],
+            "landmark": [museum, *old_town, *beach],
+        },
+    )
+
+    assert [day.day for day in days] == [1, 2]
+    names = {place.id: place.name for place in [hotel, museum, *old_town, *beach]}
+    for day_plan in days:
+        times = [stop.arrival_time for stop in day_plan.stops]
+        assert times == sorted(times)
+        assert day_plan.stops[-1].place_id == hotel.id
+        assert [stop.notes for stop in day_plan.stops].count("Dinner") == 1
+
+    first, second = days
+    assert first.stops[0].arrival_time == datetime(2026, 11, 2, 8)
+    assert first.stops[1].place_id == cafe.id
+    assert not any(stop.place_id == cafe.id for stop in second.stops)
+    # Each day stays in one area; the beach day is Tuesday, for the museum
+    sights = [
+        {names[stop.place_id] for stop in day.stops if stop.notes == "Sightseeing"}
+        for day in days
+    ]
+    assert sights[0] == {"Old Town 0", "Old Town 1", "Old Town 2"}
+    assert "Museum" in sights[1]
+    assert all(name.startswith(("Beach", "Museum")) for name in sights[1])
+    (museum_stop,) = [stop for stop in second.stops if stop.place_id == museum.id]
+    assert museum_stop.arrival_time.time() >= time(13)
+    # Four restaurants for six meals: every one is used before any repeats
+    meals = [
+        stop.place_id
+        for day in days
+        for stop in day.stops
+        if stop.notes in ("Breakfast", "Lunch", "Dinner")
+    ]
+    assert len(meals) == 6
+    assert set(meals[:4]) == {restaurant.id for restaurant in restaurants}
+
+
+def test_plan_needs_a_hotel():
+    with pytest.raises(ValueError):
+        plan_itinerary(REQUEST, {"hotel": [], "landmark": []})
@@ -0,0 +1,93 @@
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from app.core.db import sessionmanager
+from app.models import ForumPost
+from app.schemas import ForumSearchFilter
+from app.service.forum_service import list_forum_posts
+from app.service.pagination import (
+    InvalidCursorError,
+    count_total,
+    decode_cursor,
+    encode_cursor,
+)
+from sqlalchemy import select
+
+
+def test_cursor_round_trip():
+    values = [
+        Decimal("4.5"),
+        datetime(2026, 10, 19, 12, 30, tzinfo=timezone.utc),
+        date.max,
+        uuid.uuid4(),
+        7,
+    ]
+    assert decode_cursor(encode_cursor(values), len(values)) == values
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor([1])])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, 2)
+
+
+async def _seed_posts(session, author_id: uuid.UUID, count: int) -> None:
+    # Equal reply counts force the id tie-breaker to be used
+    session.add_all(
+        ForumPost(
+            author_id=author_id,
+            title=f"Post {i}",
+            content="...",
+            reply_count=i % 3,
+        )
+        for i in range(count)
+    )
+    await session.commit()
+
+
+async def test_forum_posts_cursor_walks_every_post_once(make_user):
+    async with sessionmanager.session() as session:
+        await _seed_posts(session, (await make_user(session)).id, 11)
+
+        seen, cursor = [], None
+        while True:
+            params = ForumSearchFilter(sort="popular", limit=4, cursor=cursor)
+            posts, total, cursor = await list_forum_posts(session, params)
+            seen.extend(post.id for post in posts)
+            if cursor is None:
+                break
+
+        assert total == 11
+        assert len(seen) == len(set(seen)) == 11
+
+
+async def test_count_modes(make_user):
+    async with sessionmanager.session() as session:
+        author_id = (await make_user(session)).id
+        await _seed_posts(session, author_id, 5)
+        source = select(ForumPost.id).where(ForumPost.author_id == author_id)
+
+        assert await count_total(session, source, "none") is None
+        assert await count_total(session, source, "exact") == 5
+        # Small results fall back to an exact count
+        assert await count_total(session, source, "estimated") == 5
+
+        assert await count_total(session, source, "cached") == 5
+        session.add(ForumPost(author_id=author_id, title="New", content="..."))
+        await session.commit()
+        # Served from the cache until the TTL expires
+        assert await count_total(session, source, "cached") == 5
+        assert await count_total(session, source, "exact") == 6
+
+
+async def test_cached_count_keeps_distinct_on_apart(make_user):
+    async with sessionmanager.session() as session:
+        author_id = (await make_user(session)).id
+        await _seed_posts(session, author_id, 6)
+        posts = select(ForumPost.reply_count).where(ForumPost.author_id == author_id)
+        # Only DISTINCT ON tells these apart; both must get their own entry
+        assert await count_total(session, posts, "cached") == 6
+        distinct = posts.distinct(ForumPost.reply_count)
+        assert await count_total(session, distinct, "cached") == 3
@@ -0,0 +1,125 @@
+from datetime import date, datetime, timezone
+
+from app.core.db import sessionmanager
+from app.models import ForumPost, PostLike
+from app.service import partition_service
+from app.service.partition_service import (
+    drop_expired_partitions,
+    ensure_partitions,
+    maintain_partitions,
+)
+from sqlalchemy import func, select, text
+
+
+def _at_month(monkeypatch, month: date) -> None:
+    monkeypatch.setattr(partition_service, "_current_month", lambda: month)
+
+
+async def _partitions(session, table: str) -> list[str]:
+    result = await session.execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits i
+            JOIN pg_class child ON child.oid = i.inhrelid
+            JOIN pg_class parent ON parent.oid = i.inhparent
+            WHERE parent.relname = :table
+            ORDER BY child.relname
+            """
+        ),
+        {"table": table},
+    )
+    return list(result.scalars())
+
+
+async def test_ensure_partitions_creates_months_ahead_once(monkeypatch):
+    _at_month(monkeypatch, date(2026, 11, 1))
+    async with sessionmanager.session() as session:
+        created = await ensure_partitions(session, months_ahead=2)
+        await session.commit()
+
+        assert await _partitions(session, "post_likes") == [
+            "post_likes_default",
+            "post_likes_p202611",
+            "post_likes_p202612",
+            "post_likes_p202701",
+        ]
+        assert len(created) == 3 * len(partition_service.PARTITIONED_TABLES)
+        assert await ensure_partitions(session, months_ahead=2) == []
+
+
+async def test_rows_in_default_partition_move_to_new_month(monkeypatch, make_user):
+    async with sessionmanager.session() as session:
+        user = await make_user(session)
+        post = ForumPost(author_id=user.id, title="Ha Long", content="Boats")
+        session.add(post)
+        await session.flush()
+        # Maintenance fell behind: this like landed in the DEFAULT partition
+        liked_at = datetime(2027, 3, 15, tzinfo=timezone.utc)
+        session.add(PostLike(post_id=post.id, user_id=user.id, created_at=liked_at))
+        await session.commit()
+
+        _at_month(monkeypatch, date(2027, 3, 1))
+        await maintain_partitions(session)
+
+        assert "post_likes_p202703" in await _partitions(session, "post_likes")
+        moved = await session.scalar(text("SELECT count(*) FROM post_likes_p202703"))
+        stranded = await session.scalar(text("SELECT count(*) FROM post_likes_default"))
+        assert (moved, stranded) == (1, 0)
+        assert await session.scalar(select(func.count(PostLike.id))) == 1
+
+
+async def test_expired_partitions_are_dropped_after_hooks(monkeypatch):
+    archived = []
+
+    async def archive(session, table, partition):
+        archived.append(partition)
+
+    monkeypatch.setattr(partition_service, "_retention_hooks", [archive])
+    async with sessionmanager.session() as session:
+        _at_month(monkeypatch, date(2026, 1, 1))
+        await ensure_partitions(session, months_ahead=3)
+        await session.commit()
+
+        _at_month(monkeypatch, date(2026, 6, 1))
+        dropped = await drop_expired_partitions(session, "reply_likes", 2)
+        await session.commit()
+
+        expected = ["reply_likes_p202601", "reply_likes_p202602", "reply_likes_p202603"]
+        assert sorted(dropped) == sorted(archived) == expected
+        assert await _partitions(session, "reply_likes") == [
+            "reply_likes_default",
+            "reply_likes_p202604",
+        ]
+
+
+async def test_failing_table_does_not_block_the_others(monkeypatch):
+    async def refuse(session, table, partition):
+        if table == "post_likes":
+            raise RuntimeError("archive unavailable")
+
+    monkeypatch.setattr(partition_service, "_retention_hooks", [refuse])
+    monkeypatch.setattr(partition_service.settings, "PARTITION_MONTHS_AHEAD", 0)
+    monkeypatch.setattr(
+        partition_service.settings,
+        "PARTITION_RETENTION_MONTHS",
+        {"post_likes": 1, "content_reports": 1},
+    )
+    async with sessionmanager.session() as session:
+        _at_month(monkeypatch, date(2026, 1, 1))
+        await ensure_partitions(session)
+        await session.commit()
+
+        _at_month(monkeypatch, date(2026, 3, 1))
+        await maintain_partitions(session)
+
+        # post_likes rolled back, the other tables went ahead
+        assert await _partitions(session, "post_likes") == [
+            "post_likes_default",
+            "post_likes_p202601",
+        ]
+        assert await _partitions(session, "content_reports") == [
+            "content_reports_default",
+            "content_reports_p202603",
+        ]
+        assert "reply_likes_p202603" in await _partitions(session, "reply_likes")
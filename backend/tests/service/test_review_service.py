@@ -0,0 +1,105 @@
+import statistics
+import time
+import uuid
+
+import pytest
+from app.core.db import sessionmanager
+from app.models import Landmark, Review
+from app.schemas import ReviewCreate, ReviewUpdate
+from app.service.review_service import create_review, delete_review, update_review
+from sqlalchemy import func, insert, select
+
+EXISTING_REVIEWS = 20_000
+TIMED_REVIEWS = 50
+
+
+async def _seed_place(session, review_count: int) -> uuid.UUID:
+    """Create a place that already has `review_count` reviews."""
+    ratings = [(i % 5) + 1 for i in range(review_count)]
+    place = Landmark(
+        name="Popular Landmark",
+        rating_sum=sum(ratings),
+        review_count=len(ratings),
+        average_rating=round(sum(ratings) / len(ratings), 1) if ratings else 0,
+    )
+    session.add(place)
+    await session.flush()
+
+    if ratings:
+        await session.execute(
+            insert(Review),
+            [{"place_id": place.id, "rating": rating} for rating in ratings],
+        )
+    await session.commit()
+    return place.id
+
+
+async def _aggregates(session, place_id: uuid.UUID):
+    """Return (stored aggregates, aggregates recomputed from reviews)."""
+    stored = (
+        await session.execute(
+            select(Landmark.rating_sum, Landmark.review_count, Landmark.average_rating)
+            .where(Landmark.id == place_id)
+            .execution_options(populate_existing=True)
+        )
+    ).one()
+    actual = (
+        await session.execute(
+            select(
+                func.coalesce(func.sum(Review.rating), 0),
+                func.count(Review.id),
+                func.coalesce(func.round(func.avg(Review.rating), 1), 0),
+            ).where(Review.place_id == place_id)
+        )
+    ).one()
+    return tuple(stored), tuple(actual)
+
+
+async def test_rating_aggregates_follow_review_changes(make_user):
+    """Incremental aggregates match a full recompute after create/update/delete."""
+    async with sessionmanager.session() as session:
+        user_id = (await make_user(session)).id
+        place_id = await _seed_place(session, 3)
+
+        first = await create_review(
+            session, user_id, ReviewCreate(place_id=place_id, rating=5)
+        )
+        second = await create_review(
+            session, user_id, ReviewCreate(place_id=place_id, rating=2)
+        )
+        await update_review(session, user_id, first.id, ReviewUpdate(rating=1))
+        await delete_review(session, user_id, second.id)
+
+        stored, actual = await _aggregates(session, place_id)
+        assert stored == actual
+
+
+async def _median_create_ms(session, user_id, place_id) -> float:
+    timings = []
+    for i in range(TIMED_REVIEWS):
+        body = ReviewCreate(place_id=place_id, rating=(i % 5) + 1)
+        started = time.perf_counter()
+        await create_review(session, user_id, body)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+@pytest.mark.benchmark
+async def test_review_creation_latency_with_many_reviews(make_user):
+    """
+    Review creation on a place with many existing reviews is as fast as on
+    a new place (no full AVG recompute).
+    """
+    async with sessionmanager.session() as session:
+        user_id = (await make_user(session)).id
+        busy_id = await _seed_place(session, EXISTING_REVIEWS)
+        quiet_id = await _seed_place(session, 0)
+
+        quiet = await _median_create_ms(session, user_id, quiet_id)
+        busy = await _median_create_ms(session, user_id, busy_id)
+
+        # Generous bound; a recompute over 20k reviews is far slower
+        assert busy < quiet * 2 + 5
+        stored, actual = await _aggregates(session, busy_id)
+        assert stored == actual
+        assert stored[1] == EXISTING_REVIEWS + TIMED_REVIEWS
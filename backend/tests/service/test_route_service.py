@@ -0,0 +1,52 @@
+import time
+
+import numpy as np
+from app.service.route_service import haversine_matrix, optimize_order
+
+
+def _length(lat, lng, order) -> float:
+    dist = haversine_matrix(lat, lng)
+    return float(sum(dist[a, b] for a, b in zip(order, order[1:])))
+
+
+def test_haversine_matrix_is_symmetric_in_km():
+    # Hanoi, Ho Chi Minh City
+    dist = haversine_matrix([21.0285, 10.8231], [105.8542, 106.6297])
+    assert np.allclose(dist, dist.T)
+    assert dist[0, 0] == 0
+    assert 1130 < dist[0, 1] < 1150
+
+
+def test_zig_zag_is_straightened_between_fixed_stops():
+    # Points on a line, visited out of order; the meal at index 3 is fixed
+    lng = [0.0, 0.03, 0.01, 0.05, 0.045, 0.07, 0.06]
+    lat = [0.0] * len(lng)
+    fixed = [False, False, False, True, False, False, False]
+
+    order = optimize_order(lat, lng, fixed)
+
+    assert order == [0, 2, 1, 3, 4, 6, 5]
+
+
+def test_stops_without_coordinates_stay_in_place():
+    lat = [0.0, None, 0.0, 0.0, 0.0]
+    lng = [0.0, None, 0.03, 0.01, 0.04]
+    fixed = [False, False, False, False, True]
+
+    assert optimize_order(lat, lng, fixed) == [0, 1, 3, 2, 4]
+    assert optimize_order([], [], []) == []
+
+
+def test_hundreds_of_stops_are_optimized_quickly():
+    rng = np.random.default_rng(7)
+    lat = list(21 + rng.random(300) * 0.1)
+    lng = list(105.8 + rng.random(300) * 0.1)
+
+    started = time.perf_counter()
+    order = optimize_order(lat, lng, [False] * 300)
+    elapsed = time.perf_counter() - started
+
+    assert sorted(order) == list(range(300))
+    assert _length(lat, lng, order) < _length(lat, lng, range(300)) / 5
+    # Generous bound for slow CI machines
+    assert elapsed < 1
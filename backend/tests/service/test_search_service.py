@@ -0,0 +1,197 @@
+import statistics
+import time
+from datetime import datetime, timezone
+
+import pytest
+from app.core.db import sessionmanager
+from app.models import (
+    ForumPost,
+    Landmark,
+    Place,
+    PlaceSearch,
+    Restaurant,
+    Review,
+    Tag,
+    Trip,
+    TripStop,
+)
+from app.schemas import PlaceSearchFilter
+from app.service.place_search_service import refresh_place_search
+from app.service.place_service import _enrich_place_public
+from app.service.review_service import _apply_place_rating_delta
+from app.service.search_service import search_places
+from sqlalchemy import insert, select
+from sqlalchemy.orm import selectinload, with_polymorphic
+
+PLACES = 50
+REVIEWS_PER_PLACE = 500
+TIMED_SEARCHES = 20
+
+
+async def test_search_projection_matches_place_public():
+    """The column projection returns the same PlacePublic as the ORM mapping."""
+    async with sessionmanager.session() as session:
+        restaurant = Restaurant(
+            name="Projection Bistro",
+            city="Hanoi",
+            location="SRID=4326;POINT(105.85 21.03)",
+            price_range="$$",
+            opening_hours={"mon": "08:00-22:00"},
+            tags=[Tag(name="pho"), Tag(name="street-food")],
+        )
+        session.add(restaurant)
+        await refresh_place_search(session, [restaurant.id])
+        await session.commit()
+
+        response, total, _ = await search_places(
+            session, PlaceSearchFilter(q="Projection")
+        )
+
+        poly = with_polymorphic(Place, "*")
+        place = (
+            await session.execute(
+                select(poly)
+                .options(selectinload(poly.tags))
+                .where(poly.id == restaurant.id)
+                .execution_options(populate_existing=True)
+            )
+        ).scalar_one()
+        expected = _enrich_place_public(place)
+
+        assert total == 1
+        (found,) = response.places
+        assert sorted(found.tags) == sorted(expected.tags)
+        assert found.model_dump(exclude={"tags"}) == expected.model_dump(
+            exclude={"tags"}
+        )
+
+
+async def _seed_places(session, name: str, reviews_per_place: int) -> None:
+    places = [
+        Landmark(name=f"{name} {i}", review_count=reviews_per_place)
+        for i in range(PLACES)
+    ]
+    session.add_all(places)
+    await session.flush()
+    if reviews_per_place:
+        await session.execute(
+            insert(Review),
+            [
+                {"place_id": place.id, "rating": (i % 5) + 1}
+                for place in places
+                for i in range(reviews_per_place)
+            ],
+        )
+    await refresh_place_search(session)
+    await session.commit()
+
+
+async def test_search_does_not_load_reviews():
+    """Search returns a page of places without loading their reviews."""
+    async with sessionmanager.session() as session:
+        await _seed_places(session, "Busy Landmark", 5)
+
+        response, total, _ = await search_places(
+            session, PlaceSearchFilter(q="Busy Landmark", limit=20)
+        )
+
+        assert total == PLACES
+        assert len(response.places) == 20
+        # Nothing was loaded into the identity map
+        assert not any(isinstance(obj, Review) for obj in session.identity_map.values())
+
+
+async def _median_search_ms(session, q: str) -> float:
+    filters = PlaceSearchFilter(q=q, limit=20)
+    timings = []
+    for _ in range(TIMED_SEARCHES):
+        started = time.perf_counter()
+        await search_places(session, filters)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+@pytest.mark.benchmark
+async def test_search_latency_with_many_reviews():
+    """
+    Search over places with many reviews each is as fast as over places
+    without reviews: reviews are never read by search.
+    """
+    async with sessionmanager.session() as session:
+        await _seed_places(session, "Quiet Landmark", 0)
+        await _seed_places(session, "Busy Landmark", REVIEWS_PER_PLACE)
+
+        quiet = await _median_search_ms(session, "Quiet Landmark")
+        busy = await _median_search_ms(session, "Busy Landmark")
+
+        assert busy < quiet * 2 + 5
+
+
+async def test_place_search_follows_tags_and_ratings():
+    """The read model matches by tag and word prefix and tracks rating changes."""
+    async with sessionmanager.session() as session:
+        landmark = Landmark(
+            name="Temple of Literature",
+            city="Hanoi",
+            country="Vietnam",
+            tags=[Tag(name="history")],
+        )
+        session.add(landmark)
+        await refresh_place_search(session, [landmark.id])
+        await _apply_place_rating_delta(session, landmark.id, 4, 1)
+        await session.commit()
+
+        response, total, _ = await search_places(
+            session, PlaceSearchFilter(q="templ hano", tags="history,art")
+        )
+        assert total == 1
+        assert response.places[0].id == landmark.id
+
+        row = await session.get(PlaceSearch, landmark.id, populate_existing=True)
+        assert (row.average_rating, row.review_count) == (4, 1)
+
+        await session.delete(landmark)
+        await session.commit()
+        remaining = await session.execute(
+            select(PlaceSearch.place_id).where(PlaceSearch.place_id == landmark.id)
+        )
+        assert remaining.first() is None
+
+
+async def test_search_include_selects_supplementary_results(count_queries, make_user):
+    """Posts and trips come along by default and are skipped when not included."""
+    async with sessionmanager.session() as session:
+        user_id = (await make_user(session)).id
+        landmark = Landmark(name="Marble Mountains", city="Da Nang")
+        trip = Trip(user_id=user_id, trip_name="Da Nang weekend", public=True)
+        session.add_all([landmark, trip])
+        await session.flush()
+        session.add(
+            TripStop(
+                trip_id=trip.id,
+                place_id=landmark.id,
+                stop_order=1024,
+                arrival_time=datetime(2026, 11, 1, 9, tzinfo=timezone.utc),
+            )
+        )
+        session.add(
+            ForumPost(author_id=user_id, title="Marble caves", content="Worth it?")
+        )
+        await refresh_place_search(session, [landmark.id])
+        await session.commit()
+
+        response, total, _ = await search_places(
+            session, PlaceSearchFilter(q="marble")
+        )
+        assert total == 1
+        assert [post.title for post in response.posts] == ["Marble caves"]
+        assert [trip.trip_name for trip in response.trips] == ["Da Nang weekend"]
+
+        with count_queries() as statements:
+            response, _, _ = await search_places(
+                session, PlaceSearchFilter(q="marble", include="")
+            )
+        assert len(response.places) == 1
+        assert (response.posts, response.trips) == ([], [])
+        assert not any("forum_posts" in statement for statement in statements)
+        assert not any("trip_stops" in statement for statement in statements)
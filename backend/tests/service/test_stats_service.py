@@ -0,0 +1,137 @@
+import uuid
+from datetime import date
+
+from app.core.db import sessionmanager
+from app.models import (
+    ForumPost,
+    Landmark,
+    ProfileStats,
+    Review,
+    ReviewImage,
+    Trip,
+)
+from app.schemas import ForumPostCreate, ReviewCreate, TripCreate, TripUpdate
+from app.service.forum_service import create_forum_post, delete_forum_post
+from app.service.review_service import create_review, delete_review
+from app.service.stats_service import (
+    STAT_FIELDS,
+    get_profile_stats,
+    reconcile_profile_stats,
+)
+from app.service.trip_service import create_trip, delete_trip, update_trip
+from sqlalchemy import delete, func, select, update
+
+
+async def _real_counts(session, user_id: uuid.UUID) -> dict[str, int]:
+    count = session.scalar
+    return {
+        "reviews_count": await count(
+            select(func.count(Review.id)).where(Review.user_id == user_id)
+        ),
+        "posts_count": await count(
+            select(func.count(ForumPost.id)).where(ForumPost.author_id == user_id)
+        ),
+        "photos_count": await count(
+            select(func.count(ReviewImage.id))
+            .join(Review, Review.id == ReviewImage.review_id)
+            .where(Review.user_id == user_id)
+        ),
+        "trips_count": await count(
+            select(func.count(Trip.id)).where(Trip.user_id == user_id)
+        ),
+        "public_trips_count": await count(
+            select(func.count(Trip.id)).where(Trip.user_id == user_id, Trip.public)
+        ),
+        "replies_count": 0,
+    }
+
+
+async def _counters(session, user_id: uuid.UUID) -> dict[str, int]:
+    stats = await session.get(ProfileStats, user_id, populate_existing=True)
+    return {field: getattr(stats, field) for field in STAT_FIELDS}
+
+
+def _trip(public: bool) -> TripCreate:
+    return TripCreate(
+        trip_name="Weekend",
+        start_date=date(2026, 11, 1),
+        end_date=date(2026, 11, 2),
+        public=public,
+    )
+
+
+async def test_counters_follow_creates_updates_and_deletes(make_user):
+    async with sessionmanager.session() as session:
+        user_id = (await make_user(session)).id
+        place = Landmark(name="Temple of Literature")
+        session.add(place)
+        await session.commit()
+
+        review = await create_review(
+            session,
+            user_id,
+            ReviewCreate(place_id=place.id, rating=5, images=["a.jpg", "b.jpg"]),
+        )
+        post = await create_forum_post(
+            session, user_id, ForumPostCreate(title="Hanoi", content="Tips")
+        )
+        private_trip = await create_trip(session, user_id, _trip(public=False))
+        public_trip = await create_trip(session, user_id, _trip(public=True))
+        counters = await _counters(session, user_id)
+        assert counters == await _real_counts(session, user_id)
+        assert (counters["trips_count"], counters["public_trips_count"]) == (2, 1)
+
+        # Publishing and unpublishing move only the public counter
+        await update_trip(session, user_id, private_trip.id, TripUpdate(public=True))
+        assert (await _counters(session, user_id))["public_trips_count"] == 2
+        await update_trip(session, user_id, public_trip.id, TripUpdate(public=False))
+        await update_trip(session, user_id, public_trip.id, TripUpdate(public=False))
+        assert (await _counters(session, user_id))["public_trips_count"] == 1
+
+        await delete_trip(session, user_id, private_trip.id)
+        await delete_review(session, user_id, review.id)
+        await delete_forum_post(session, post.id, user_id)
+        counters = await _counters(session, user_id)
+        assert counters == await _real_counts(session, user_id)
+        assert counters["trips_count"] == 1
+        assert counters["public_trips_count"] == 0
+
+
+async def test_reconcile_repairs_drift_and_missing_rows(make_user):
+    async with sessionmanager.session() as session:
+        drifted = (await make_user(session)).id
+        missing = (await make_user(session, stats=False)).id
+        for user_id in (drifted, missing):
+            session.add_all(
+                [
+                    Trip(user_id=user_id, trip_name="Public", public=True),
+                    Trip(user_id=user_id, trip_name="Private", public=False),
+                ]
+            )
+        await session.execute(
+            update(ProfileStats)
+            .where(ProfileStats.profile_id == drifted)
+            .values(trips_count=7, public_trips_count=5, reviews_count=3)
+        )
+        await session.commit()
+
+        assert await reconcile_profile_stats(session, drifted) == 1
+        await session.commit()
+        assert await _counters(session, drifted) == await _real_counts(
+            session, drifted
+        )
+        assert await session.get(ProfileStats, missing) is None
+
+        # A profile without a counters row gets one on first read
+        stats = await get_profile_stats(session, missing)
+        assert (stats.trips_count, stats.public_trips_count) == (2, 1)
+
+        # Reconciling everything covers every profile
+        await session.execute(delete(ProfileStats))
+        await session.commit()
+        assert await reconcile_profile_stats(session) == 2
+        await session.commit()
+        for user_id in (drifted, missing):
+            assert await _counters(session, user_id) == await _real_counts(
+                session, user_id
+            )
@@ -0,0 +1,71 @@
+from app.core.db import sessionmanager
+from app.models import Landmark, Tag
+from app.service import tag_service
+from app.service.tag_service import resolve_tags
+from sqlalchemy import func, select
+
+
+async def test_resolve_tags_creates_missing_and_reuses_existing():
+    """Existing tags are reused, missing ones created once, order is kept."""
+    tag_service._tag_ids.clear()
+    async with sessionmanager.session() as session:
+        session.add(Tag(name="beach"))
+        await session.commit()
+
+        place = Landmark(name="My Khe")
+        session.add(place)
+        tags = await resolve_tags(session, ["sunset", "beach", "sunset"])
+        place.tags = tags
+        await session.commit()
+
+        assert [tag.name for tag in tags] == ["sunset", "beach"]
+        assert await session.scalar(select(func.count()).select_from(Tag)) == 2
+        # The pending place survived tag creation
+        assert await session.get(Landmark, place.id) is not None
+
+
+async def test_resolve_tags_uses_cache_for_committed_tags():
+    """Committed tags are served from the cache without touching the database."""
+    tag_service._tag_ids.clear()
+    async with sessionmanager.session() as session:
+        session.add(Tag(name="museum"))
+        await session.commit()
+        (first,) = await resolve_tags(session, ["museum"])
+        assert "museum" not in tag_service._tag_ids
+        await session.commit()
+        assert "museum" in tag_service._tag_ids
+
+    statements = []
+
+    class CountingSession:
+        def __init__(self, session):
+            self._session = session
+
+        async def execute(self, *args, **kwargs):
+            statements.append(args[0])
+            return await self._session.execute(*args, **kwargs)
+
+        async def merge(self, *args, **kwargs):
+            return await self._session.merge(*args, **kwargs)
+
+    async with sessionmanager.session() as session:
+        (second,) = await resolve_tags(CountingSession(session), ["museum"])
+
+    assert second.id == first.id
+    assert statements == []
+
+
+async def test_rolled_back_tags_are_not_cached():
+    """A tag created earlier in a rolled back transaction never reaches the cache."""
+    tag_service._tag_ids.clear()
+    async with sessionmanager.session() as session:
+        await resolve_tags(session, ["lantern"])
+        # Conflicts with the row this same transaction just inserted
+        await resolve_tags(session, ["lantern"])
+        await session.rollback()
+        assert "lantern" not in tag_service._tag_ids
+
+        (tag,) = await resolve_tags(session, ["lantern"])
+        await session.commit()
+        assert tag_service._tag_ids["lantern"] == tag.id
+        assert await session.get(Tag, tag.id) is not None
@@ -0,0 +1,163 @@
+import asyncio
+import contextlib
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from app.core.db import sessionmanager
+from app.models import Landmark, ProfileStats, Trip, TripGenerationJob
+from app.schemas import TripCreate, TripDayPlan, TripGenerateRequest, TripStopCreate
+from app.service import trip_job_service
+from app.service.trip_job_service import (
+    claim_trip_generation_job,
+    enqueue_trip_generation,
+    get_trip_generation_job,
+    run_trip_generation_job,
+    run_trip_generation_workers,
+)
+from sqlalchemy import func, select, update
+
+REQUEST = TripGenerateRequest(
+    destination="Hue", start_date=date(2026, 11, 1), end_date=date(2026, 11, 2)
+)
+
+
+async def test_jobs_are_claimed_once_and_reclaimed_when_stale(make_user):
+    async with sessionmanager.session() as session:
+        user_id = (await make_user(session)).id
+        job = await enqueue_trip_generation(session, user_id, REQUEST)
+        assert (job.status, job.days_total) == ("queued", 2)
+
+    async with sessionmanager.session() as session:
+        claimed = await claim_trip_generation_job(session)
+        assert (claimed.id, claimed.status, claimed.attempts) == (job.id, "running", 1)
+        assert await claim_trip_generation_job(session) is None
+
+        # The worker running it went away without a heartbeat
+        await session.execute(
+            update(TripGenerationJob).values(
+                updated_at=func.now() - timedelta(hours=1)
+            )
+        )
+        await session.commit()
+        reclaimed = await claim_trip_generation_job(session)
+        assert (reclaimed.id, reclaimed.attempts) == (job.id, 2)
+
+
+def _stub_model(monkeypatch, place: Landmark, after_first_day=None) -> None:
+    """Have the job plan a two day trip to `place` without calling a model."""
+    stop = TripStopCreate(
+        place_id=place.id, arrival_time=datetime(2026, 11, 1, 9, tzinfo=timezone.utc)
+    )
+
+    async def build_trip_prompt(session, request):
+        return "prompt", {place.id}, []
+
+    async def stream_trip_plan(request, prompt, place_ids, draft):
+        yield TripDayPlan(day=1, stops=[stop])
+        if after_first_day is not None:
+            await after_first_day()
+        yield TripDayPlan(day=2)
+        yield TripCreate(
+            trip_name="Hue",
+            start_date=request.start_date,
+            end_date=request.end_date,
+            stops=[stop],
+        )
+
+    monkeypatch.setattr(trip_job_service, "build_trip_prompt", build_trip_prompt)
+    monkeypatch.setattr(trip_job_service, "stream_trip_plan", stream_trip_plan)
+
+
+async def _seed_job(
+    session, make_user
+) -> tuple[uuid.UUID, Landmark, TripGenerationJob]:
+    user_id = (await make_user(session)).id
+    place = Landmark(name="Imperial City", city="Hue")
+    session.add(place)
+    await session.commit()
+    job = await enqueue_trip_generation(session, user_id, REQUEST)
+    return user_id, place, job
+
+
+async def _trip_ids(session, user_id: uuid.UUID) -> list[uuid.UUID]:
+    trips = await session.scalars(select(Trip.id).where(Trip.user_id == user_id))
+    return list(trips)
+
+
+async def test_job_run_saves_trip_and_reports_progress(monkeypatch, make_user):
+    async with sessionmanager.session() as session:
+        user_id, place, job = await _seed_job(session, make_user)
+    _stub_model(monkeypatch, place)
+
+    async with sessionmanager.session() as session:
+        claimed = await claim_trip_generation_job(session)
+    await run_trip_generation_job(claimed)
+
+    async with sessionmanager.session() as session:
+        done = await get_trip_generation_job(session, user_id, job.id)
+        assert (done.status, done.days_done, done.error) == ("succeeded", 2, None)
+        assert done.finished_at is not None
+        # Saved once, in the transaction that marked the job succeeded
+        assert await _trip_ids(session, user_id) == [done.trip_id]
+        # Other users can't see the job
+        assert await get_trip_generation_job(session, uuid.uuid4(), job.id) is None
+
+
+async def test_reclaimed_job_saves_one_trip(monkeypatch, make_user):
+    async with sessionmanager.session() as session:
+        user_id, place, job = await _seed_job(session, make_user)
+
+    reclaimed = []
+
+    async def stall_until_reclaimed():
+        if reclaimed:
+            return
+        # The first attempt looks stale; another worker claims and finishes it
+        async with sessionmanager.session() as session:
+            await session.execute(
+                update(TripGenerationJob).values(
+                    updated_at=func.now() - timedelta(hours=1)
+                )
+            )
+            await session.commit()
+            reclaimed.append(await claim_trip_generation_job(session))
+        await run_trip_generation_job(reclaimed[0])
+
+    _stub_model(monkeypatch, place, after_first_day=stall_until_reclaimed)
+    async with sessionmanager.session() as session:
+        first = await claim_trip_generation_job(session)
+    await run_trip_generation_job(first)
+
+    async with sessionmanager.session() as session:
+        done = await get_trip_generation_job(session, user_id, job.id)
+        assert (done.status, done.attempts) == ("succeeded", 2)
+        assert await _trip_ids(session, user_id) == [done.trip_id]
+        stats = await session.get(ProfileStats, user_id)
+        assert stats.trips_count == 1
+
+
+async def test_worker_keeps_running_after_a_job_crashes(monkeypatch, make_user):
+    async with sessionmanager.session() as session:
+        user_id = (await make_user(session)).id
+        first = await enqueue_trip_generation(session, user_id, REQUEST)
+        second = await enqueue_trip_generation(session, user_id, REQUEST)
+
+    ran = []
+    both_ran = asyncio.Event()
+
+    async def crash(job):
+        ran.append(job.id)
+        if len(ran) == 2:
+            both_ran.set()
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(trip_job_service, "run_trip_generation_job", crash)
+    workers = asyncio.create_task(run_trip_generation_workers(1, 0.01))
+    try:
+        await asyncio.wait_for(both_ran.wait(), 5)
+    finally:
+        workers.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await workers
+
+    assert ran == [first.id, second.id]
@@ -0,0 +1,175 @@
+import uuid
+from datetime import date, datetime, timezone
+
+from app.core.db import sessionmanager
+from app.models import Hotel, Landmark, Restaurant, TripStop
+from app.schemas import TripCreate, TripStopCreate, TripStopUpdate
+from app.service.trip_service import (
+    STOP_ORDER_GAP,
+    add_trip_stop,
+    create_trip,
+    get_trip,
+    optimize_trip_route,
+    remove_trip_stop,
+    update_trip_stop,
+)
+from sqlalchemy import select
+
+ARRIVAL = datetime(2026, 11, 1, 9, tzinfo=timezone.utc)
+
+
+async def _seed(session, make_user) -> tuple[uuid.UUID, list[uuid.UUID]]:
+    """Create a traveller and a few places."""
+    user = await make_user(session)
+    places = [Landmark(name=f"Stop {i}") for i in range(4)]
+    session.add_all(places)
+    await session.commit()
+    return user.id, [place.id for place in places]
+
+
+async def _stop_names(session, user_id, trip_id) -> list[str]:
+    trip = await get_trip(session, user_id, trip_id)
+    assert [stop.stop_order for stop in trip.stops] == list(
+        range(1, len(trip.stops) + 1)
+    )
+    return [stop.place.name for stop in trip.stops]
+
+
+async def test_stop_insert_move_and_remove_keep_positions(make_user):
+    """Stops can be inserted, moved and removed by position."""
+    async with sessionmanager.session() as session:
+        user_id, place_ids = await _seed(session, make_user)
+        trip = await create_trip(
+            session,
+            user_id,
+            TripCreate(
+                trip_name="Central Vietnam",
+                start_date=date(2026, 11, 1),
+                end_date=date(2026, 11, 3),
+                stops=[
+                    TripStopCreate(place_id=place_ids[0], arrival_time=ARRIVAL),
+                    TripStopCreate(place_id=place_ids[1], arrival_time=ARRIVAL),
+                ],
+            ),
+        )
+
+        inserted = await add_trip_stop(
+            session,
+            user_id,
+            trip.id,
+            TripStopCreate(place_id=place_ids[2], stop_order=1, arrival_time=ARRIVAL),
+        )
+        assert inserted.stop_order == 1
+        assert await _stop_names(session, user_id, trip.id) == [
+            "Stop 2",
+            "Stop 0",
+            "Stop 1",
+        ]
+
+        moved = await update_trip_stop(
+            session, user_id, trip.id, inserted.id, TripStopUpdate(order_index=3)
+        )
+        assert moved.stop_order == 3
+        assert await _stop_names(session, user_id, trip.id) == [
+            "Stop 0",
+            "Stop 1",
+            "Stop 2",
+        ]
+
+        await remove_trip_stop(session, user_id, trip.id, trip.stops[0].id)
+        assert await _stop_names(session, user_id, trip.id) == ["Stop 1", "Stop 2"]
+
+
+async def test_repeated_inserts_renumber_when_gap_is_used_up(make_user):
+    """Inserting into the same gap repeatedly eventually renumbers the trip."""
+    async with sessionmanager.session() as session:
+        user_id, place_ids = await _seed(session, make_user)
+        trip = await create_trip(
+            session,
+            user_id,
+            TripCreate(
+                trip_name="Day trip",
+                start_date=date(2026, 11, 1),
+                end_date=date(2026, 11, 1),
+                stops=[
+                    TripStopCreate(place_id=place_ids[0], arrival_time=ARRIVAL),
+                    TripStopCreate(place_id=place_ids[1], arrival_time=ARRIVAL),
+                ],
+            ),
+        )
+
+        inserts = STOP_ORDER_GAP.bit_length() + 2
+        for _ in range(inserts):
+            await add_trip_stop(
+                session,
+                user_id,
+                trip.id,
+                TripStopCreate(
+                    place_id=place_ids[3], stop_order=2, arrival_time=ARRIVAL
+                ),
+            )
+
+        names = await _stop_names(session, user_id, trip.id)
+        assert names == ["Stop 0", *["Stop 3"] * inserts, "Stop 1"]
+
+        keys = (
+            await session.execute(
+                select(TripStop.stop_order).where(TripStop.trip_id == trip.id)
+            )
+        ).scalars()
+        assert len(set(keys)) == inserts + 2
+
+
+async def test_optimize_route_reorders_sights_between_fixed_stops(make_user):
+    """Sights are reordered along the street; the hotel and lunch stay put."""
+    async with sessionmanager.session() as session:
+        user_id, _ = await _seed(session, make_user)
+
+        def point(lng: float) -> str:
+            return f"SRID=4326;POINT({lng} 16.0)"
+
+        places = {
+            "Hotel": Hotel(name="Hotel", location=point(108.20)),
+            "Far": Landmark(name="Far", location=point(108.24)),
+            "Near": Landmark(name="Near", location=point(108.21)),
+            "Lunch": Restaurant(name="Lunch", location=point(108.25)),
+            "Nowhere": Landmark(name="Nowhere"),
+        }
+        session.add_all(places.values())
+        await session.commit()
+
+        day_one = [("Hotel", 8), ("Far", 9), ("Near", 10), ("Lunch", 12)]
+        day_two = [("Far", 9), ("Nowhere", 10), ("Near", 11)]
+        trip = await create_trip(
+            session,
+            user_id,
+            TripCreate(
+                trip_name="Da Nang",
+                start_date=date(2026, 11, 1),
+                end_date=date(2026, 11, 2),
+                stops=[
+                    TripStopCreate(
+                        place_id=places[name].id,
+                        arrival_time=datetime(2026, 11, day, hour, tzinfo=timezone.utc),
+                    )
+                    for day, stops in ((1, day_one), (2, day_two))
+                    for name, hour in stops
+                ],
+            ),
+        )
+
+        optimized = await optimize_trip_route(session, user_id, trip.id)
+
+    assert [stop.place.name for stop in optimized.stops] == [
+        "Hotel",
+        "Near",
+        "Far",
+        "Lunch",
+        "Far",
+        "Nowhere",
+        "Near",
+    ]
+    # Times stay with their slots
+    assert [stop.arrival_time.hour for stop in optimized.stops] == [
+        8, 9, 10, 12, 9, 10, 11
+    ]
@@ -0,0 +1,50 @@
+import uuid
+from datetime import date
+
+from app.core.db import sessionmanager
+from app.models import ForumPost, Trip
+from app.service.user_service import get_user_detail, get_user_profile_page
+
+
+async def test_user_detail_is_a_single_query(count_queries, make_user):
+    async with sessionmanager.session() as session:
+        user_id = (await make_user(session, posts_count=3, trips_count=1)).id
+        await session.commit()
+
+    async with sessionmanager.session() as session:
+        with count_queries() as statements:
+            user = await get_user_detail(session, user_id)
+
+    assert len(statements) == 1
+    assert user.email == f"{user_id.hex}@example.com"
+    assert user.ban_reason is None
+
+
+async def test_profile_page_returns_first_page_of_every_tab(make_user):
+    async with sessionmanager.session() as session:
+        user_id = (await make_user(session, posts_count=3, trips_count=1)).id
+        session.add_all(
+            ForumPost(author_id=user_id, title=f"Post {i}", content="Hello")
+            for i in range(3)
+        )
+        session.add_all(
+            Trip(
+                user_id=user_id,
+                trip_name=name,
+                start_date=date(2026, 11, 1),
+                end_date=date(2026, 11, 2),
+                public=public,
+            )
+            for name, public in (("Hue", True), ("Hoi An", False))
+        )
+        await session.commit()
+
+    profile_page = await get_user_profile_page(user_id, limit=2)
+
+    assert profile_page.profile.stats.posts_count == 3
+    assert len(profile_page.posts.items) == 2
+    assert profile_page.posts.next_cursor is not None
+    assert [trip.trip_name for trip in profile_page.trips.items] == ["Hue"]
+    assert profile_page.trips.next_cursor is None
+    assert profile_page.reviews.items == []
+    assert await get_user_profile_page(uuid.uuid4()) is None
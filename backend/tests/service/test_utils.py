@@ -0,0 +1,57 @@
+import uuid
+
+import pytest
+from app.core.db import sessionmanager
+from app.models import Landmark, PlaceImage
+from app.service.utils import ensure_rows_exist, sync_child_rows
+from sqlalchemy import select
+
+
+async def test_sync_child_rows_writes_only_the_difference():
+    """Kept rows keep their ids; only removed and added rows are written."""
+    async with sessionmanager.session() as session:
+        place = Landmark(name="Imperial City")
+        session.add(place)
+        await session.flush()
+        session.add_all(
+            [
+                PlaceImage(place_id=place.id, image_url=url)
+                for url in ("a.jpg", "b.jpg", "b.jpg")
+            ]
+        )
+        await session.commit()
+        kept_id = await session.scalar(
+            select(PlaceImage.id).where(PlaceImage.image_url == "a.jpg")
+        )
+
+        inserted, deleted = await sync_child_rows(
+            session,
+            PlaceImage.place_id,
+            place.id,
+            [PlaceImage.image_url],
+            [("a.jpg",), ("b.jpg",), ("c.jpg",)],
+        )
+        await session.commit()
+
+        assert (inserted, deleted) == (1, 1)
+        rows = (
+            await session.execute(
+                select(PlaceImage.id, PlaceImage.image_url).where(
+                    PlaceImage.place_id == place.id
+                )
+            )
+        ).all()
+        assert sorted(url for _, url in rows) == ["a.jpg", "b.jpg", "c.jpg"]
+        assert kept_id in {id_ for id_, _ in rows}
+
+
+async def test_ensure_rows_exist_reports_missing_id():
+    async with sessionmanager.session() as session:
+        place = Landmark(name="Thien Mu Pagoda")
+        session.add(place)
+        await session.commit()
+
+        await ensure_rows_exist(session, Landmark.id, [place.id], "Place")
+        missing = uuid.uuid4()
+        with pytest.raises(ValueError, match=f"Place {missing} not found"):
+            await ensure_rows_exist(session, Landmark.id, [place.id, missing], "Place")
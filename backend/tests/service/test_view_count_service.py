@@ -0,0 +1,73 @@
+import asyncio
+import uuid
+
+import pytest
+from app.core.db import sessionmanager
+from app.models import ForumPost
+from app.service.view_count_service import ViewCountBuffer
+from sqlalchemy import select
+
+
+async def _seed_posts(session, author_id: uuid.UUID, count: int) -> list[uuid.UUID]:
+    posts = [
+        ForumPost(author_id=author_id, title=f"Post {i}", content="...", view_count=0)
+        for i in range(count)
+    ]
+    session.add_all(posts)
+    await session.commit()
+    return [post.id for post in posts]
+
+
+def test_repeat_views_by_same_viewer_are_counted_once():
+    buffer = ViewCountBuffer(dedup_window=60)
+    post_id = uuid.uuid4()
+
+    buffer.record(post_id, "viewer-a")
+    buffer.record(post_id, "viewer-a")
+    buffer.record(post_id, "viewer-b")
+    buffer.record(post_id)
+
+    assert buffer.pending(post_id) == 3
+
+
+async def test_cancelled_flush_puts_views_back():
+    class CancelledSession:
+        async def execute(self, stmt):
+            raise asyncio.CancelledError
+
+        async def rollback(self):
+            pass
+
+    buffer = ViewCountBuffer()
+    post_id = uuid.uuid4()
+    buffer.record(post_id)
+    buffer.record(post_id)
+
+    with pytest.raises(asyncio.CancelledError):
+        await buffer.flush(CancelledSession())
+    assert buffer.pending(post_id) == 2
+
+
+async def test_flush_writes_buffered_views_in_one_batch(make_user):
+    async with sessionmanager.session() as session:
+        author = await make_user(session)
+        first, second = await _seed_posts(session, author.id, 2)
+
+        buffer = ViewCountBuffer()
+        for _ in range(3):
+            buffer.record(first)
+        buffer.record(second)
+
+        assert await buffer.flush(session) == 2
+        assert buffer.pending(first) == 0
+
+        counts = dict(
+            (
+                await session.execute(
+                    select(ForumPost.id, ForumPost.view_count).where(
+                        ForumPost.id.in_([first, second])
+                    )
+                )
+            ).all()
+        )
+        assert counts == {first: 3, second: 1}